@@ -18,6 +18,11 @@ import models  # This imports all models through __init__.py
 # access to the values within the .ini file in use.
 config = context.config
 
+# Migrate the database the app is configured for (DATABASE_URL, from the
+# environment or .env), PostgreSQL or SQLite, rather than the .ini default
+from config import settings
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
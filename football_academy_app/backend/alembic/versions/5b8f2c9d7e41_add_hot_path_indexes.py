@@ -0,0 +1,96 @@
+"""add hot path indexes
+
+Revision ID: 5b8f2c9d7e41
+Revises: 3a6e27661a1e
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f2c9d7e41'
+down_revision: Union[str, None] = '3a6e27661a1e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ("uq_challenge_completions_user_challenge", "challenge_completions", ["user_id", "challenge_id"], True),
+    ("ix_challenge_completions_challenge_user", "challenge_completions", ["challenge_id", "user_id"], False),
+    ("ix_challenge_results_completion_submitted", "challenge_results", ["completion_id", "submitted_at"], False),
+    ("uq_achievements_user_badge", "achievements", ["user_id", "badge_id"], True),
+    ("ix_player_tests_player_date", "player_tests", ["player_id", "test_date"], False),
+    ("uq_training_schedules_user_year_week", "training_schedules", ["user_id", "year", "week_number"], True),
+    ("ix_training_sessions_schedule_id", "training_sessions", ["schedule_id"], False),
+    ("ix_challenge_entries_player_id", "challenge_entries", ["player_id"], False),
+]
+
+# Rows referencing each table whose duplicates are removed before its unique index is created
+REFERENCES = {
+    "challenge_completions": [("challenge_results", "completion_id")],
+    "achievements": [],
+    "training_schedules": [("training_sessions", "schedule_id")],
+}
+
+# Which of a key's duplicate rows is kept: the first in this order. A
+# completed or verified completion wins over an active one, so the player
+# keeps the completion and the points and badges that came with it
+KEEP_FIRST = {
+    "challenge_completions": (
+        "CASE WHEN kept.status = 'COMPLETED' OR kept.verified_by IS NOT NULL THEN 0 ELSE 1 END, "
+        "COALESCE(kept.progress, 0) DESC, kept.id"
+    ),
+    "achievements": "kept.id",
+    "training_schedules": "kept.id",
+}
+
+
+def _existing_indexes(table: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    return {index["name"] for index in inspector.get_indexes(table)}
+
+
+def _deduplicate(table: str, columns: list) -> None:
+    """
+    Keep one row for every key of a unique index about to be created, as
+    chosen by KEEP_FIRST, repointing the rows that reference a duplicate to
+    the kept row before the duplicates are deleted. Rows with an empty key
+    column are left alone, since the unique index does not treat them as equal.
+    """
+    same_key = " AND ".join(f"kept.{column} = duplicate.{column}" for column in columns)
+    kept_for_duplicate = (
+        f"SELECT kept.id FROM {table} kept WHERE {same_key} ORDER BY {KEEP_FIRST[table]} LIMIT 1"
+    )
+    duplicates = f"SELECT duplicate.id FROM {table} duplicate WHERE duplicate.id <> ({kept_for_duplicate})"
+    for referencing_table, column in REFERENCES[table]:
+        kept_id = (
+            f"SELECT kept.id FROM {table} kept JOIN {table} duplicate ON {same_key} "
+            f"WHERE duplicate.id = {referencing_table}.{column} ORDER BY {KEEP_FIRST[table]} LIMIT 1"
+        )
+        op.execute(
+            f"UPDATE {referencing_table} SET {column} = ({kept_id}) WHERE {column} IN ({duplicates})"
+        )
+    op.execute(f"DELETE FROM {table} WHERE id IN ({duplicates})")
+
+
+def upgrade() -> None:
+    """Add composite and unique indexes for the hot query predicates."""
+    for name, table, columns, unique in INDEXES:
+        # The initial revision runs create_all against the current models,
+        # so a freshly created database may already have these indexes
+        if name in _existing_indexes(table):
+            continue
+        if unique:
+            _deduplicate(table, columns)
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    """Drop the hot path indexes."""
+    for name, table, columns, unique in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,88 @@
+"""add challenge unlock statuses
+
+Revision ID: 7c1d4e8f9a52
+Revises: 5b8f2c9d7e41
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d4e8f9a52'
+down_revision: Union[str, None] = '5b8f2c9d7e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add challenge progression columns and the per-user status table."""
+    inspector = sa.inspect(op.get_bind())
+    # The initial revision runs create_all against the current models,
+    # so a freshly created database may already have these
+    columns = {column["name"] for column in inspector.get_columns("challenges")}
+    with op.batch_alter_table("challenges") as batch_op:
+        if "level" not in columns:
+            batch_op.add_column(sa.Column("level", sa.Integer(), server_default="1", nullable=True))
+        if "is_weekly" not in columns:
+            batch_op.add_column(sa.Column("is_weekly", sa.Boolean(), server_default=sa.false(), nullable=True))
+        if "prerequisite_id" not in columns:
+            batch_op.add_column(sa.Column("prerequisite_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_challenges_prerequisite_id_challenges", "challenges", ["prerequisite_id"], ["id"]
+            )
+
+    if not inspector.has_table("user_challenge_statuses"):
+        op.create_table(
+            "user_challenge_statuses",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("challenge_id", sa.Integer(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("unlocked_at", sa.DateTime(), nullable=True),
+            sa.Column("completed_at", sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(["challenge_id"], ["challenges.id"]),
+            sa.ForeignKeyConstraint(["user_id"], ["users.user_id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_user_challenge_statuses_id", "user_challenge_statuses", ["id"], unique=False)
+        op.create_index(
+            "uq_user_challenge_statuses_user_challenge", "user_challenge_statuses",
+            ["user_id", "challenge_id"], unique=True
+        )
+        op.create_index(
+            "ix_user_challenge_statuses_challenge_id", "user_challenge_statuses", ["challenge_id"], unique=False
+        )
+
+    # Backfill statuses for the users and challenges that already exist
+    op.execute(
+        """
+        INSERT INTO user_challenge_statuses (user_id, challenge_id, status, unlocked_at)
+        SELECT u.user_id, c.id,
+               CASE WHEN (c.level = 1 OR c.level IS NULL OR c.is_weekly) AND c.prerequisite_id IS NULL
+                    THEN 'AVAILABLE' ELSE 'LOCKED' END,
+               CASE WHEN (c.level = 1 OR c.level IS NULL OR c.is_weekly) AND c.prerequisite_id IS NULL
+                    THEN CURRENT_TIMESTAMP END
+        FROM users u CROSS JOIN challenges c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM user_challenge_statuses s
+            WHERE s.user_id = u.user_id AND s.challenge_id = c.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-user status table and the challenge progression columns."""
+    op.drop_index("ix_user_challenge_statuses_challenge_id", table_name="user_challenge_statuses")
+    op.drop_index("uq_user_challenge_statuses_user_challenge", table_name="user_challenge_statuses")
+    op.drop_index("ix_user_challenge_statuses_id", table_name="user_challenge_statuses")
+    op.drop_table("user_challenge_statuses")
+    with op.batch_alter_table("challenges") as batch_op:
+        batch_op.drop_constraint("fk_challenges_prerequisite_id_challenges", type_="foreignkey")
+        batch_op.drop_column("prerequisite_id")
+        batch_op.drop_column("is_weekly")
+        batch_op.drop_column("level")
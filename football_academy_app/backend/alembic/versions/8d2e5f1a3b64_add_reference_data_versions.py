@@ -0,0 +1,42 @@
+"""add reference data versions
+
+Revision ID: 8d2e5f1a3b64
+Revises: 7c1d4e8f9a52
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e5f1a3b64'
+down_revision: Union[str, None] = '7c1d4e8f9a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the generation counter polled by the reference data cache."""
+    # The initial revision runs create_all against the current models,
+    # so a freshly created database may already have the table
+    if not sa.inspect(op.get_bind()).has_table("reference_data_versions"):
+        op.create_table(
+            "reference_data_versions",
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("generation", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("name"),
+        )
+    op.execute(
+        "INSERT INTO reference_data_versions (name, generation, updated_at) "
+        "SELECT 'reference', 0, CURRENT_TIMESTAMP "
+        "WHERE NOT EXISTS (SELECT 1 FROM reference_data_versions WHERE name = 'reference')"
+    )
+
+
+def downgrade() -> None:
+    """Drop the reference data generation counter."""
+    op.drop_table("reference_data_versions")
@@ -0,0 +1,154 @@
+"""partition challenge results by month
+
+Revision ID: 9e4a6b2c7d15
+Revises: 8d2e5f1a3b64
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a6b2c7d15'
+down_revision: Union[str, None] = '8d2e5f1a3b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A frozen copy of the DDL in services/result_partitions.py as of this
+# revision, so later changes to the service do not change what it does
+TABLE = "challenge_results"
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(connection) -> bool:
+    return bool(connection.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {"table": TABLE}).scalar())
+
+
+def _create_partition(connection, month: date) -> None:
+    name = f"{TABLE}_p{month.year:04d}{month.month:02d}"
+    end = _add_months(month, 1)
+    connection.execute(sa.text(
+        f"CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM ('{month}') TO ('{end}')"
+    ))
+
+
+def _partition_results_table(connection) -> None:
+    if _is_partitioned(connection):
+        return
+
+    legacy = f"{TABLE}_unpartitioned"
+    # Keep the id sequence alive while the old table is replaced
+    connection.execute(sa.text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq OWNED BY NONE"))
+    connection.execute(sa.text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    connection.execute(sa.text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {TABLE}_pkey TO {legacy}_pkey"))
+    connection.execute(sa.text("DROP INDEX IF EXISTS ix_challenge_results_id"))
+    connection.execute(sa.text("DROP INDEX IF EXISTS ix_challenge_results_completion_submitted"))
+
+    connection.execute(sa.text(f"CREATE SEQUENCE IF NOT EXISTS {TABLE}_id_seq"))
+    connection.execute(sa.text(f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq'),
+            completion_id INTEGER REFERENCES challenge_completions (id),
+            result_value DOUBLE PRECISION NOT NULL,
+            notes VARCHAR,
+            submitted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, submitted_at)
+        ) PARTITION BY RANGE (submitted_at)
+    """))
+    connection.execute(sa.text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    connection.execute(sa.text(f"CREATE INDEX ix_challenge_results_id ON {TABLE} (id)"))
+    connection.execute(sa.text(
+        f"CREATE INDEX ix_challenge_results_completion_submitted ON {TABLE} (completion_id, submitted_at)"
+    ))
+
+    # One partition per month of existing history, through the months ahead
+    oldest = connection.execute(sa.text(f"SELECT MIN(submitted_at) FROM {legacy}")).scalar()
+    current = _month_start(date.today())
+    month = _month_start(min(current, oldest.date())) if oldest is not None else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        _create_partition(connection, month)
+        month = _add_months(month, 1)
+
+    connection.execute(sa.text(
+        f"INSERT INTO {TABLE} (id, completion_id, result_value, notes, submitted_at) "
+        f"SELECT id, completion_id, result_value, notes, submitted_at FROM {legacy}"
+    ))
+    connection.execute(sa.text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    connection.execute(sa.text(
+        f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    ))
+    connection.execute(sa.text(f"DROP TABLE {legacy}"))
+
+
+def _unpartition_results_table(connection) -> None:
+    if not _is_partitioned(connection):
+        return
+
+    partitioned = f"{TABLE}_partitioned"
+    connection.execute(sa.text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq OWNED BY NONE"))
+    connection.execute(sa.text(f"ALTER TABLE {TABLE} RENAME TO {partitioned}"))
+    connection.execute(sa.text(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {TABLE}_pkey TO {partitioned}_pkey"))
+    connection.execute(sa.text("DROP INDEX IF EXISTS ix_challenge_results_id"))
+    connection.execute(sa.text("DROP INDEX IF EXISTS ix_challenge_results_completion_submitted"))
+
+    connection.execute(sa.text(f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq') PRIMARY KEY,
+            completion_id INTEGER REFERENCES challenge_completions (id),
+            result_value DOUBLE PRECISION NOT NULL,
+            notes VARCHAR,
+            submitted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """))
+    connection.execute(sa.text(f"CREATE INDEX ix_challenge_results_id ON {TABLE} (id)"))
+    connection.execute(sa.text(
+        f"CREATE INDEX ix_challenge_results_completion_submitted ON {TABLE} (completion_id, submitted_at)"
+    ))
+    connection.execute(sa.text(
+        f"INSERT INTO {TABLE} (id, completion_id, result_value, notes, submitted_at) "
+        f"SELECT id, completion_id, result_value, notes, submitted_at FROM {partitioned}"
+    ))
+    connection.execute(sa.text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    # Dropping the parent drops its attached partitions
+    connection.execute(sa.text(f"DROP TABLE {partitioned}"))
+
+
+def upgrade() -> None:
+    """Turn challenge_results into a table partitioned by month of submitted_at."""
+    # submitted_at is the partition key, so it can no longer be empty
+    op.execute("UPDATE challenge_results SET submitted_at = CURRENT_TIMESTAMP WHERE submitted_at IS NULL")
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        # Partitioning is PostgreSQL-only; other databases keep the plain table
+        with op.batch_alter_table("challenge_results") as batch_op:
+            batch_op.alter_column("submitted_at", existing_type=sa.DateTime(), nullable=False)
+        return
+    _partition_results_table(bind)
+
+
+def downgrade() -> None:
+    """Turn challenge_results back into a plain table."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        _unpartition_results_table(bind)
+    with op.batch_alter_table("challenge_results") as batch_op:
+        batch_op.alter_column("submitted_at", existing_type=sa.DateTime(), nullable=True)
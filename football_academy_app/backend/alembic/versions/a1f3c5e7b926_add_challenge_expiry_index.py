@@ -0,0 +1,54 @@
+"""add challenge expiry index
+
+Revision ID: a1f3c5e7b926
+Revises: 9e4a6b2c7d15
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c5e7b926'
+down_revision: Union[str, None] = '9e4a6b2c7d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return "ix_challenges_active_end_date" in {index["name"] for index in inspector.get_indexes("challenges")}
+
+
+def upgrade() -> None:
+    """Index active challenges by end date for the expiry sweeper, and expire what has already ended."""
+    # The initial revision runs create_all against the current models,
+    # so a freshly created database may already have this index
+    if not _has_index():
+        op.create_index("ix_challenges_active_end_date", "challenges", ["is_active", "end_date"], unique=False)
+
+    # End dates are naive UTC, so compare against UTC now rather than the server clock
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    bind.execute(sa.text(
+        """
+        UPDATE challenge_completions SET status = 'EXPIRED', updated_at = :now
+        WHERE status = 'ACTIVE' AND challenge_id IN (
+            SELECT id FROM challenges WHERE is_active = :true AND end_date <= :now
+        )
+        """
+    ), {"now": now, "true": True})
+    bind.execute(sa.text(
+        "UPDATE challenges SET is_active = :false, updated_at = :now "
+        "WHERE is_active = :true AND end_date <= :now"
+    ), {"now": now, "true": True, "false": False})
+
+
+def downgrade() -> None:
+    """Drop the challenge expiry index. Expired challenges stay expired."""
+    if _has_index():
+        op.drop_index("ix_challenges_active_end_date", table_name="challenges")
@@ -0,0 +1,46 @@
+"""add weekly challenge templates
+
+Revision ID: b2d4f6a8c037
+Revises: a1f3c5e7b926
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c037'
+down_revision: Union[str, None] = 'a1f3c5e7b926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add weekly template flags and the clone-to-template link on challenges."""
+    inspector = sa.inspect(op.get_bind())
+    # The initial revision runs create_all against the current models,
+    # so a freshly created database may already have these
+    columns = {column["name"] for column in inspector.get_columns("challenges")}
+    indexes = {index["name"] for index in inspector.get_indexes("challenges")}
+    with op.batch_alter_table("challenges") as batch_op:
+        if "is_template" not in columns:
+            batch_op.add_column(sa.Column("is_template", sa.Boolean(), server_default=sa.false(), nullable=True))
+        if "template_id" not in columns:
+            batch_op.add_column(sa.Column("template_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_challenges_template_id_challenges", "challenges", ["template_id"], ["id"]
+            )
+    if "uq_challenges_template_start" not in indexes:
+        op.create_index("uq_challenges_template_start", "challenges", ["template_id", "start_date"], unique=True)
+
+
+def downgrade() -> None:
+    """Drop the weekly template columns."""
+    op.drop_index("uq_challenges_template_start", table_name="challenges")
+    with op.batch_alter_table("challenges") as batch_op:
+        batch_op.drop_constraint("fk_challenges_template_id_challenges", type_="foreignkey")
+        batch_op.drop_column("template_id")
+        batch_op.drop_column("is_template")
@@ -0,0 +1,44 @@
+"""add training session date index
+
+Revision ID: c3e5a7b9d148
+Revises: b2d4f6a8c037
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d148'
+down_revision: Union[str, None] = 'b2d4f6a8c037'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index(name: str) -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return name in {index["name"] for index in inspector.get_indexes("training_sessions")}
+
+
+def upgrade() -> None:
+    """Index sessions by schedule and date for the training calendar."""
+    # The initial revision runs create_all against the current models,
+    # so a freshly created database may already have this index
+    if not _has_index("ix_training_sessions_schedule_date"):
+        op.create_index(
+            "ix_training_sessions_schedule_date", "training_sessions", ["schedule_id", "session_date"], unique=False
+        )
+    # The new index serves every schedule_id lookup the single-column one did
+    if _has_index("ix_training_sessions_schedule_id"):
+        op.drop_index("ix_training_sessions_schedule_id", table_name="training_sessions")
+
+
+def downgrade() -> None:
+    """Drop the training session date index."""
+    if not _has_index("ix_training_sessions_schedule_id"):
+        op.create_index("ix_training_sessions_schedule_id", "training_sessions", ["schedule_id"], unique=False)
+    if _has_index("ix_training_sessions_schedule_date"):
+        op.drop_index("ix_training_sessions_schedule_date", table_name="training_sessions")
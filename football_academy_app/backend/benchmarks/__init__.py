@@ -0,0 +1,2 @@
+# This file makes the benchmarks directory a Python package
+# Run the tools from the backend directory, e.g. `python -m benchmarks.seed_data --help`
@@ -0,0 +1,92 @@
+"""
+PostgreSQL vs SQLite backend comparison.
+
+Seeds the same synthetic academy into each database, then replays the
+load-test traffic mix against the app on each backend with identical
+settings. Prints throughput and p95 latency per route side by side, so the
+cost of running a satellite academy on a single SQLite file is visible
+before deploying one.
+
+Usage (from the backend directory):
+    python -m benchmarks.backends --postgres-url postgresql://... --sqlite-url sqlite:///./bench.db --players 500
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from benchmarks.load_test import run_load, start_server, wait_for_server
+from benchmarks.seed_data import SeedOptions, seed_database
+
+logger = logging.getLogger(__name__)
+
+
+def run_backend(args: argparse.Namespace, options: SeedOptions, name: str, url: str) -> Dict[str, Any]:
+    if not args.skip_seed:
+        engine = create_engine(url)
+        seed_database(engine, options, reset=True)
+        engine.dispose()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(url, args.port, args.workers)
+    try:
+        wait_for_server(base_url)
+        results = asyncio.run(run_load(
+            base_url, options, args.concurrency, args.coaches, args.duration, args.think_time, args.seed
+        ))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {"backend": name, **results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the app on PostgreSQL and SQLite")
+    parser.add_argument("--postgres-url", default=settings.DATABASE_URL)
+    parser.add_argument("--sqlite-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in both databases")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8768)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent simulated players")
+    parser.add_argument("--coaches", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load per backend")
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--output", default="backend_comparison.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    options = SeedOptions(seed=args.seed, players=args.players)
+    postgres, sqlite = (
+        run_backend(args, options, name, url)
+        for name, url in (("postgresql", args.postgres_url), ("sqlite", args.sqlite_url))
+    )
+
+    print(f"\n{'route':<55} {'pg rps':>8} {'pg p95':>8} {'sqlite rps':>11} {'sqlite p95':>11}")
+    for route in sorted(set(postgres["routes"]) | set(sqlite["routes"])):
+        pg = postgres["routes"].get(route, {})
+        lite = sqlite["routes"].get(route, {})
+        print(
+            f"{route:<55} {pg.get('throughput_rps', 0):>8.1f} {pg.get('p95_ms', 0):>8.1f} "
+            f"{lite.get('throughput_rps', 0):>11.1f} {lite.get('p95_ms', 0):>11.1f}"
+        )
+    for run in (postgres, sqlite):
+        print(f"{run['backend']:<10} {run['requests']} requests, {run['errors']} errors, {run['throughput_rps']} req/s")
+
+    with open(args.output, "w") as f:
+        json.dump({"runs": [postgres, sqlite], "config": vars(args)}, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
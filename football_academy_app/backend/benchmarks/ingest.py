@@ -0,0 +1,149 @@
+"""
+Challenge-day ingest benchmark for result submissions.
+
+Seeds a synthetic academy, then runs the same submit-result storm twice:
+once with the per-request write path and once with RESULT_INGEST_BATCHING
+enabled. Commits are read from pg_stat_database, so the comparison covers
+every worker process. Reports submissions and commits per second for both
+modes and the commit reduction at the achieved throughput.
+
+Usage (from the backend directory, PostgreSQL only):
+    python -m benchmarks.ingest --database-url postgresql://... --players 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from benchmarks.load_test import RouteStats, VirtualUser, percentile, start_server, wait_for_server
+from benchmarks.seed_data import SeedOptions, seed_database
+
+logger = logging.getLogger(__name__)
+
+SUBMIT_ROUTE = "PATCH /challenges/submit-result/{challenge_id}"
+
+
+def committed_transactions(engine: Engine) -> int:
+    """Transactions committed in the benchmark database so far, by any backend."""
+    with engine.connect() as connection:
+        # Statistics are only flushed periodically; wait for the previous run's to land
+        time.sleep(1.0)
+        connection.execute(text("SELECT pg_stat_clear_snapshot()"))
+        return connection.execute(text(
+            "SELECT xact_commit FROM pg_stat_database WHERE datname = current_database()"
+        )).scalar()
+
+
+async def submit_storm(
+    base_url: str, options: SeedOptions, engine: Engine, concurrency: int, duration: float, seed: int
+) -> Dict[str, Any]:
+    """Every player logs in, then submits results back to back until the deadline."""
+    stats = RouteStats()
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        first_player = options.coaches + 1
+        users = [
+            VirtualUser(client, stats, options, random.Random(f"{seed}:ingest:{n}"),
+                        first_player + n % options.players, is_coach=False)
+            for n in range(concurrency)
+        ]
+        await asyncio.gather(*(user.login() for user in users))
+
+        async def run(user: VirtualUser, deadline: float) -> None:
+            while time.perf_counter() < deadline:
+                await user.submit_result()
+
+        # Only the submissions are measured, not the logins
+        commits_before = await asyncio.to_thread(committed_transactions, engine)
+        started = time.perf_counter()
+        await asyncio.gather(*(run(user, started + duration) for user in users))
+        elapsed = time.perf_counter() - started
+        commits = await asyncio.to_thread(committed_transactions, engine) - commits_before
+
+    samples = stats.latencies.get(SUBMIT_ROUTE, [])
+    return {
+        "submissions": len(samples),
+        "errors": stats.errors.get(SUBMIT_ROUTE, 0),
+        "submissions_per_s": round(len(samples) / elapsed, 1),
+        "commits": commits,
+        "commits_per_s": round(commits / elapsed, 1),
+        "commits_per_submission": round(commits / max(len(samples), 1), 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+    }
+
+
+def run_mode(args: argparse.Namespace, options: SeedOptions, engine: Engine, batching: bool) -> Dict[str, Any]:
+    extra_env = {
+        "RESULT_INGEST_BATCHING": "true" if batching else "false",
+        "RESULT_INGEST_MAX_ROWS": str(args.max_rows),
+        "RESULT_INGEST_MAX_DELAY_MS": str(args.max_delay_ms),
+    }
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.database_url, args.port, args.workers, extra_env)
+    try:
+        wait_for_server(base_url)
+        result = asyncio.run(submit_storm(base_url, options, engine, args.concurrency, args.duration, args.seed))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {"mode": "batched" if batching else "per-request", **result}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare per-request and batched result ingest")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=200, help="Players submitting at the same time")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of submissions per mode")
+    parser.add_argument("--max-rows", type=int, default=settings.RESULT_INGEST_MAX_ROWS)
+    parser.add_argument("--max-delay-ms", type=int, default=settings.RESULT_INGEST_MAX_DELAY_MS)
+    parser.add_argument("--output", default="ingest_results.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not args.database_url.startswith("postgresql"):
+        parser.error("the ingest benchmark reads commit counts from pg_stat_database and needs PostgreSQL")
+
+    options = SeedOptions(seed=args.seed, players=args.players)
+    engine = create_engine(args.database_url)
+    if not args.skip_seed:
+        seed_database(engine, options, reset=True)
+
+    runs = [run_mode(args, options, engine, batching) for batching in (False, True)]
+
+    print(f"\n{'mode':<12} {'subs':>7} {'err':>5} {'subs/s':>8} {'commits/s':>10} {'commits/sub':>12} {'p50':>8} {'p95':>8}")
+    for run in runs:
+        print(
+            f"{run['mode']:<12} {run['submissions']:>7} {run['errors']:>5} {run['submissions_per_s']:>8.1f} "
+            f"{run['commits_per_s']:>10.1f} {run['commits_per_submission']:>12.3f} {run['p50_ms']:>8.1f} {run['p95_ms']:>8.1f}"
+        )
+    per_request, batched = runs
+    # Normalise by throughput so a faster batched run is not penalised for committing more often
+    reduction = per_request["commits_per_submission"] / max(batched["commits_per_submission"], 1e-9)
+    print(f"\nCommits per submission reduced {reduction:.1f}x")
+
+    with open(args.output, "w") as f:
+        json.dump({"runs": runs, "commit_reduction": round(reduction, 2)}, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
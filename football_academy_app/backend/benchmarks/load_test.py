@@ -0,0 +1,308 @@
+"""
+HTTP load-test benchmark for the v2 API.
+
+Seeds a synthetic academy (see benchmarks.seed_data), starts the app under
+uvicorn and replays a realistic traffic mix with async httpx clients:
+logins, dashboard fan-out, result submissions, league table reads and coach
+verification. Reports throughput and p50/p95/p99 latency per route and writes
+a JSON file that can be compared against a previous run.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --database-url postgresql://... --duration 60 --output head.json
+    python -m benchmarks.load_test --skip-seed --output pr.json --compare head.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from benchmarks.seed_data import SEED_PASSWORD, SeedOptions
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API = "/api/v2"
+
+# Relative weight of each player action in the replayed mix
+PLAYER_MIX = [
+    ("dashboard", 45),
+    ("league_table", 25),
+    ("submit_result", 25),
+    ("login", 5),
+]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class RouteStats:
+    """Latencies and failures recorded per route template."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, elapsed: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(elapsed)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, float]]:
+        routes = {}
+        for route, samples in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors.get(route, 0),
+                "throughput_rps": round(len(samples) / duration, 2),
+                "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            }
+        return routes
+
+
+class VirtualUser:
+    """One simulated app user replaying the traffic mix against the server."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: RouteStats, options: SeedOptions, rng: random.Random, user_id: int, is_coach: bool):
+        self.client = client
+        self.stats = stats
+        self.options = options
+        self.rng = rng
+        self.user_id = user_id
+        self.is_coach = is_coach
+        self.headers: Dict[str, str] = {}
+
+    @property
+    def email(self) -> str:
+        return f"{'coach' if self.is_coach else 'player'}{self.user_id}@academy.test"
+
+    async def request(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            response, ok = None, False
+        self.stats.record(route, time.perf_counter() - started, ok)
+        return response
+
+    async def login(self) -> None:
+        response = await self.request(
+            "POST /auth/token", "POST", f"{API}/auth/token",
+            data={"username": self.email, "password": SEED_PASSWORD}
+        )
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def random_challenge(self) -> int:
+        return self.rng.randint(1, self.options.challenges)
+
+    async def dashboard(self) -> None:
+        # The Flutter dashboard fires these in parallel when it opens
+        await asyncio.gather(
+            self.request("GET /auth/me", "GET", f"{API}/auth/me"),
+            self.request("GET /challenges/user", "GET", f"{API}/challenges/user"),
+            self.request("GET /challenges/badge-stats", "GET", f"{API}/challenges/badge-stats"),
+            self.request("GET /skill-tests/player-tests/player/{player_id}", "GET",
+                         f"{API}/skill-tests/player-tests/player/{self.user_id}"),
+            self.request("GET /training-schedules/user/{user_id}", "GET",
+                         f"{API}/training-schedules/user/{self.user_id}"),
+        )
+
+    async def league_table(self) -> None:
+        await self.request(
+            "GET /league-table/challenge/{challenge_id}", "GET",
+            f"{API}/league-table/challenge/{self.random_challenge()}"
+        )
+
+    async def submit_result(self) -> None:
+        await self.request(
+            "PATCH /challenges/submit-result/{challenge_id}", "PATCH",
+            f"{API}/challenges/submit-result/{self.random_challenge()}",
+            params={"result_value": self.rng.randint(1, 120)}
+        )
+
+    async def verify(self) -> None:
+        completion_id = self.rng.randint(1, self.options.players * self.options.completions_per_player)
+        await self.request(
+            "PATCH /challenges/verify/{completion_id}", "PATCH",
+            f"{API}/challenges/verify/{completion_id}"
+        )
+
+    async def run(self, deadline: float, think_time: float) -> None:
+        await self.login()
+        actions = [name for name, _ in PLAYER_MIX]
+        weights = [weight for _, weight in PLAYER_MIX]
+        while time.perf_counter() < deadline:
+            if self.is_coach:
+                await self.verify()
+            else:
+                await getattr(self, self.rng.choices(actions, weights)[0])()
+            if think_time:
+                await asyncio.sleep(self.rng.uniform(0, 2 * think_time))
+
+
+async def run_load(base_url: str, options: SeedOptions, concurrency: int, coaches: int, duration: float, think_time: float, seed: int) -> Dict[str, Any]:
+    stats = RouteStats()
+    limits = httpx.Limits(max_connections=concurrency + coaches)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        first_player = options.coaches + 1
+        users = [
+            VirtualUser(client, stats, options, random.Random(f"{seed}:player:{n}"),
+                        first_player + n % options.players, is_coach=False)
+            for n in range(concurrency)
+        ] + [
+            VirtualUser(client, stats, options, random.Random(f"{seed}:coach:{n}"),
+                        1 + n % max(options.coaches, 1), is_coach=True)
+            for n in range(coaches)
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(*(user.run(started + duration, think_time) for user in users))
+        elapsed = time.perf_counter() - started
+
+    routes = stats.summary(elapsed)
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "duration_s": round(elapsed, 2),
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return the routes whose p95 latency regressed by more than threshold percent."""
+    regressions = []
+    print(f"\n{'route':<55} {'base p95':>10} {'p95':>10} {'change':>8}")
+    for route, stats in current["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if not base or not base["p95_ms"]:
+            continue
+        change = (stats["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+        flag = ""
+        if change > threshold:
+            regressions.append(route)
+            flag = "  REGRESSION"
+        print(f"{route:<55} {base['p95_ms']:>10.1f} {stats['p95_ms']:>10.1f} {change:>7.1f}%{flag}")
+    return regressions
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print(f"\n{'route':<55} {'reqs':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, stats in results["routes"].items():
+        print(
+            f"{route:<55} {stats['requests']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+    print(f"\nTotal: {results['requests']} requests, {results['errors']} errors, {results['throughput_rps']} req/s")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_server(database_url: str, port: int, workers: int, extra_env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url, **(extra_env or {}))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+
+def wait_for_server(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become healthy within {timeout}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the v2 API against seeded data")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent simulated players")
+    parser.add_argument("--coaches", type=int, default=2, help="Concurrent simulated coaches verifying completions")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean pause between actions, in seconds")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", help="Previous results JSON to compare p95 latencies against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression, in percent")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    options = SeedOptions(seed=args.seed, players=args.players)
+
+    if not args.skip_seed:
+        from sqlalchemy import create_engine
+        from benchmarks.seed_data import seed_database
+        seed_database(create_engine(args.database_url), options, reset=True)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.database_url, args.port, args.workers)
+    try:
+        wait_for_server(base_url)
+        results = asyncio.run(run_load(
+            base_url, options, args.concurrency, args.coaches, args.duration, args.think_time, args.seed
+        ))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    results.update({
+        "commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat(),
+        "config": {
+            "players": args.players, "seed": args.seed, "workers": args.workers,
+            "concurrency": args.concurrency, "coaches": args.coaches, "think_time": args.think_time,
+        },
+    })
+    print_report(results)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} route(s) regressed by more than {args.threshold}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Connection pool sizing benchmark.
+
+For every combination of uvicorn worker count and DB_POOL_SIZE, starts the
+app, replays the load-test traffic mix and reads /debug/pool from the
+workers afterwards. Reports request latency next to checkout waits,
+timeouts and overflow use, plus the most connections that configuration
+could open against PostgreSQL's max_connections. The smallest pool without
+timeouts whose checkout p95 stays under --max-wait-ms is recommended for
+each worker count.
+
+Usage (from the backend directory, PostgreSQL only):
+    python -m benchmarks.pool_sizing --database-url postgresql://... --workers 1 2 4 --pool-sizes 2 5 10
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import create_engine, text
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from benchmarks.load_test import run_load, start_server, wait_for_server
+from benchmarks.seed_data import SeedOptions, seed_database
+
+logger = logging.getLogger(__name__)
+
+# Both the sync and the async engine keep their own pool in every worker
+ENGINES_PER_WORKER = 2
+
+
+def worker_pools(base_url: str, workers: int) -> List[Dict[str, Any]]:
+    """/debug/pool of as many distinct workers as a few dozen requests reach."""
+    snapshots = {}
+    with httpx.Client(base_url=base_url, timeout=5.0) as client:
+        for _ in range(workers * 10):
+            sync = client.get("/debug/pool").json()["sync"]
+            # Each worker's counters differ, so they identify the worker
+            snapshots[(sync["checkouts"], sync["connects"])] = sync
+            if len(snapshots) == workers:
+                break
+    return list(snapshots.values())
+
+
+def run_configuration(args: argparse.Namespace, options: SeedOptions, workers: int, pool_size: int) -> Dict[str, Any]:
+    extra_env = {"DB_POOL_SIZE": str(pool_size), "DB_MAX_OVERFLOW": str(args.max_overflow)}
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.database_url, args.port, workers, extra_env)
+    try:
+        wait_for_server(base_url)
+        load = asyncio.run(run_load(
+            base_url, options, args.concurrency, args.coaches, args.duration, 0.0, args.seed
+        ))
+        pools = worker_pools(base_url, workers)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    latencies = [stats["p95_ms"] for stats in load["routes"].values()]
+    return {
+        "workers": workers,
+        "pool_size": pool_size,
+        "max_overflow": args.max_overflow,
+        "max_connections": workers * ENGINES_PER_WORKER * (pool_size + args.max_overflow),
+        "throughput_rps": load["throughput_rps"],
+        "errors": load["errors"],
+        "worst_route_p95_ms": max(latencies, default=0.0),
+        "checkout_p95_ms": max((pool["checkout_p95_ms"] for pool in pools), default=0.0),
+        "checkout_max_ms": max((pool["checkout_max_ms"] for pool in pools), default=0.0),
+        "checkout_timeouts": sum(pool["checkout_timeouts"] for pool in pools),
+        "overflow_checkouts": sum(pool["overflow_checkouts"] for pool in pools),
+        "peak_overflow": max((pool["peak_overflow"] for pool in pools), default=0),
+        "workers_sampled": len(pools),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Size the connection pool against uvicorn worker counts")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[2, 5, 10, 20])
+    parser.add_argument("--max-overflow", type=int, default=settings.DB_MAX_OVERFLOW)
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent simulated players")
+    parser.add_argument("--coaches", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per configuration")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="Acceptable checkout p95")
+    parser.add_argument("--output", default="pool_sizing_results.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    if not args.database_url.startswith("postgresql"):
+        parser.error("pool sizing is measured against PostgreSQL")
+
+    options = SeedOptions(seed=args.seed, players=args.players)
+    engine = create_engine(args.database_url)
+    if not args.skip_seed:
+        seed_database(engine, options, reset=True)
+    with engine.connect() as connection:
+        server_max_connections = int(connection.execute(text("SHOW max_connections")).scalar())
+    engine.dispose()
+
+    runs = [
+        run_configuration(args, options, workers, pool_size)
+        for workers in args.workers for pool_size in args.pool_sizes
+    ]
+
+    print(f"\nPostgreSQL max_connections = {server_max_connections}")
+    print(f"\n{'workers':>7} {'pool':>5} {'conns':>6} {'rps':>8} {'err':>5} {'route p95':>10} "
+          f"{'wait p95':>9} {'wait max':>9} {'timeouts':>9} {'overflow':>9}")
+    for run in runs:
+        over = "  > max_connections" if run["max_connections"] > server_max_connections else ""
+        print(
+            f"{run['workers']:>7} {run['pool_size']:>5} {run['max_connections']:>6} {run['throughput_rps']:>8.1f} "
+            f"{run['errors']:>5} {run['worst_route_p95_ms']:>10.1f} {run['checkout_p95_ms']:>9.2f} "
+            f"{run['checkout_max_ms']:>9.1f} {run['checkout_timeouts']:>9} {run['overflow_checkouts']:>9}{over}"
+        )
+
+    recommendations = {}
+    for workers in args.workers:
+        fitting = [
+            run for run in runs
+            if run["workers"] == workers and not run["checkout_timeouts"]
+            and run["checkout_p95_ms"] <= args.max_wait_ms and run["max_connections"] <= server_max_connections
+        ]
+        if fitting:
+            recommendations[workers] = min(fitting, key=lambda run: run["pool_size"])["pool_size"]
+            print(f"{workers} worker(s): DB_POOL_SIZE={recommendations[workers]}")
+        else:
+            print(f"{workers} worker(s): no pool size tried kept checkout p95 under {args.max_wait_ms} ms")
+
+    with open(args.output, "w") as f:
+        json.dump({"server_max_connections": server_max_connections, "runs": runs,
+                   "recommended_pool_size": recommendations}, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
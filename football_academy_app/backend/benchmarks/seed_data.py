@@ -0,0 +1,507 @@
+"""
+Deterministic synthetic data generator for load and scaling tests.
+
+Bulk-loads a realistic academy (players, coaches, challenges, completions,
+result histories, years of player tests, development plans and training
+schedules) into any DATABASE_URL. The same seed and sizes always produce the
+same rows, so benchmark runs are comparable between commits.
+
+Usage (from the backend directory):
+    python -m benchmarks.seed_data --database-url postgresql://... --players 20000 --reset
+"""
+import argparse
+import io
+import itertools
+import json
+import logging
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta, time as dt_time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.engine import Connection, Engine
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from config import settings
+from database import Base
+from constants.position_weights import Position
+from models import (
+    User, PlayerStats, Test, PlayerTest,
+    Challenge, ChallengeStatus, ChallengeCompletion, ChallengeResult,
+    Badge, Achievement, LeagueTableEntry, ChallengeEntry,
+    DevelopmentPlan, FocusArea, TrainingSchedule, TrainingSession
+)
+
+logger = logging.getLogger(__name__)
+
+# Every seeded account uses this password so load tests can log in
+SEED_PASSWORD = "password123"
+CATEGORIES = ["technical", "physical", "tactical", "mental"]
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+POSITIONS = [position.value for position in Position]
+CLUBS = ["Copenhagen Academy", "Nordvest FC", "Amager United", "Valby BK", "Frederiksberg IF"]
+
+
+class SeedOptions(BaseModel):
+    """Sizes of the generated dataset. Everything scales from the number of players."""
+    seed: int = 42
+    players: int = 1000
+    coaches: int = 20
+    challenges: int = 60
+    completions_per_player: int = 15
+    results_per_completion: int = 8
+    test_years: int = 3
+    tests_per_year: int = 4
+    schedule_weeks: int = 12
+    sessions_per_week: int = 2
+    chunk_size: int = 5000
+    start_date: date = date(2023, 1, 2)
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _copy_value(value: Any) -> str:
+    """Format a value for PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, ChallengeStatus):
+        return value.name
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _copy_chunk(connection: Connection, table, rows: List[Dict[str, Any]]) -> None:
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def bulk_load(connection: Connection, model, rows: Iterable[Dict[str, Any]], chunk_size: int) -> int:
+    """
+    Load rows into a model's table in chunks.
+
+    Uses COPY on psycopg2 connections and a multi-row executemany INSERT everywhere else.
+
+    Returns:
+        The number of rows loaded
+    """
+    table = model.__table__
+    use_copy = connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2"
+    started = time.perf_counter()
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        if use_copy:
+            _copy_chunk(connection, table, chunk)
+        else:
+            connection.execute(insert(table), chunk)
+        count += len(chunk)
+    elapsed = time.perf_counter() - started
+    logger.info(f"{table.name}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} rows/s)")
+    return count
+
+
+class AcademyGenerator:
+    """Generates the rows of a synthetic academy with stable, sequential primary keys."""
+
+    def __init__(self, options: SeedOptions, password_hash: str):
+        self.options = options
+        self.password_hash = password_hash
+        self.created_at = datetime.combine(options.start_date, dt_time(8, 0))
+
+    def _rng(self, table: str) -> random.Random:
+        # One stream per table so changing the size of one table doesn't reshuffle the others
+        return random.Random(f"{self.options.seed}:{table}")
+
+    @property
+    def player_ids(self) -> range:
+        first = self.options.coaches + 1
+        return range(first, first + self.options.players)
+
+    def users(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("users")
+        for user_id in range(1, self.options.coaches + self.options.players + 1):
+            is_coach = user_id <= self.options.coaches
+            yield {
+                "user_id": user_id,
+                "email": f"coach{user_id}@academy.test" if is_coach else f"player{user_id}@academy.test",
+                "hashed_password": self.password_hash,
+                "full_name": f"{'Coach' if is_coach else 'Player'} {user_id}",
+                "position": None if is_coach else rng.choice(POSITIONS),
+                "current_club": rng.choice(CLUBS),
+                "date_of_birth": None if is_coach else date(2005 + rng.randint(0, 10), rng.randint(1, 12), rng.randint(1, 28)),
+                "is_active": rng.random() > 0.02,
+                "is_coach": is_coach,
+                "role": "coach" if is_coach else "player",
+                "created_at": self.created_at,
+                "last_login": None,
+            }
+
+    def player_stats(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("player_stats")
+        for index, player_id in enumerate(self.player_ids, 1):
+            ratings = {name: round(rng.uniform(35, 90), 1) for name in ("pace", "shooting", "passing", "dribbling", "juggles", "first_touch")}
+            yield {
+                "id": index,
+                "player_id": player_id,
+                **ratings,
+                "overall_rating": round(sum(ratings.values()) / len(ratings), 1),
+                "last_updated": self.created_at,
+            }
+
+    def badges(self) -> Iterator[Dict[str, Any]]:
+        for badge_id in range(1, self.options.challenges + 1):
+            yield {
+                "id": badge_id,
+                "name": f"Badge {badge_id}",
+                "description": f"Awarded for completing challenge {badge_id}",
+                "image_url": f"/static/badges/{badge_id}.png",
+                "criteria": "Complete the challenge",
+                "created_at": self.created_at,
+            }
+
+    def challenges(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("challenges")
+        for challenge_id in range(1, self.options.challenges + 1):
+            start = self.created_at + timedelta(days=7 * (challenge_id - 1))
+            yield {
+                "id": challenge_id,
+                "title": f"Challenge {challenge_id}",
+                "description": f"Synthetic challenge {challenge_id}",
+                "category": CATEGORIES[challenge_id % len(CATEGORIES)],
+                "difficulty": DIFFICULTIES[challenge_id % len(DIFFICULTIES)],
+                "points": rng.choice([50, 100, 150, 200]),
+                "criteria": {"metric": "count", "target": rng.randint(10, 100)},
+                "start_date": start,
+                "end_date": start + timedelta(days=rng.choice([7, 14, 28])),
+                "created_by": 1 + (challenge_id % max(self.options.coaches, 1)),
+                "created_at": start,
+                "updated_at": start,
+                "is_active": True,
+                "badge_id": challenge_id,
+                # Each category climbs through five levels
+                "level": 1 + ((challenge_id - 1) // len(CATEGORIES)) % 5,
+                "is_weekly": False,
+                "prerequisite_id": None,
+            }
+
+    def _completion_plan(self) -> Iterator[tuple]:
+        """Yield (completion_id, player_id, challenge_id, completed) deterministically."""
+        rng = self._rng("completions")
+        per_player = min(self.options.completions_per_player, self.options.challenges)
+        completion_id = 0
+        for player_id in self.player_ids:
+            for challenge_id in sorted(rng.sample(range(1, self.options.challenges + 1), per_player)):
+                completion_id += 1
+                yield completion_id, player_id, challenge_id, rng.random() < 0.4
+
+    def challenge_completions(self) -> Iterator[Dict[str, Any]]:
+        for completion_id, player_id, challenge_id, completed in self._completion_plan():
+            joined = self.created_at + timedelta(days=7 * (challenge_id - 1))
+            yield {
+                "id": completion_id,
+                "user_id": player_id,
+                "challenge_id": challenge_id,
+                "status": ChallengeStatus.COMPLETED if completed else ChallengeStatus.ACTIVE,
+                "progress": 0.0,
+                "completed_at": joined + timedelta(days=5) if completed else None,
+                "verified_by": 1 if completed else None,
+                "notes": None,
+                "created_at": joined,
+                "updated_at": joined,
+            }
+
+    def challenge_results(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("challenge_results")
+        result_id = 0
+        for completion_id, player_id, challenge_id, completed in self._completion_plan():
+            joined = self.created_at + timedelta(days=7 * (challenge_id - 1))
+            for attempt in range(rng.randint(1, 2 * self.options.results_per_completion - 1)):
+                result_id += 1
+                yield {
+                    "id": result_id,
+                    "completion_id": completion_id,
+                    "result_value": float(rng.randint(1, 120)),
+                    "notes": None,
+                    "submitted_at": joined + timedelta(hours=6 * attempt + rng.randint(0, 5)),
+                }
+
+    def achievements(self) -> Iterator[Dict[str, Any]]:
+        achievement_id = 0
+        for completion_id, player_id, challenge_id, completed in self._completion_plan():
+            if completed:
+                achievement_id += 1
+                yield {
+                    "id": achievement_id,
+                    "user_id": player_id,
+                    "badge_id": challenge_id,
+                    "earned_at": self.created_at + timedelta(days=7 * (challenge_id - 1) + 5),
+                    "awarded_by": 1,
+                }
+
+    def challenge_entries(self) -> Iterator[Dict[str, Any]]:
+        entry_id = 0
+        for completion_id, player_id, challenge_id, completed in self._completion_plan():
+            if completed:
+                entry_id += 1
+                yield {
+                    "id": entry_id,
+                    "player_id": player_id,
+                    "challenge_id": challenge_id,
+                    "points_earned": 100,
+                    "completed_date": self.created_at + timedelta(days=7 * (challenge_id - 1) + 5),
+                    "included_in_rankings": True,
+                    "created_at": self.created_at,
+                }
+
+    def league_table(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("league_table")
+        for rank, player_id in enumerate(self.player_ids, 1):
+            yield {
+                "id": rank,
+                "player_id": player_id,
+                "points": max(0, 10000 - rank * 3),
+                "challenges_completed": rng.randint(0, self.options.completions_per_player),
+                "tests_completed": self.options.test_years * self.options.tests_per_year,
+                "average_rating": round(rng.uniform(40, 90), 1),
+                "rank": rank,
+                "previous_rank": rank,
+                "rank_change": 0,
+                "last_updated": self.created_at,
+            }
+
+    def tests(self) -> Iterator[Dict[str, Any]]:
+        for test_id, name in enumerate(("pace", "shooting", "passing", "dribbling", "juggles", "first_touch"), 1):
+            yield {
+                "id": test_id,
+                "name": name,
+                "description": f"{name} test",
+                "category": name,
+                "difficulty_level": "medium",
+                "instructions": "",
+                "points_scale": 1.0,
+                "created_by": 1,
+                "created_at": self.created_at,
+                "updated_at": self.created_at,
+            }
+
+    def player_tests(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("player_tests")
+        interval = timedelta(days=365 // max(self.options.tests_per_year, 1))
+        test_id = 0
+        for player_id in self.player_ids:
+            position = POSITIONS[player_id % len(POSITIONS)]
+            for n in range(self.options.test_years * self.options.tests_per_year):
+                test_id += 1
+                ratings = {name: rng.randint(30, 95) for name in ("pace", "shooting", "passing", "dribbling", "juggles", "first_touch")}
+                yield {
+                    "id": test_id,
+                    "player_id": player_id,
+                    "test_date": self.created_at + interval * n,
+                    "position": position,
+                    "pace": round(rng.uniform(3.5, 7.0), 2),
+                    "shooting": float(rng.randint(0, 10)),
+                    "passing": float(rng.randint(0, 10)),
+                    "dribbling": round(rng.uniform(8.0, 20.0), 2),
+                    "juggles": float(rng.randint(0, 200)),
+                    "first_touch": float(rng.randint(0, 10)),
+                    **{f"{name}_rating": value for name, value in ratings.items()},
+                    "overall_rating": sum(ratings.values()) // len(ratings),
+                    "notes": None,
+                    "recorded_by": 1 + (player_id % max(self.options.coaches, 1)),
+                }
+
+    def development_plans(self) -> Iterator[Dict[str, Any]]:
+        for index, player_id in enumerate(self.player_ids, 1):
+            yield {
+                "id": index,
+                "title": f"Development plan for player {player_id}",
+                "long_term_goals": "Improve first touch and weak foot",
+                "notes": None,
+                "user_id": player_id,
+                "created_at": self.created_at,
+                "updated_at": self.created_at,
+            }
+
+    def focus_areas(self) -> Iterator[Dict[str, Any]]:
+        focus_area_id = 0
+        for plan_id in range(1, self.options.players + 1):
+            for priority, title in enumerate(("Ball control", "Passing range", "Finishing"), 1):
+                focus_area_id += 1
+                yield {
+                    "id": focus_area_id,
+                    "title": title,
+                    "description": f"{title} drills",
+                    "development_plan_id": plan_id,
+                    "priority": priority,
+                    "status": "in_progress",
+                    "target_date": None,
+                    "notes": None,
+                    "created_at": self.created_at,
+                    "updated_at": self.created_at,
+                }
+
+    def training_schedules(self) -> Iterator[Dict[str, Any]]:
+        schedule_id = 0
+        for plan_id, player_id in enumerate(self.player_ids, 1):
+            for week in range(self.options.schedule_weeks):
+                schedule_id += 1
+                monday = self.options.start_date + timedelta(weeks=week)
+                iso_year, iso_week, _ = monday.isocalendar()
+                yield {
+                    "id": schedule_id,
+                    "user_id": player_id,
+                    "development_plan_id": plan_id,
+                    "week_number": iso_week,
+                    "year": iso_year,
+                    "title": f"Week {iso_week}",
+                    "notes": None,
+                    "created_at": self.created_at,
+                    "updated_at": self.created_at,
+                }
+
+    def training_sessions(self) -> Iterator[Dict[str, Any]]:
+        session_id = 0
+        days = [2, 4, 6, 1, 3, 5, 7][:self.options.sessions_per_week]
+        for plan_index in range(self.options.players):
+            for week in range(self.options.schedule_weeks):
+                schedule_id = plan_index * self.options.schedule_weeks + week + 1
+                monday = self.options.start_date + timedelta(weeks=week)
+                for day in days:
+                    session_id += 1
+                    yield {
+                        "id": session_id,
+                        "schedule_id": schedule_id,
+                        "day_of_week": day,
+                        "session_date": monday + timedelta(days=day - 1),
+                        "title": "Technical training",
+                        "description": "Rondos, passing patterns and finishing",
+                        "start_time": dt_time(16, 0),
+                        "end_time": dt_time(17, 30),
+                        "location": "Pitch 2",
+                        "focus_area_id": plan_index * 3 + 1 + (day % 3),
+                        "has_reflection": False,
+                        "reflection_text": None,
+                        "reflection_added_at": None,
+                        "created_at": self.created_at,
+                        "updated_at": self.created_at,
+                    }
+
+
+# Load order respects foreign keys
+TABLES = [
+    (User, "users"),
+    (PlayerStats, "player_stats"),
+    (Badge, "badges"),
+    (Challenge, "challenges"),
+    (ChallengeCompletion, "challenge_completions"),
+    (ChallengeResult, "challenge_results"),
+    (Achievement, "achievements"),
+    (ChallengeEntry, "challenge_entries"),
+    (LeagueTableEntry, "league_table"),
+    (Test, "tests"),
+    (PlayerTest, "player_tests"),
+    (DevelopmentPlan, "development_plans"),
+    (FocusArea, "focus_areas"),
+    (TrainingSchedule, "training_schedules"),
+    (TrainingSession, "training_sessions"),
+]
+
+
+def _reset_sequences(connection: Connection) -> None:
+    """Move PostgreSQL serial sequences past the explicitly inserted primary keys."""
+    for model, _ in TABLES:
+        table = model.__table__
+        pk = list(table.primary_key.columns)[0].name
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk}'), "
+            f"COALESCE((SELECT MAX({pk}) FROM {table.name}), 0) + 1, false)"
+        ))
+
+
+def seed_database(engine: Engine, options: SeedOptions, reset: bool = False) -> Dict[str, int]:
+    """
+    Bulk-load a synthetic academy into the given engine.
+
+    Args:
+        engine: The engine to load into
+        options: Dataset sizes and the random seed
+        reset: Drop and recreate all tables first
+
+    Returns:
+        Row counts per table
+    """
+    from services.auth import get_pwd_context
+    from services.challenges import status_initialization_insert
+    from services.result_partitions import partition_results_table, ensure_partitions
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        # Match the migrated schema, where results are partitioned by month, with
+        # the history's months in place so the load does not go to the default partition
+        partition_results_table(connection, since=options.start_date)
+
+    generator = AcademyGenerator(options, get_pwd_context().hash(SEED_PASSWORD))
+    counts = {}
+    with engine.begin() as connection:
+        for model, name in TABLES:
+            counts[name] = bulk_load(connection, model, getattr(generator, name)(), options.chunk_size)
+        counts["user_challenge_statuses"] = connection.execute(status_initialization_insert()).rowcount
+        if connection.dialect.name == "postgresql":
+            ensure_partitions(connection)
+            _reset_sequences(connection)
+            connection.execute(text("ANALYZE"))
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load a deterministic synthetic academy dataset")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="Target database (defaults to DATABASE_URL)")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables before loading")
+    defaults = SeedOptions()
+    for field in SeedOptions.__fields__.values():
+        if field.type_ in (int,):
+            parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=getattr(defaults, field.name))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    options = SeedOptions(**{name: getattr(args, name) for name in SeedOptions.__fields__ if hasattr(args, name)})
+    engine = create_engine(args.database_url)
+
+    started = time.perf_counter()
+    counts = seed_database(engine, options, reset=args.reset)
+    logger.info(f"Loaded {sum(counts.values())} rows in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Response serialization microbenchmark.
+
+Builds a challenge league table payload the way the league table endpoint
+does and times three ways of turning it into a response body:
+
+  validated/json    response_model validation + jsonable_encoder + stdlib json
+                    (FastAPI's default before ORJSONResponse)
+  validated/orjson  the same validation passes, encoded by ORJSONResponse
+                    (the app's default response class)
+  prebuilt/orjson   ORJSONResponse on the prebuilt dicts, which is what
+                    routers.responses.prebuilt_response returns
+
+No database or server is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --entries 5000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from schemas import ChallengeLeagueTableResponse
+
+
+def league_table_payload(entries: int) -> Dict[str, Any]:
+    """A challenge league table with the given number of ranked players."""
+    submitted_at = datetime(2026, 10, 19, 17, 30, 12, 345678)
+    return {
+        "challenge_id": 1,
+        "challenge_title": "Juggling",
+        "challenge_description": "Keep the ball up as long as you can",
+        "entries": [
+            {
+                "user_id": n + 1,
+                "full_name": f"Player {n + 1}",
+                "position": "midfielder" if n % 3 else None,
+                "current_club": f"Club {n % 40}",
+                "best_result": float(entries - n),
+                "submitted_at": submitted_at - timedelta(minutes=n),
+                "rank": n + 1
+            } for n in range(entries)
+        ]
+    }
+
+
+def time_call(render: Callable[[], bytes], repeat: int) -> Dict[str, Any]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = render()
+        samples.append(time.perf_counter() - started)
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+        "min_ms": round(min(samples) * 1000, 2),
+        "bytes": len(body),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare response serialization paths on a league table")
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Write the timings to this JSON file")
+    args = parser.parse_args(argv)
+
+    payload = league_table_payload(args.entries)
+    field = create_response_field(name="league_table", type_=ChallengeLeagueTableResponse)
+
+    def validated() -> Any:
+        return asyncio.run(serialize_response(field=field, response_content=payload))
+
+    paths = {
+        "validated/json": lambda: JSONResponse(validated()).body,
+        "validated/orjson": lambda: ORJSONResponse(validated()).body,
+        "prebuilt/orjson": lambda: ORJSONResponse(payload).body,
+    }
+    # All three paths must produce the same document
+    documents = {name: json.loads(render()) for name, render in paths.items()}
+    assert all(document == documents["validated/json"] for document in documents.values())
+
+    runs = {name: time_call(render, args.repeat) for name, render in paths.items()}
+    baseline = runs["validated/json"]["median_ms"]
+    print(f"\n{args.entries} league table entries, median of {args.repeat} runs")
+    print(f"{'path':<18} {'median ms':>10} {'min ms':>8} {'speedup':>8}")
+    for name, run in runs.items():
+        run["speedup"] = round(baseline / max(run["median_ms"], 1e-9), 1)
+        print(f"{name:<18} {run['median_ms']:>10.2f} {run['min_ms']:>8.2f} {run['speedup']:>7.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"entries": args.entries, "runs": runs}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
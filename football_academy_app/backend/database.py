@@ -1,56 +1,227 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from config import settings
-import sys
+from pool_telemetry import PoolTelemetry, instrumented_pool_class
+from session_routing import READ_METHODS, RecentWriters, RoutingSession, caller_key
+from starlette.requests import Request
+from typing import Any, Callable, Dict, Optional
+import threading
 
-# Ensure we're using PostgreSQL
-if not settings.DATABASE_URL.startswith("postgresql"):
-    print("ERROR: Database URL must be a PostgreSQL connection string")
-    print(f"Current DATABASE_URL: {settings.DATABASE_URL}")
-    sys.exit(1)
-
-# Create SQLAlchemy engine - PostgreSQL only
-engine = create_engine(
-    settings.DATABASE_URL
+# Pool sizing and health checks shared by all engines. Pre-ping and recycling
+# replace connections dropped by PgBouncer or a failover before a request uses them
+pool_options = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
 )
+pool_telemetry = {"sync": PoolTelemetry("sync"), "async": PoolTelemetry("async")}
+recent_writers = RecentWriters(settings.READ_YOUR_WRITES_SECONDS)
+
+# Async driver for each supported backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def backend_name(url: str) -> str:
+    """The supported backend the URL points at: postgresql or sqlite."""
+    backend = make_url(url).get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"DATABASE_URL must be a PostgreSQL or SQLite connection string, got {url}")
+    return backend
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Per-connection SQLite settings for a single box serving many requests:
+    WAL lets readers run alongside the writer, synchronous=NORMAL is durable
+    in WAL mode short of power loss, and the busy timeout makes a second
+    writer wait instead of failing at once.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    # Enforce foreign keys like PostgreSQL does
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _engine_options(backend: str, is_async: bool) -> Dict[str, Any]:
+    if backend == "sqlite":
+        # The driver's own wait matches the busy timeout; connections move between threads
+        connect_args = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000, "check_same_thread": False}
+    else:
+        connect_args = {"timeout" if is_async else "connect_timeout": settings.DB_CONNECT_TIMEOUT}
+    return dict(connect_args=connect_args, **pool_options)
+
+
+def create_database_engine(url: str, telemetry: Optional[PoolTelemetry] = None) -> Engine:
+    """A configured engine for a PostgreSQL or SQLite URL."""
+    backend = backend_name(url)
+    options = _engine_options(backend, is_async=False)
+    options["poolclass"] = instrumented_pool_class(QueuePool, telemetry) if telemetry else QueuePool
+    engine = create_engine(url, **options)
+    if backend == "sqlite":
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    if telemetry is not None:
+        telemetry.listen(engine)
+    return engine
+
+
+def create_async_database_engine(url: str, telemetry: Optional[PoolTelemetry] = None) -> AsyncEngine:
+    """The async counterpart of create_database_engine, on asyncpg or aiosqlite."""
+    backend = backend_name(url)
+    options = _engine_options(backend, is_async=True)
+    # aiosqlite would default to NullPool, opening a connection per checkout
+    options["poolclass"] = (
+        instrumented_pool_class(AsyncAdaptedQueuePool, telemetry) if telemetry else AsyncAdaptedQueuePool
+    )
+    async_url = make_url(url).set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    async_engine = create_async_engine(async_url, **options)
+    if backend == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    if telemetry is not None:
+        telemetry.listen(async_engine.sync_engine)
+    return async_engine
+
+
+# Engines are created on first use rather than at import, so importing the
+# app (or a model) neither loads a database driver nor validates the URL
+_engines: Dict[str, Any] = {}
+_engines_lock = threading.Lock()
+
+
+def _create_engines() -> None:
+    replica_url = settings.DATABASE_REPLICA_URL
+    _engines.update(
+        engine=create_database_engine(settings.DATABASE_URL, pool_telemetry["sync"]),
+        async_engine=create_async_database_engine(settings.DATABASE_URL, pool_telemetry["async"]),
+        # Optional read replica for GET requests (see session_routing)
+        replica_engine=create_database_engine(replica_url) if replica_url else None,
+        async_replica_engine=create_async_database_engine(replica_url) if replica_url else None,
+    )
+
+
+def _get(name: str) -> Any:
+    if not _engines:
+        with _engines_lock:
+            if not _engines:
+                _create_engines()
+    return _engines[name]
+
+
+def get_engine() -> Engine:
+    return _get("engine")
+
+
+def get_async_engine() -> AsyncEngine:
+    return _get("async_engine")
+
+
+def get_replica_engine() -> Optional[Engine]:
+    return _get("replica_engine")
+
+
+def get_async_replica_engine() -> Optional[AsyncEngine]:
+    return _get("async_replica_engine")
+
+
+def pool_snapshots() -> Dict[str, Dict[str, Any]]:
+    """
+    Pool state and checkout telemetry of the primary engines created so far.
+    Engines that have not been used yet are left out rather than created.
+    """
+    engines = {"sync": _engines.get("engine"), "async": _engines.get("async_engine")}
+    return {
+        name: pool_telemetry[name].snapshot(engine.pool if name == "sync" else engine.sync_engine.pool)
+        for name, engine in engines.items() if engine is not None
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps `from database import engine` working without creating it at import
+    if name in ("engine", "async_engine", "replica_engine", "async_replica_engine"):
+        return _get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySessionmaker(sessionmaker):
+    """sessionmaker that is bound to its engines when the first session is made."""
+
+    def __init__(self, binds: Callable[[], Dict[str, Any]], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._binds: Optional[Callable[[], Dict[str, Any]]] = binds
+
+    def __call__(self, **local_kw):
+        binds = self._binds
+        if binds is not None:
+            self.configure(**binds())
+            self._binds = None
+        return super().__call__(**local_kw)
 
-# Create async engine - PostgreSQL only
-async_engine = create_async_engine(
-    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-)
 
 # Create session factory
-SessionLocal = sessionmaker(
+SessionLocal = LazySessionmaker(
+    lambda: {"bind": get_engine(), "replica_bind": get_replica_engine()},
     autocommit=False, 
     autoflush=False, 
-    bind=engine,
+    class_=RoutingSession,
     expire_on_commit=False
 )
 
 # Create async session factory
-AsyncSessionLocal = sessionmaker(
-    async_engine,
+AsyncSessionLocal = LazySessionmaker(
+    lambda: {
+        "bind": get_async_engine(),
+        "replica_bind": get_async_replica_engine().sync_engine if get_async_replica_engine() else None,
+    },
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False
 )
 
 # Create base class for models
 Base = declarative_base()
 
+def use_replica(request: Request) -> bool:
+    """
+    Whether the request's reads may go to the replica: GET requests from
+    callers who have not written within READ_YOUR_WRITES_SECONDS. Any other
+    request is a write and starts (or extends) the caller's window.
+    """
+    caller = caller_key(request)
+    if request.method not in READ_METHODS:
+        recent_writers.record(caller)
+        return False
+    return not recent_writers.wrote_recently(caller)
+
 # Dependency to get DB session
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["use_replica"] = use_replica(request)
     try:
         yield db
     finally:
         db.close()
+        if request.method not in READ_METHODS:
+            # The window runs from the end of the write, when replicas start catching up
+            recent_writers.record(caller_key(request))
 
 # Async dependency to get DB session
-async def get_async_db():
+async def get_async_db(request: Request):
     async with AsyncSessionLocal() as session:
+        session.sync_session.info["use_replica"] = use_replica(request)
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+            if request.method not in READ_METHODS:
+                recent_writers.record(caller_key(request)) 
\ No newline at end of file
@@ -1,15 +1,20 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import os
 
-from database import engine, Base
+from config import settings
+from database import SessionLocal, pool_snapshots
+from middleware import IdempotencyMiddleware, CompressionMiddleware, PrecompressedStaticFiles
+from services.auth import get_current_user_dependency
+from services.challenge_expiry import ChallengeExpirySweeper
 
 # Import routers
 from routers import (
-    auth, 
-    skill_tests, 
-    challenges, 
+    auth,
+    skill_tests,
+    challenges,
     league_table,
     development_plans,
     training_schedules
@@ -22,66 +27,98 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create FastAPI app
-app = FastAPI(
-    title="Football Academy API",
-    description="""
-    Football Academy API provides endpoints for managing player profiles, training plans, 
-    challenges, achievements, and player statistics. 
-    
-    This API allows players to track their progress, complete challenges, and improve their football skills.
-    """,
-    version="2.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+def create_app() -> FastAPI:
+    """
+    Build the application. Nothing here touches the database: the schema is
+    managed by Alembic (`alembic upgrade head`) and the engines are created
+    by the first request that needs them.
+    """
+    app = FastAPI(
+        title="Football Academy API",
+        description="""
+        Football Academy API provides endpoints for managing player profiles, training plans,
+        challenges, achievements, and player statistics.
+
+        This API allows players to track their progress, complete challenges, and improve their football skills.
+        """,
+        version="2.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
+    )
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Replay stored responses for writes retried with an Idempotency-Key
+    app.add_middleware(IdempotencyMiddleware)
+
+    # Compress large JSON/HTML responses; added last so it wraps the stored idempotent responses
+    app.add_middleware(CompressionMiddleware)
+
+    # Deactivate challenges and expire their completions as end dates pass
+    expiry_sweeper = ChallengeExpirySweeper(SessionLocal)
+    app.state.expiry_sweeper = expiry_sweeper
+
+    @app.on_event("startup")
+    async def start_expiry_sweeper():
+        if settings.CHALLENGE_EXPIRY_SWEEPER:
+            expiry_sweeper.start()
+
+    @app.on_event("shutdown")
+    async def stop_expiry_sweeper():
+        await expiry_sweeper.stop()
+
+    # Mount static files if they exist, compressed once at startup
+    static_dir = os.path.join(os.path.dirname(__file__), "static")
+    if os.path.exists(static_dir):
+        app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+
+    # Include routers with the v2 prefix
+    app.include_router(auth.router, prefix="/api/v2")
+    app.include_router(skill_tests.router, prefix="/api/v2")
+    app.include_router(challenges.router, prefix="/api/v2")
+    app.include_router(league_table.router, prefix="/api/v2")
+    app.include_router(development_plans.router, prefix="/api/v2")
+    app.include_router(training_schedules.router, prefix="/api/v2")
+
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Welcome to Football Academy API",
+            "docs_url": "/docs",
+            "version": "2.0.0"
+        }
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/debug/routes")
+    async def list_routes():
+        routes = []
+        for route in app.routes:
+            if hasattr(route, "path"):
+                routes.append({
+                    "path": route.path,
+                    "name": route.name,
+                    "methods": route.methods if hasattr(route, "methods") else None
+                })
+        return routes
+
+    @app.get("/debug/pool", dependencies=[Depends(get_current_user_dependency)])
+    async def pool_status():
+        """Connection pool state and checkout telemetry of this worker's engines."""
+        return pool_snapshots()
+
+    return app
+
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Mount static files if they exist
-static_dir = os.path.join(os.path.dirname(__file__), "static")
-if os.path.exists(static_dir):
-    from fastapi.staticfiles import StaticFiles
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
-
-# Include routers with the v2 prefix
-app.include_router(auth.router, prefix="/api/v2")
-app.include_router(skill_tests.router, prefix="/api/v2")
-app.include_router(challenges.router, prefix="/api/v2")
-app.include_router(league_table.router, prefix="/api/v2")
-app.include_router(development_plans.router, prefix="/api/v2")
-app.include_router(training_schedules.router, prefix="/api/v2")
-
-@app.get("/")
-async def root():
-    return {
-        "message": "Welcome to Football Academy API",
-        "docs_url": "/docs",
-        "version": "2.0.0"
-    }
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
-
-@app.get("/debug/routes")
-async def list_routes():
-    routes = []
-    for route in app.routes:
-        if hasattr(route, "path"):
-            routes.append({
-                "path": route.path,
-                "name": route.name,
-                "methods": route.methods if hasattr(route, "methods") else None
-            })
-    return routes 
\ No newline at end of file
+app = create_app()
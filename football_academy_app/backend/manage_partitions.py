@@ -0,0 +1,55 @@
+"""
+Maintain the monthly partitions of challenge_results.
+
+Run daily (e.g. from cron) so next months' partitions exist before the first
+result of the month arrives:
+    python manage_partitions.py --months-ahead 3
+    python manage_partitions.py --list
+    python manage_partitions.py --detach-before 2024-01
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# Add the parent directory to the path so that imports work correctly
+sys.path.append(str(Path(__file__).parent))
+
+from database import engine
+from services.result_partitions import (
+    MONTHS_AHEAD, ensure_partitions, detach_partitions_before, is_partitioned, list_partitions
+)
+
+
+def manage_partitions(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Maintain the monthly partitions of challenge_results")
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD,
+                        help="Create partitions through this many months after the current one")
+    parser.add_argument("--detach-before", metavar="YYYY-MM",
+                        help="Detach monthly partitions older than this month so they can be archived")
+    parser.add_argument("--list", action="store_true", help="List partitions and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            print("challenge_results is not partitioned; run the Alembic migrations on PostgreSQL first")
+            return
+
+        if args.list:
+            for name, month in list_partitions(connection):
+                print(f"{name}\t{month.strftime('%Y-%m') if month else 'default'}")
+            return
+
+        created = ensure_partitions(connection, args.months_ahead)
+        print(f"Created {len(created)} partitions")
+        if args.detach_before:
+            cutoff = datetime.strptime(args.detach_before, "%Y-%m").date()
+            detached = detach_partitions_before(connection, cutoff)
+            print(f"Detached {len(detached)} partitions")
+
+
+if __name__ == "__main__":
+    manage_partitions()
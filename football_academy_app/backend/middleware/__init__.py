@@ -1,4 +1,7 @@
 from .cors import add_cors_middleware
 from .logging import LoggingMiddleware
+from .idempotency import IdempotencyMiddleware, IdempotencyStore, idempotency_store
+from .compression import CompressionMiddleware, PrecompressedStaticFiles
 
-__all__ = ['add_cors_middleware', 'LoggingMiddleware'] 
\ No newline at end of file
+__all__ = ['add_cors_middleware', 'LoggingMiddleware', 'IdempotencyMiddleware', 'IdempotencyStore', 'idempotency_store',
+           'CompressionMiddleware', 'PrecompressedStaticFiles'] 
\ No newline at end of file
@@ -0,0 +1,210 @@
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+from email.utils import formatdate
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Media types worth compressing; images, fonts and archives already are
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The best encoding the client accepts: br if brotli is installed, else
+    gzip. `*` stands for any coding the client did not refuse with q=0.
+    """
+    accepted, refused = set(), set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    refused.add(coding)
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+
+    def acceptable(coding: str) -> bool:
+        return coding in accepted or ("*" in accepted and coding not in refused)
+
+    if brotli is not None and acceptable("br"):
+        return "br"
+    if acceptable("gzip"):
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with brotli or gzip, as the client accepts.
+
+    Only compressible media types at or above COMPRESSION_MINIMUM_SIZE bytes
+    are compressed; small bodies gain nothing over the framing overhead.
+    Responses that already carry a Content-Encoding (such as precompressed
+    static files) and streamed responses are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE if minimum_size is None else minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        decided = False
+
+        async def compressing_send(message: Message) -> None:
+            nonlocal start, decided
+            if decided:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows the size
+                start = message
+                return
+
+            decided = True
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            eligible = is_compressible(headers.get("content-type")) and "content-encoding" not in headers
+            if eligible:
+                _add_vary(headers)
+            if eligible and not message.get("more_body", False) and len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+                message = {**message, "body": body}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, compressing_send)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that compresses each compressible file once, the first time
+    it is requested, and serves the encoded bytes to clients that accept
+    them. Mounting it reads nothing, so importing the app stays cheap; a file
+    edited on disk is compressed again on its next request.
+
+    Every file gets an ETag and a Cache-Control header: assets are cached for
+    STATIC_CACHE_MAX_AGE seconds, while HTML pages, whose URLs never change,
+    are revalidated against the ETag on each load.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Real path -> (size, mtime, etag, {encoding: bytes})
+        self.precompressed: Dict[str, Tuple[int, float, str, Dict[str, bytes]]] = {}
+
+    def _precompressed(self, path: str, stat_result: os.stat_result) -> Optional[Tuple[int, float, str, Dict[str, bytes]]]:
+        """The compressed variants of a file, built on first use and whenever it changes."""
+        content_type, _ = mimetypes.guess_type(path)
+        if not is_compressible(content_type) or stat_result.st_size < settings.COMPRESSION_MINIMUM_SIZE:
+            return None
+        real_path = os.path.realpath(path)
+        entry = self.precompressed.get(real_path)
+        if entry is not None and (entry[0], entry[1]) == (stat_result.st_size, stat_result.st_mtime):
+            return entry
+        with open(path, "rb") as f:
+            body = f.read()
+        encodings = {"gzip": compress(body, "gzip")}
+        if brotli is not None:
+            encodings["br"] = compress(body, "br")
+        entry = (stat_result.st_size, stat_result.st_mtime, hashlib.md5(body).hexdigest(), encodings)
+        self.precompressed[real_path] = entry
+        return entry
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        content_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        cache_control = (
+            "no-cache" if content_type == "text/html"
+            else f"public, max-age={settings.STATIC_CACHE_MAX_AGE}"
+        )
+
+        entry = self._precompressed(str(full_path), stat_result)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        if entry is None or encoding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers["cache-control"] = cache_control
+            if entry is not None:
+                response.headers["vary"] = "Accept-Encoding"
+            return response
+
+        _, _, etag, encodings = entry
+        if encoding not in encodings:
+            encoding = "gzip"
+        body = encodings[encoding]
+        headers = {
+            "content-type": f"{content_type}; charset=utf-8" if content_type.startswith("text/") else content_type,
+            "content-encoding": encoding,
+            "content-length": str(len(body)),
+            # Each encoding is a different representation, so it gets its own tag
+            "etag": f'"{etag}-{encoding}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": cache_control,
+            "vary": "Accept-Encoding",
+        }
+        if self.is_not_modified(Headers(headers), request_headers):
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "content-length"})
+        return Response(
+            content=b"" if scope["method"] == "HEAD" else body,
+            status_code=status_code,
+            headers=headers
+        )
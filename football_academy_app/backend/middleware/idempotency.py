@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class StoredResponse:
+    """A completed response, or a placeholder while the first request is still running."""
+
+    def __init__(self, fingerprint: str, expires_at: float):
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+        self.status: Optional[int] = None
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.body = b""
+        self.done = asyncio.Event()
+
+
+class IdempotencyStore:
+    """In-process LRU of responses by idempotency key, each kept for a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], StoredResponse]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def start(self, key: Tuple[str, str], fingerprint: str) -> StoredResponse:
+        entry = StoredResponse(fingerprint, time.monotonic() + self.ttl_seconds)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Shared by the middleware instances of this worker
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_ENTRIES)
+
+
+class IdempotencyMiddleware:
+    """
+    Replays the stored response when a write is retried with the same
+    Idempotency-Key header, without running the endpoint again.
+
+    Keys are scoped to the caller's Authorization header, and requests
+    without one are passed through untouched, since anonymous callers cannot
+    be told apart. Reusing a key for a different request is rejected with
+    422, and a retry that arrives while the first request is still running
+    waits for its response. Server errors are not stored, so those requests
+    can be retried; of the retries waiting on a failed attempt, one runs the
+    request again and the rest wait for its response. Responses are kept in
+    memory per worker for IDEMPOTENCY_TTL_SECONDS.
+    """
+
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.store = store or idempotency_store
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(IDEMPOTENCY_HEADER)
+        authorization = headers.get("authorization")
+        if not idempotency_key or not authorization:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = hashlib.sha256(b"\n".join([
+            scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body
+        ])).hexdigest()
+        caller = hashlib.sha256(authorization.encode()).hexdigest()
+        key = (caller, idempotency_key)
+
+        # Nothing awaits between finding no entry and starting one, so when a
+        # failed attempt is discarded only the first waiter to wake re-runs it
+        entry = self.store.get(key)
+        while entry is not None:
+            await entry.done.wait()
+            if entry.fingerprint != fingerprint:
+                response = JSONResponse(
+                    status_code=422,
+                    content={"detail": "Idempotency-Key was already used for a different request"}
+                )
+                await response(scope, receive, send)
+                return
+            if entry.status is not None:
+                logger.info(f"Replaying response for idempotency key {idempotency_key}")
+                await _replay(entry, send)
+                return
+            entry = self.store.get(key)
+
+        entry = self.store.start(key, fingerprint)
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                entry.status = message["status"]
+                entry.headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                entry.body += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        finally:
+            if entry.status is None or entry.status >= 500:
+                entry.status = None
+                self.store.discard(key)
+            entry.done.set()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def _replay(entry: StoredResponse, send: Send) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": entry.status,
+        "headers": entry.headers + [(REPLAYED_HEADER, b"true")]
+    })
+    await send({"type": "http.response.body", "body": entry.body})
@@ -1,11 +1,12 @@
 # Import all models
 from .users import User
 from .skill_tests import PlayerStats, Test, TestEntry, PlayerTest
-from .challenges import Challenge, ChallengeStatus, ChallengeCompletion, ChallengeResult, Badge, Achievement
+from .challenges import Challenge, ChallengeStatus, ChallengeCompletion, ChallengeResult, Badge, Achievement, UserChallengeStatus
 from .league_table import LeagueTableEntry, ChallengeEntry
 from .development_plans import DevelopmentPlan
 from .focus_areas import FocusArea
 from .training_schedules import TrainingSchedule, TrainingSession
+from .reference_data import ReferenceDataVersion
 
 # Export all models
 __all__ = [
@@ -20,10 +21,12 @@ __all__ = [
     "ChallengeResult",
     "Badge",
     "Achievement",
+    "UserChallengeStatus",
     "LeagueTableEntry",
     "ChallengeEntry",
     "DevelopmentPlan",
     "FocusArea",
     "TrainingSchedule",
-    "TrainingSession"
+    "TrainingSession",
+    "ReferenceDataVersion"
 ] 
\ No newline at end of file
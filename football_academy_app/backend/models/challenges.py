@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Enum, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -13,6 +13,12 @@ class ChallengeStatus(enum.Enum):
 
 class Challenge(Base):
     __tablename__ = "challenges"
+    __table_args__ = (
+        # The expiry sweeper looks up active challenges past their end date
+        Index("ix_challenges_active_end_date", "is_active", "end_date"),
+        # One weekly challenge per template and week, however many workers roll over
+        Index("uq_challenges_template_start", "template_id", "start_date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -28,6 +34,11 @@ class Challenge(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     is_active = Column(Boolean, default=True)
     badge_id = Column(Integer, ForeignKey("badges.id"), nullable=True)
+    level = Column(Integer, default=1)  # Position in the category's progression, 1 is unlocked from the start
+    is_weekly = Column(Boolean, default=False)  # Weekly challenges are always available
+    prerequisite_id = Column(Integer, ForeignKey("challenges.id", name="fk_challenges_prerequisite_id_challenges"), nullable=True)
+    is_template = Column(Boolean, default=False)  # Weekly templates are cloned into a new challenge every week
+    template_id = Column(Integer, ForeignKey("challenges.id", name="fk_challenges_template_id_challenges"), nullable=True)
     
     # Relationships
     badge = relationship("Badge", back_populates="challenges")
@@ -35,6 +46,12 @@ class Challenge(Base):
 
 class ChallengeCompletion(Base):
     __tablename__ = "challenge_completions"
+    __table_args__ = (
+        # One completion per user and challenge; also serves the per-user listing
+        Index("uq_challenge_completions_user_challenge", "user_id", "challenge_id", unique=True),
+        # Challenge league tables filter by challenge and group by user
+        Index("ix_challenge_completions_challenge_user", "challenge_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"))
@@ -54,14 +71,19 @@ class ChallengeCompletion(Base):
     results = relationship("ChallengeResult", back_populates="completion")
 
 class ChallengeResult(Base):
-    """Stores individual result submissions for a challenge completion."""
+    """Stores individual result submissions for a challenge completion. Append-only."""
     __tablename__ = "challenge_results"
+    __table_args__ = (
+        # Results are always read per completion, newest first
+        Index("ix_challenge_results_completion_submitted", "completion_id", "submitted_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     completion_id = Column(Integer, ForeignKey("challenge_completions.id"))
     result_value = Column(Float, nullable=False)  # The actual result value (e.g., number of juggles)
     notes = Column(String, nullable=True)
-    submitted_at = Column(DateTime, default=func.now())
+    # Partition key on PostgreSQL, see services.result_partitions
+    submitted_at = Column(DateTime, default=func.now(), nullable=False)
     
     # Relationships
     completion = relationship("ChallengeCompletion", back_populates="results")
@@ -69,6 +91,29 @@ class ChallengeResult(Base):
     def __repr__(self):
         return f"<ChallengeResult(id={self.id}, completion_id={self.completion_id}, result_value={self.result_value})>"
 
+class UserChallengeStatus(Base):
+    """
+    Per-user unlock state of a challenge: LOCKED, AVAILABLE or COMPLETED.
+    Rows are created in bulk for a new user or a new challenge.
+    """
+    __tablename__ = "user_challenge_statuses"
+    __table_args__ = (
+        # One status per user and challenge; also serves the per-user listing
+        Index("uq_user_challenge_statuses_user_challenge", "user_id", "challenge_id", unique=True),
+        Index("ix_user_challenge_statuses_challenge_id", "challenge_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    challenge_id = Column(Integer, ForeignKey("challenges.id"), nullable=False)
+    status = Column(String, nullable=False, default="LOCKED")  # "LOCKED", "AVAILABLE" or "COMPLETED"
+    unlocked_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    user = relationship("User")
+    challenge = relationship("Challenge")
+
 class Badge(Base):
     __tablename__ = "badges"
 
@@ -85,6 +130,10 @@ class Badge(Base):
 
 class Achievement(Base):
     __tablename__ = "achievements"
+    __table_args__ = (
+        # A badge is awarded to a user at most once
+        Index("uq_achievements_user_badge", "user_id", "badge_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"))
@@ -26,7 +26,7 @@ class ChallengeEntry(Base):
     __tablename__ = "challenge_entries"
 
     id = Column(Integer, primary_key=True, index=True)
-    player_id = Column(Integer, ForeignKey("users.user_id"))
+    player_id = Column(Integer, ForeignKey("users.user_id"), index=True)
     challenge_id = Column(Integer, ForeignKey("challenges.id"))
     points_earned = Column(Integer, default=0)
     completed_date = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from database import Base
+
+class ReferenceDataVersion(Base):
+    """
+    Generation counter for a group of cached reference tables. Writers bump it,
+    every worker polls it and reloads its local copy when it changes.
+    """
+    __tablename__ = "reference_data_versions"
+
+    name = Column(String, primary_key=True)  # e.g., "challenges"
+    generation = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
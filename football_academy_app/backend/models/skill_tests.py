@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -67,6 +67,10 @@ class TestEntry(Base):
 
 class PlayerTest(Base):
     __tablename__ = "player_tests"
+    __table_args__ = (
+        # Test history is read per player, newest first
+        Index("ix_player_tests_player_date", "player_id", "test_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("users.user_id"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Time, Date, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Time, Date, Text, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from datetime import datetime, date, time
@@ -7,6 +7,10 @@ from database import Base
 
 class TrainingSchedule(Base):
     __tablename__ = "training_schedules"
+    __table_args__ = (
+        # One schedule per user and week
+        Index("uq_training_schedules_user_year_week", "user_id", "year", "week_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"))
@@ -25,6 +29,10 @@ class TrainingSchedule(Base):
 
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
+    __table_args__ = (
+        # Calendar views read a schedule's sessions by date range
+        Index("ix_training_sessions_schedule_date", "schedule_id", "session_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     schedule_id = Column(Integer, ForeignKey("training_schedules.id"))
@@ -44,4 +52,8 @@ class TrainingSession(Base):
 
     # Relationships
     schedule = relationship("TrainingSchedule", back_populates="training_sessions")
-    focus_area = relationship("FocusArea", backref="training_sessions") 
\ No newline at end of file
+    focus_area = relationship("FocusArea", backref="training_sessions")
+
+    @property
+    def focus_area_title(self):
+        return self.focus_area.title if self.focus_area else None
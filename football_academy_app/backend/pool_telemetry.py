@@ -0,0 +1,117 @@
+"""
+Connection pool telemetry.
+
+`instrumented_pool_class` returns a QueuePool subclass that times every
+checkout, including the wait for a free connection and the pre-ping, and
+`PoolTelemetry` adds the pool events: new connections, invalidations after
+disconnects or failovers, and checkouts that needed an overflow connection.
+`GET /debug/pool` shows the snapshot of each engine in this worker.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+# Checkout latencies kept for the percentiles
+LATENCY_SAMPLES = 2000
+
+
+class PoolTelemetry:
+    """Counters and recent checkout latencies of one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.overflow_checkouts = 0
+        self.peak_overflow = 0
+        self.max_checkout_ms = 0.0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def record_checkout(self, elapsed: float, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._latencies.append(elapsed)
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed * 1000)
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def listen(self, engine: Engine) -> None:
+        """Count the pool events of the engine."""
+        def on_connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+
+        def on_soft_invalidate(dbapi_connection, connection_record, exception):
+            self.soft_invalidations += 1
+
+        event.listen(engine, "connect", on_connect)
+        event.listen(engine, "invalidate", on_invalidate)
+        event.listen(engine, "soft_invalidate", on_soft_invalidate)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        def percentile(pct: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))] * 1000, 3)
+
+        snapshot = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_p50_ms": percentile(50),
+            "checkout_p95_ms": percentile(95),
+            "checkout_p99_ms": percentile(99),
+            "checkout_max_ms": round(self.max_checkout_ms, 3),
+            "overflow_checkouts": self.overflow_checkouts,
+            "peak_overflow": self.peak_overflow,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "soft_invalidations": self.soft_invalidations,
+        }
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return snapshot
+
+
+def instrumented_pool_class(base: Type[QueuePool], telemetry: PoolTelemetry) -> Type[QueuePool]:
+    """
+    A subclass of the QueuePool class that reports each checkout to the
+    telemetry. Pool.recreate() reuses the class, so invalidating the whole
+    pool keeps the instrumentation.
+    """
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = base.connect(self)
+        except PoolTimeoutError:
+            telemetry.record_timeout()
+            raise
+        telemetry.record_checkout(time.perf_counter() - started, self.overflow())
+        return connection
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect})
@@ -8,6 +8,7 @@ from typing import Optional
 from models import User as UserModel
 from database import get_db
 from services.auth import AuthService, oauth2_scheme
+from services.challenges import ChallengesService
 from schemas import UserCreate, UserUpdate, UserResponse, Token, TokenData
 
 # Update the OAuth2 scheme to point to the correct token endpoint with full path
@@ -70,6 +71,7 @@ async def register(
             raise HTTPException(status_code=400, detail="Email already registered")
 
         db_user = service.create_user(user=user)
+        ChallengesService(service.db).initialize_statuses_for_user(db_user.user_id)
 
         logger.info(f"User registered successfully: {user.email}")
         return db_user
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List, Dict, Any, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime
-from sqlalchemy import and_, desc
+from sqlalchemy import desc
 
 from models import (
-    User, Challenge, ChallengeStatus, ChallengeCompletion, ChallengeResult,
-    Badge, PlayerStats, Achievement
+    User, ChallengeStatus, ChallengeCompletion, ChallengeResult,
+    PlayerStats, Achievement
 )
 from database import get_db
 from services.auth import get_current_user_dependency
@@ -15,9 +15,16 @@ from schemas import (
     ChallengeStatusResponse, ChallengeCompletionCreate, ChallengeCompletionResponse,
     ChallengeCompletionWithDetails, BadgeWithChallenge, AchievementCreate, AchievementResponse,
     ChallengeStatusEnum, ChallengeResultCreate, ChallengeResultResponse,
-    ChallengeUpdate
+    ChallengeUpdate, BulkVerificationRequest, BulkVerificationResponse
 )
 from services.challenges import ChallengesService
+from services.reference_data import get_reference_data
+from services.result_partitions import submitted_between
+from services.result_ingest import get_result_ingest_queue
+from services.weekly_challenges import roll_over_weekly_challenge
+from services.base import FieldSet
+from .responses import FIELDS_QUERY, prebuilt_response, sparse_response
+from config import settings
 
 router = APIRouter(
     prefix="/challenges",
@@ -69,30 +76,71 @@ async def create_challenge(
 
 @router.get("/", response_model=List[ChallengeResponse])
 async def get_challenges(
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
+    # Served from the reference data cache, so a selection only trims the payload
     service = ChallengesService(db)
-    return service.get_challenges()
+    fieldset = FieldSet.parse(fields, ChallengeResponse)
+    challenges = service.get_challenges()
+    return sparse_response(challenges, fieldset) if fieldset else challenges
 
-@router.get("/active", response_model=List[ChallengeWithStatus])
+@router.get("/active", response_model=List[ChallengeResponse])
 async def get_active_challenges(
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    fields: Optional[str] = FIELDS_QUERY,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
+    # Only active challenges that have not ended, optionally filtered
     service = ChallengesService(db)
-    return service.get_active_challenges(current_user.id)
+    fieldset = FieldSet.parse(fields, ChallengeResponse)
+    challenges = service.get_active_challenges(category, difficulty)
+    return sparse_response(challenges, fieldset) if fieldset else challenges
+
+@router.get("/weekly/current", response_model=ChallengeResponse)
+async def get_current_weekly_challenge(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    # Served from the reference data cache
+    challenge = get_reference_data(db).current_weekly
+    if not challenge:
+        raise HTTPException(status_code=404, detail="No weekly challenge is running")
+    return challenge
+
+@router.post("/weekly/rollover", response_model=ChallengeResponse)
+async def start_weekly_challenge(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    """Start this week's weekly challenge now instead of waiting for the expiry sweeper"""
+    if not current_user.is_coach:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only coaches can roll over the weekly challenge"
+        )
+    roll_over_weekly_challenge(db)
+    challenge = get_reference_data(db).current_weekly
+    if not challenge:
+        raise HTTPException(status_code=404, detail="No active weekly challenge template")
+    return challenge
 
-@router.get("/{challenge_id}", response_model=ChallengeResponse)
+@router.get("/{challenge_id:int}", response_model=ChallengeResponse)
 async def get_challenge(
     challenge_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
     service = ChallengesService(db)
-    return service.get_challenge_by_id(challenge_id)
+    challenge = service.get_challenge_by_id(challenge_id)
+    if not challenge:
+        raise HTTPException(status_code=404, detail="Challenge not found")
+    return challenge
 
-@router.post("/{challenge_id}/complete", response_model=ChallengeCompletionResponse)
+@router.post("/{challenge_id:int}/complete", response_model=ChallengeCompletionResponse)
 async def complete_challenge(
     challenge_id: int,
     completion: ChallengeCompletionCreate,
@@ -102,7 +150,7 @@ async def complete_challenge(
     service = ChallengesService(db)
     return service.complete_challenge(challenge_id, current_user.id, completion)
 
-@router.get("/{challenge_id}/status", response_model=ChallengeStatusResponse)
+@router.get("/{challenge_id:int}/status", response_model=ChallengeStatusResponse)
 async def get_challenge_status(
     challenge_id: int,
     db: Session = Depends(get_db),
@@ -111,7 +159,7 @@ async def get_challenge_status(
     service = ChallengesService(db)
     return service.get_challenge_status(challenge_id, current_user.id)
 
-@router.put("/{challenge_id}/status", response_model=ChallengeStatusResponse)
+@router.put("/{challenge_id:int}/status", response_model=ChallengeStatusResponse)
 async def update_challenge_status(
     challenge_id: int,
     status: ChallengeStatusEnum,
@@ -121,7 +169,7 @@ async def update_challenge_status(
     service = ChallengesService(db)
     return service.update_challenge_status(challenge_id, current_user.id, status)
 
-@router.post("/{challenge_id}/results", response_model=ChallengeResultResponse)
+@router.post("/{challenge_id:int}/results", response_model=ChallengeResultResponse)
 async def add_challenge_result(
     challenge_id: int,
     result: ChallengeResultCreate,
@@ -131,7 +179,7 @@ async def add_challenge_result(
     service = ChallengesService(db)
     return service.add_challenge_result(challenge_id, current_user.id, result)
 
-@router.get("/{challenge_id}/results", response_model=List[ChallengeResultResponse])
+@router.get("/{challenge_id:int}/results", response_model=List[ChallengeResultResponse])
 async def get_challenge_results(
     challenge_id: int,
     db: Session = Depends(get_db),
@@ -140,7 +188,7 @@ async def get_challenge_results(
     service = ChallengesService(db)
     return service.get_challenge_results(challenge_id)
 
-@router.get("/{challenge_id}/badges", response_model=List[BadgeWithChallenge])
+@router.get("/{challenge_id:int}/badges", response_model=List[BadgeWithChallenge])
 async def get_challenge_badges(
     challenge_id: int,
     db: Session = Depends(get_db),
@@ -149,7 +197,7 @@ async def get_challenge_badges(
     service = ChallengesService(db)
     return service.get_challenge_badges(challenge_id)
 
-@router.post("/{challenge_id}/achievements", response_model=AchievementResponse)
+@router.post("/{challenge_id:int}/achievements", response_model=AchievementResponse)
 async def create_achievement(
     challenge_id: int,
     achievement: AchievementCreate,
@@ -166,7 +214,7 @@ async def create_achievement(
     service = ChallengesService(db)
     return service.create_achievement(challenge_id, achievement)
 
-@router.get("/{challenge_id}/achievements", response_model=List[AchievementResponse])
+@router.get("/{challenge_id:int}/achievements", response_model=List[AchievementResponse])
 async def get_challenge_achievements(
     challenge_id: int,
     db: Session = Depends(get_db),
@@ -175,7 +223,7 @@ async def get_challenge_achievements(
     service = ChallengesService(db)
     return service.get_challenge_achievements(challenge_id)
 
-@router.put("/{challenge_id}", response_model=ChallengeResponse)
+@router.put("/{challenge_id:int}", response_model=ChallengeResponse)
 async def update_challenge(
     challenge_id: int,
     challenge: ChallengeUpdate,
@@ -192,7 +240,7 @@ async def update_challenge(
     service = ChallengesService(db)
     return service.update_challenge(challenge_id, challenge)
 
-@router.delete("/{challenge_id}")
+@router.delete("/{challenge_id:int}")
 async def delete_challenge(
     challenge_id: int,
     db: Session = Depends(get_db),
@@ -214,39 +262,9 @@ async def get_challenges_with_status(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
-    # Get all challenges and statuses in one query with join
-    result = db.query(
-        Challenge,
-        ChallengeStatus.status,
-        ChallengeStatus.unlocked_at,
-        ChallengeStatus.completed_at
-    ).outerjoin(
-        ChallengeStatus,
-        and_(
-            ChallengeStatus.challenge_id == Challenge.id,
-            ChallengeStatus.user_id == current_user.id
-        )
-    ).all()
-    
-    challenges_with_status = []
-    for challenge, status, unlocked_at, completed_at in result:
-        # If no status record exists, set default to LOCKED
-        challenge_dict = {
-            "id": challenge.id,
-            "title": challenge.title,
-            "description": challenge.description,
-            "xp_reward": challenge.xp_reward,
-            "category": challenge.category,
-            "is_weekly": challenge.is_weekly,
-            "level": challenge.level,
-            "prerequisite_id": challenge.prerequisite_id,
-            "status": status or "LOCKED",
-            "unlocked_at": unlocked_at,
-            "completed_at": completed_at
-        }
-        challenges_with_status.append(challenge_dict)
-    
-    return challenges_with_status
+    # Get all challenges and the user's statuses in one query with join
+    service = ChallengesService(db)
+    return service.get_challenges_with_status(current_user.id)
 
 # -------------- Challenge Status Endpoints --------------
 
@@ -255,47 +273,10 @@ async def initialize_challenge_statuses(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
-    # Check if statuses already exist
-    existing_statuses = db.query(ChallengeStatus).filter(
-        ChallengeStatus.user_id == current_user.id
-    ).first()
-    
-    if existing_statuses:
-        raise HTTPException(status_code=400, detail="Challenge statuses already initialized")
-    
-    # Get all challenges
-    challenges = db.query(Challenge).all()
-    
-    # Group challenges by category
-    categories = {}
-    for challenge in challenges:
-        if challenge.category not in categories:
-            categories[challenge.category] = []
-        categories[challenge.category].append(challenge)
-    
-    # For each category, set first level challenges to AVAILABLE, others to LOCKED
-    now = datetime.utcnow()
-    statuses_to_add = []
-    
-    for category, category_challenges in categories.items():
-        for challenge in category_challenges:
-            # Level 1 challenges or weekly challenges are AVAILABLE, others are LOCKED
-            status = "AVAILABLE" if challenge.level == 1 or challenge.is_weekly else "LOCKED"
-            unlocked_at = now if status == "AVAILABLE" else None
-            
-            status_record = ChallengeStatus(
-                user_id=current_user.id,
-                challenge_id=challenge.id,
-                status=status,
-                unlocked_at=unlocked_at
-            )
-            statuses_to_add.append(status_record)
-    
-    # Add all statuses in batch
-    db.add_all(statuses_to_add)
-    db.commit()
-    
-    return {"detail": f"Initialized {len(statuses_to_add)} challenge statuses"}
+    # Statuses are normally created at registration; this backfills any that are missing
+    service = ChallengesService(db)
+    created = service.initialize_statuses_for_user(current_user.id)
+    return {"detail": f"Initialized {created} challenge statuses"}
 
 @router.post("/completion", response_model=ChallengeCompletionResponse)
 async def record_challenge_completion(
@@ -308,7 +289,7 @@ async def record_challenge_completion(
         print(f"Recording completion for challenge {completion.challenge_id}, user {current_user.id}")
         
         # Check if the challenge exists
-        challenge = db.query(Challenge).filter(Challenge.id == completion.challenge_id).first()
+        challenge = get_reference_data(db).challenges.get(completion.challenge_id)
         if not challenge:
             raise HTTPException(status_code=404, detail="Challenge not found")
         
@@ -342,7 +323,6 @@ async def record_challenge_completion(
         
         db.add(challenge_completion)
         db.commit()
-        db.refresh(challenge_completion)
         print(f"Created completion record ID {challenge_completion.id}")
         
         # Use the helper function to format the response
@@ -370,7 +350,7 @@ async def opt_into_challenge(
         print(f"User {current_user.id} is opting into challenge {challenge_id}")
         
         # Check if the challenge exists
-        challenge = db.query(Challenge).filter(Challenge.id == challenge_id).first()
+        challenge = get_reference_data(db).challenges.get(challenge_id)
         if not challenge:
             raise HTTPException(status_code=404, detail="Challenge not found")
         
@@ -436,7 +416,7 @@ async def get_user_challenge_completion(
     """Get the challenge completion for the current user and a specific challenge"""
     
     try:
-        challenge = db.query(Challenge).filter(Challenge.id == challenge_id).first()
+        challenge = get_reference_data(db).challenges.get(challenge_id)
         if not challenge:
             raise HTTPException(status_code=404, detail="Challenge not found")
             
@@ -486,7 +466,7 @@ async def get_user_challenge_completion(
             ]
         }
         
-        return response
+        return prebuilt_response(response)
             
     except Exception as e:
         print(f"Error in get_user_challenge_completion: {str(e)}")
@@ -502,20 +482,23 @@ async def get_challenge_completions(
     """Get all challenge completions for the current user"""
     
     try:
-        completions = db.query(ChallengeCompletion).filter(
+        # Load challenges in the same query and all results in one more,
+        # instead of two lookups per completion
+        completions = db.query(ChallengeCompletion).options(
+            joinedload(ChallengeCompletion.challenge),
+            selectinload(ChallengeCompletion.results)
+        ).filter(
             ChallengeCompletion.user_id == current_user.id
         ).all()
         
         result = []
         for completion in completions:
-            challenge = db.query(Challenge).filter(Challenge.id == completion.challenge_id).first()
+            challenge = completion.challenge
             if not challenge:
                 continue  # Skip if challenge not found
                 
-            # Get related results for this completion
-            results = db.query(ChallengeResult).filter(
-                ChallengeResult.completion_id == completion.id
-            ).order_by(desc(ChallengeResult.submitted_at)).all()
+            # Newest results first
+            results = sorted(completion.results, key=lambda r: r.submitted_at, reverse=True)
             
             result.append({
                 "id": completion.id,
@@ -549,7 +532,7 @@ async def get_challenge_completions(
                 ]
             })
             
-        return result
+        return prebuilt_response(result)
             
     except Exception as e:
         print(f"Error in get_challenge_completions: {str(e)}")
@@ -568,7 +551,7 @@ async def submit_challenge_result(
     
     try:
         # First check if the challenge exists
-        challenge = db.query(Challenge).filter(Challenge.id == challenge_id).first()
+        challenge = get_reference_data(db).challenges.get(challenge_id)
         if not challenge:
             raise HTTPException(status_code=404, detail="Challenge not found")
             
@@ -579,6 +562,16 @@ async def submit_challenge_result(
                 status_code=400,
                 detail="This challenge has expired and cannot be updated."
             )
+
+        if settings.RESULT_INGEST_BATCHING:
+            # Written together with other submissions in one group commit
+            return await get_result_ingest_queue(db.get_bind()).submit({
+                "user_id": current_user.id,
+                "challenge_id": challenge_id,
+                "result_value": result_value,
+                "notes": notes,
+                "submitted_at": now
+            })
         
         # Find the challenge completion record
         completion = db.query(ChallengeCompletion).filter(
@@ -685,7 +678,7 @@ async def verify_challenge_completion(
             completion.notes = verification_note
         
         # Get the challenge to check if there's a badge to award
-        challenge = db.query(Challenge).filter(Challenge.id == completion.challenge_id).first()
+        challenge = get_reference_data(db).challenges.get(completion.challenge_id)
         
         # Award badge if applicable
         if challenge and challenge.badge_id:
@@ -706,6 +699,9 @@ async def verify_challenge_completion(
                 db.add(achievement)
                 print(f"Awarded badge {challenge.badge_id} to user {completion.user_id}")
         
+        # Unlock the challenges that depend on this one
+        ChallengesService(db).unlock_dependents(completion.user_id, completion.challenge_id)
+        
         db.commit()
         db.refresh(completion)
         print(f"Verified completion with ID {completion.id}, final result: {completion.progress}")
@@ -722,6 +718,26 @@ async def verify_challenge_completion(
             )
         raise
 
+@router.post("/verify/bulk", response_model=BulkVerificationResponse)
+async def verify_challenge_completions_bulk(
+    request: BulkVerificationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_dependency)
+):
+    # Only coaches can verify challenge completions
+    if not current_user.is_coach:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only coaches can verify challenge completions"
+        )
+    
+    service = ChallengesService(db)
+    results = service.verify_completions_bulk(request.completion_ids, current_user.id, request.notes)
+    return {
+        "verified": sum(1 for result in results if result["outcome"] == "verified"),
+        "results": results
+    }
+
 # -------------- Badges and Achievements Endpoints --------------
 
 @router.get("/badges", response_model=List[BadgeWithChallenge])
@@ -729,42 +745,16 @@ async def get_user_badges(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
-    badges = db.query(Badge).all()
-    
-    # Filter to only include badges that have been earned by the current user
-    user_achievements = db.query(Achievement).filter(Achievement.user_id == current_user.id).all()
-    user_badge_ids = [a.badge_id for a in user_achievements]
-    
-    user_badges = [badge for badge in badges if badge.id in user_badge_ids]
-    
-    return user_badges
+    service = ChallengesService(db)
+    return service.get_user_badges(current_user.id)
 
 @router.get("/badge-stats", response_model=Dict[str, int])
 async def get_badge_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
-    # Get all challenges to get their categories
-    challenges = db.query(Challenge).all()
-    challenge_categories = {c.id: c.category for c in challenges}
-    
-    # Get all badges earned by the user through achievements
-    user_achievements = db.query(Achievement).filter(Achievement.user_id == current_user.id).all()
-    user_badges = db.query(Badge).filter(Badge.id.in_([a.badge_id for a in user_achievements])).all()
-    
-    # Group badges by challenge category based on which challenge they're associated with
-    category_counts = {}
-    for badge in user_badges:
-        # Find challenges that use this badge
-        badge_challenges = [c for c in challenges if c.badge_id == badge.id]
-        if badge_challenges:
-            for challenge in badge_challenges:
-                category = challenge.category
-                category_counts[category] = category_counts.get(category, 0) + 1
-        else:
-            category_counts["Other"] = category_counts.get("Other", 0) + 1
-    
-    return category_counts
+    service = ChallengesService(db)
+    return service.get_badge_stats(current_user.id)
 
 @router.post("/achievements", response_model=AchievementResponse)
 def create_achievement(
@@ -808,42 +798,20 @@ def read_achievements(
     ).offset(skip).limit(limit).all()
     return achievements
 
-@router.get("/active", response_model=List[ChallengeResponse])
-async def get_active_challenges(
-    category: Optional[str] = None,
-    difficulty: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_dependency)
-):
-    # Start with base query - only active challenges
-    query = db.query(Challenge).filter(Challenge.is_active == True)
-    
-    # Apply category filter if provided
-    if category:
-        query = query.filter(Challenge.category == category)
-    
-    # Apply difficulty filter if provided
-    if difficulty:
-        query = query.filter(Challenge.difficulty == difficulty)
-    
-    # For non-expired challenges, end_date should be None or in the future
-    now = datetime.utcnow()
-    query = query.filter(
-        (Challenge.end_date == None) | (Challenge.end_date > now)
-    )
-    
-    challenges = query.all()
-    return challenges
-
 @router.get("/results/{completion_id}", response_model=List[ChallengeResultResponse])
 async def get_challenge_results(
     completion_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
-    """Get all results for a specific challenge completion"""
+    """Get all results for a specific challenge completion, optionally only those submitted between since and until"""
     
     try:
+        if since and until and since > until:
+            raise HTTPException(status_code=400, detail="since must be before until")
+
         # First check if the completion exists and belongs to the user
         completion = db.query(ChallengeCompletion).filter(
             ChallengeCompletion.id == completion_id,
@@ -855,11 +823,12 @@ async def get_challenge_results(
             
         # Get all results for this completion
         results = db.query(ChallengeResult).filter(
-            ChallengeResult.completion_id == completion_id
+            ChallengeResult.completion_id == completion_id,
+            *submitted_between(since, until)
         ).order_by(desc(ChallengeResult.submitted_at)).all()
         
         # Format the results
-        return [
+        return prebuilt_response([
             {
                 "id": result.id,
                 "completion_id": result.completion_id,
@@ -867,7 +836,7 @@ async def get_challenge_results(
                 "notes": result.notes,
                 "submitted_at": result.submitted_at
             } for result in results
-        ]
+        ])
             
     except Exception as e:
         print(f"Error in get_challenge_results: {str(e)}")
@@ -0,0 +1,34 @@
+"""
+Serialization fast path for endpoints that build their payloads by hand.
+
+FastAPI validates whatever an endpoint returns against its response_model,
+runs the result through jsonable_encoder and only then encodes it. Endpoints
+whose dicts already have exactly the response model's shape can return
+`prebuilt_response(payload)` instead: a returned Response skips both passes
+and orjson encodes the dicts, datetimes included, directly. Keep the
+response_model on the route so the OpenAPI schema still documents the shape.
+
+List endpoints with a `?fields=` parameter return `sparse_response` when a
+selection was given, since a trimmed row no longer satisfies the full model.
+"""
+from typing import Any, Iterable
+
+from fastapi import Query
+from fastapi.responses import ORJSONResponse
+
+from services.base import FieldSet
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated fields to return, e.g. `title,training_sessions.title`. The id is always included.",
+)
+
+
+def prebuilt_response(content: Any, status_code: int = 200) -> ORJSONResponse:
+    """Encode an already-shaped payload without re-validating it against the response model."""
+    return ORJSONResponse(content=content, status_code=status_code)
+
+
+def sparse_response(items: Iterable[Any], fieldset: FieldSet) -> ORJSONResponse:
+    """Encode only the selected fields of each item."""
+    return prebuilt_response([fieldset.project(item) for item in items])
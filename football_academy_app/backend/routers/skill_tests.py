@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
 
 from models import User, PlayerTest
 from database import get_async_db
 from services.auth import get_current_user_dependency
 from schemas import PlayerTestCreate, PlayerTestResponse
+from services.base import FieldSet
 from services.skill_tests import SkillTestsService
+from .responses import FIELDS_QUERY, sparse_response
 
 router = APIRouter(
     prefix="/skill-tests",
@@ -52,6 +54,7 @@ async def create_player_test(
 @router.get("/player-tests/player/{player_id}", response_model=List[PlayerTestResponse])
 async def get_player_tests(
     player_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user_dependency)
 ):
@@ -65,7 +68,9 @@ async def get_player_tests(
             detail="Not authorized to view this player's tests"
         )
     
-    return await service.get_player_tests(player_id)
+    fieldset = FieldSet.parse(fields, PlayerTestResponse)
+    tests = await service.get_player_tests(player_id, fieldset)
+    return sparse_response(tests, fieldset) if fieldset else tests
 
 @router.delete("/player-tests/{test_id}")
 async def delete_player_test(
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
+from config import settings
 from database import get_db
 from schemas.training_schedules import (
     TrainingSchedule, 
@@ -11,9 +12,14 @@ from schemas.training_schedules import (
     TrainingSession,
     TrainingSessionCreate,
     TrainingSessionUpdate,
-    TrainingSessionReflection
+    TrainingSessionReflection,
+    TrainingCalendar,
+    TrainingRecurrence,
+    TrainingRecurrenceResult
 )
+from services.base import FieldSet
 from services.training_schedules import TrainingScheduleService
+from .responses import FIELDS_QUERY, sparse_response
 
 router = APIRouter(
     prefix="/training-schedules",
@@ -22,14 +28,23 @@ router = APIRouter(
 
 # Training Schedule Routes
 @router.get("/", response_model=List[TrainingSchedule])
-def get_all_schedules(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_all_schedules(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_db)
+):
     service = TrainingScheduleService(db)
-    return service.get_all_schedules(skip=skip, limit=limit)
+    fieldset = FieldSet.parse(fields, TrainingSchedule)
+    schedules = service.get_all_schedules(skip=skip, limit=limit, fieldset=fieldset)
+    return sparse_response(schedules, fieldset) if fieldset else schedules
 
 @router.get("/user/{user_id}", response_model=List[TrainingSchedule])
-def get_user_schedules(user_id: int, db: Session = Depends(get_db)):
+def get_user_schedules(user_id: int, fields: Optional[str] = FIELDS_QUERY, db: Session = Depends(get_db)):
     service = TrainingScheduleService(db)
-    return service.get_user_schedules(user_id)
+    fieldset = FieldSet.parse(fields, TrainingSchedule)
+    schedules = service.get_user_schedules(user_id, fieldset)
+    return sparse_response(schedules, fieldset) if fieldset else schedules
 
 @router.get("/week", response_model=TrainingSchedule)
 def get_schedule_by_week(
@@ -44,6 +59,29 @@ def get_schedule_by_week(
         raise HTTPException(status_code=404, detail="Schedule not found for this week")
     return schedule
 
+@router.get("/calendar", response_model=TrainingCalendar)
+def get_calendar(
+    user_id: int,
+    start_date: date = Query(..., alias="from"),
+    end_date: date = Query(..., alias="to"),
+    db: Session = Depends(get_db)
+):
+    """Schedules, sessions and focus area titles for every day from..to inclusive, in one query."""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end_date - start_date).days >= settings.TRAINING_CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The calendar covers at most {settings.TRAINING_CALENDAR_MAX_DAYS} days"
+        )
+    service = TrainingScheduleService(db)
+    return {
+        "user_id": user_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "schedules": service.get_calendar(user_id, start_date, end_date),
+    }
+
 @router.get("/{schedule_id}", response_model=TrainingSchedule)
 def get_schedule(schedule_id: int, db: Session = Depends(get_db)):
     service = TrainingScheduleService(db)
@@ -74,9 +112,11 @@ def delete_schedule(schedule_id: int, db: Session = Depends(get_db)):
 
 # Training Session Routes
 @router.get("/{schedule_id}/sessions", response_model=List[TrainingSession])
-def get_sessions(schedule_id: int, db: Session = Depends(get_db)):
+def get_sessions(schedule_id: int, fields: Optional[str] = FIELDS_QUERY, db: Session = Depends(get_db)):
     service = TrainingScheduleService(db)
-    return service.get_sessions_by_schedule(schedule_id)
+    fieldset = FieldSet.parse(fields, TrainingSession)
+    sessions = service.get_sessions_by_schedule(schedule_id, fieldset)
+    return sparse_response(sessions, fieldset) if fieldset else sessions
 
 @router.get("/sessions/{session_id}", response_model=TrainingSession)
 def get_session(session_id: int, db: Session = Depends(get_db)):
@@ -91,6 +131,20 @@ def create_session(session: TrainingSessionCreate, db: Session = Depends(get_db)
     service = TrainingScheduleService(db)
     return service.create_session(session)
 
+@router.post("/sessions/recurring", response_model=TrainingRecurrenceResult)
+def create_recurring_sessions(
+    recurrence: TrainingRecurrence,
+    response: Response,
+    preview: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Create a session on every matching day of a recurrence rule; preview=true only expands it."""
+    service = TrainingScheduleService(db)
+    result = service.generate_sessions(recurrence, preview=preview)
+    if not preview:
+        response.status_code = status.HTTP_201_CREATED
+    return result
+
 @router.put("/sessions/{session_id}", response_model=TrainingSession)
 def update_session(session_id: int, session: TrainingSessionUpdate, db: Session = Depends(get_db)):
     service = TrainingScheduleService(db)
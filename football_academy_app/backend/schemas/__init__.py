@@ -8,6 +8,7 @@ from .challenges import (
     ChallengeWithStatus, ChallengeStatusResponse,
     ChallengeCompletionBase, ChallengeCompletionCreate, ChallengeCompletionUpdate, ChallengeCompletionResponse,
     ChallengeCompletionWithDetails,
+    BulkVerificationRequest, BulkVerificationOutcome, BulkVerificationResponse,
     BadgeBase, BadgeCreate, BadgeUpdate, BadgeResponse, BadgeWithChallenge,
     AchievementBase, AchievementCreate, AchievementUpdate, AchievementResponse,
     ChallengeStatusEnum,
@@ -38,6 +39,7 @@ __all__ = [
     "ChallengeWithStatus", "ChallengeStatusResponse",  
     "ChallengeCompletionBase", "ChallengeCompletionCreate", "ChallengeCompletionUpdate", "ChallengeCompletionResponse",
     "ChallengeCompletionWithDetails",
+    "BulkVerificationRequest", "BulkVerificationOutcome", "BulkVerificationResponse",
     "BadgeBase", "BadgeCreate", "BadgeUpdate", "BadgeResponse", "BadgeWithChallenge",
     "AchievementBase", "AchievementCreate", "AchievementUpdate", "AchievementResponse",
     "ChallengeStatusEnum",
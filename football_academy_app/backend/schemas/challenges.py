@@ -19,6 +19,10 @@ class ChallengeBase(BaseModel):
     start_date: datetime = Field(default_factory=datetime.utcnow)
     end_date: Optional[datetime] = None
     is_active: bool = True
+    level: int = 1
+    is_weekly: bool = False
+    prerequisite_id: Optional[int] = None
+    is_template: bool = False
 
 class ChallengeCreate(ChallengeBase):
     created_by: int
@@ -35,6 +39,10 @@ class ChallengeUpdate(BaseModel):
     end_date: Optional[datetime] = None
     is_active: Optional[bool] = None
     badge_id: Optional[int] = None
+    level: Optional[int] = None
+    is_weekly: Optional[bool] = None
+    prerequisite_id: Optional[int] = None
+    is_template: Optional[bool] = None
 
 class ChallengeResponse(ChallengeBase):
     id: int
@@ -42,6 +50,7 @@ class ChallengeResponse(ChallengeBase):
     created_at: datetime
     updated_at: datetime
     badge_id: Optional[int] = None
+    template_id: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -104,6 +113,19 @@ class ChallengeCompletionResponse(ChallengeCompletionBase):
     class Config:
         orm_mode = True
 
+class BulkVerificationRequest(BaseModel):
+    completion_ids: List[int] = Field(..., min_items=1, max_items=200)
+    notes: Optional[str] = None
+
+class BulkVerificationOutcome(BaseModel):
+    completion_id: int
+    outcome: str  # "verified", "already_verified" or "not_found"
+    badge_awarded: bool = False
+
+class BulkVerificationResponse(BaseModel):
+    verified: int
+    results: List[BulkVerificationOutcome]
+
 class ChallengeCompletionWithDetails(ChallengeCompletionResponse):
     """Extended schema with challenge details"""
     challenge: Dict[str, Any]
@@ -56,4 +56,49 @@ class TrainingSchedule(TrainingScheduleBase):
     training_sessions: Optional[List[TrainingSession]] = []
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+# Training Calendar Schemas
+class CalendarSession(TrainingSession):
+    focus_area_title: Optional[str] = None
+
+class CalendarSchedule(TrainingScheduleBase):
+    id: int
+    user_id: int
+    training_sessions: List[CalendarSession] = []
+
+    class Config:
+        orm_mode = True
+
+class TrainingCalendar(BaseModel):
+    user_id: int
+    start_date: date
+    end_date: date
+    schedules: List[CalendarSchedule]
+
+# Recurring Session Schemas
+class TrainingRecurrence(BaseModel):
+    user_id: int
+    days_of_week: List[int]  # 1-7 for Monday-Sunday
+    start_date: date
+    until: date
+    exceptions: List[date] = []  # Dates to skip, e.g. holidays
+    title: str
+    description: Optional[str] = None
+    start_time: time
+    end_time: time
+    location: Optional[str] = None
+    focus_area_id: Optional[int] = None
+    development_plan_id: Optional[int] = None  # For schedules created for new weeks
+
+class RecurrenceWeek(BaseModel):
+    year: int
+    week_number: int
+    schedule_id: Optional[int] = None  # None when a preview would create the schedule
+    session_dates: List[date]
+
+class TrainingRecurrenceResult(BaseModel):
+    preview: bool
+    schedules_created: int
+    sessions_created: int
+    weeks: List[RecurrenceWeek]
@@ -1,8 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
 from fastapi import HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer
 
@@ -15,7 +14,13 @@ SECRET_KEY = "YOUR_SECRET_KEY_HERE"  # In production, use a proper secret key an
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose and passlib (with bcrypt) are imported on first use; they are a
+# noticeable share of worker startup and only the auth paths need them
+@lru_cache()
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v2/auth/token")
 
 class AuthService(BaseService[User, UserCreate, UserUpdate, User]):
@@ -23,10 +28,10 @@ class AuthService(BaseService[User, UserCreate, UserUpdate, User]):
         super().__init__(model=User, db=db)
     
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+        return get_pwd_context().verify(plain_password, hashed_password)
     
     def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+        return get_pwd_context().hash(password)
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
@@ -49,6 +54,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate, User]):
         else:
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
+        from jose import jwt
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     
@@ -114,6 +120,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate, User]):
         return db_user
     
     def get_current_user(self, token: str) -> Optional[User]: # Made return optional
+        from jose import JWTError, jwt
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -135,6 +142,7 @@ class AuthService(BaseService[User, UserCreate, UserUpdate, User]):
 
 # Dependency function to get the current user
 def get_current_user_dependency(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    from jose import JWTError, jwt
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -1,6 +1,9 @@
 from sqlalchemy.ext.declarative import DeclarativeMeta
-from sqlalchemy.orm import Session
-from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Union
+from sqlalchemy import delete, insert, inspect, select, update
+from sqlalchemy.orm import RelationshipProperty, Session, load_only, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from typing import Generic, TypeVar, Type, List, Optional, Dict, Any, Union, Sequence
 from pydantic import BaseModel
 from fastapi import HTTPException, status
 
@@ -9,13 +12,142 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 ResponseSchemaType = TypeVar("ResponseSchemaType", bound=BaseModel)
 
+# Rows per statement in the bulk operations, keeping parameter lists and
+# IN clauses well inside driver and SQLite variable limits
+BULK_CHUNK_SIZE = 500
+
+
+def _chunks(items: Sequence):
+    for start in range(0, len(items), BULK_CHUNK_SIZE):
+        yield items[start:start + BULK_CHUNK_SIZE]
+
+
+def _comparable(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        # JSON columns hold dicts and lists
+        return repr(value)
+    return value
+
+
+def _in_input_order(rows: List[Dict[str, Any]], returned: List[Any]) -> List[Any]:
+    """
+    Pair RETURNING rows, which come back in no promised order, with the rows
+    they were inserted from by the values given for them. Rows with equal
+    values are interchangeable, so any pairing between them is correct.
+    """
+    def key(values: Dict[str, Any]) -> tuple:
+        return tuple((name, _comparable(values[name])) for name in sorted(values))
+
+    pending: Dict[tuple, List[Any]] = {}
+    for db_obj in returned:
+        pending.setdefault(key({name: getattr(db_obj, name) for name in rows[0]}), []).append(db_obj)
+    return [pending[key(row)].pop() for row in rows]
+
+
+def _mark_collections_empty(db_obj) -> None:
+    """A new row has no children yet; record that instead of lazy-loading them."""
+    state = inspect(db_obj)
+    for relationship in state.mapper.relationships:
+        if relationship.uselist and relationship.key not in state.dict:
+            set_committed_value(db_obj, relationship.key, [])
+
+
+class FieldSet:
+    """
+    A sparse fieldset from a `?fields=` query parameter such as
+    "title,training_sessions.title". Names are checked against the response
+    schema, dotted paths select fields of nested schemas (a nested name on
+    its own selects all of them) and the id is always included.
+
+    `load_options(model)` pushes the selection into SQL as load_only /
+    selectinload options, and `project(obj)` builds the trimmed payload.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.fields: Dict[str, Optional["FieldSet"]] = {}
+        if "id" in schema.__fields__:
+            self.fields["id"] = None
+
+    @classmethod
+    def parse(cls, fields: Optional[str], schema: Type[BaseModel]) -> Optional["FieldSet"]:
+        """The selection for a `fields` parameter, or None when it was not given."""
+        if fields is None:
+            return None
+        fieldset = cls(schema)
+        for path in filter(None, (path.strip() for path in fields.split(","))):
+            fieldset._add(path.split("."), path)
+        return fieldset
+
+    @classmethod
+    def all(cls, schema: Type[BaseModel]) -> "FieldSet":
+        fieldset = cls(schema)
+        for name in schema.__fields__:
+            fieldset._add([name], name)
+        return fieldset
+
+    def _add(self, names: List[str], path: str) -> None:
+        name, rest = names[0], names[1:]
+        field = self.schema.__fields__.get(name)
+        nested = field.type_ if field is not None else None
+        if not (isinstance(nested, type) and issubclass(nested, BaseModel)):
+            nested = None
+        if field is None or (rest and nested is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field '{path}'"
+            )
+
+        if nested is None:
+            self.fields[name] = None
+        elif not rest:
+            self.fields[name] = FieldSet.all(nested)
+        else:
+            if self.fields.get(name) is None:
+                self.fields[name] = FieldSet(nested)
+            self.fields[name]._add(rest, path)
+
+    def load_options(self, model) -> list:
+        """Loader options that fetch only the selected columns and relationships of model."""
+        mapper = inspect(model)
+        columns, options = [], []
+        for name, nested in self.fields.items():
+            attr = mapper.attrs[name] if name in mapper.attrs else None
+            if attr is None or (isinstance(attr, RelationshipProperty) and nested is None):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Field '{name}' cannot be selected"
+                )
+            if isinstance(attr, RelationshipProperty):
+                options.append(selectinload(getattr(model, name)).options(*nested.load_options(attr.mapper.class_)))
+            else:
+                columns.append(getattr(model, name))
+        if columns:
+            options.insert(0, load_only(*columns))
+        return options
+
+    def project(self, obj) -> Dict[str, Any]:
+        """The selected fields of an ORM row or schema instance, as a plain dict."""
+        payload = {}
+        for name, nested in self.fields.items():
+            value = getattr(obj, name)
+            if nested is not None and value is not None:
+                value = [nested.project(item) for item in value] if isinstance(value, list) else nested.project(value)
+            payload[name] = value
+        return payload
+
+
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, ResponseSchemaType]):
     def __init__(self, model: Type[ModelType], db: Session):
         self.model = model
         self.db = db
 
-    def get_all(self, skip: int = 0, limit: int = 100, **filters) -> List[ModelType]:
+    def get_all(self, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None, **filters) -> List[ModelType]:
         query = self.db.query(self.model)
+        if fieldset is not None:
+            query = query.options(*fieldset.load_options(self.model))
         
         for key, value in filters.items():
             if hasattr(self.model, key) and value is not None:
@@ -26,32 +158,29 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Respons
     def get_by_id(self, id: int) -> Optional[ModelType]:
         return self.db.query(self.model).filter(self.model.id == id).first()
 
-    def create(self, obj_in: CreateSchemaType) -> ModelType:
-        obj_data = obj_in.dict()
-        db_obj = self.model(**obj_data)
+    def create(self, obj_in: CreateSchemaType, commit: bool = True) -> ModelType:
+        """
+        Insert and return the new row without reading it back. The INSERT's
+        RETURNING clause fills in the id and server-side defaults, and the
+        session factories use expire_on_commit=False, so the object stays
+        loaded after the commit. A new row has no children yet, so its
+        collections are marked as loaded and empty. With commit=False the
+        row is only flushed and the caller commits.
+        """
+        db_obj = self.model(**obj_in.dict())
         self.db.add(db_obj)
         try:
-            self.db.flush() # Flush to get the ID assigned
-            new_id = db_obj.id
-            if new_id is None:
-                 # This should not happen if flush worked for an autoincrement ID
-                 raise RuntimeError(f"Flush did not populate ID for {self.model.__name__}")
-                 
-            self.db.commit() # Commit the transaction
-            
-            # Immediately fetch the object using the ID obtained after flush
-            # Use self.get_by_id which queries the DB
-            fetched_obj = self.get_by_id(new_id)
-            if fetched_obj is None:
-                 # If commit worked, this should find the object
-                 raise RuntimeError(f"Failed to fetch {self.model.__name__} with ID {new_id} immediately after commit")
-            
-            return fetched_obj
-            
+            if commit:
+                self.db.commit()
+            else:
+                self.db.flush()
         except Exception as e:
-            print(f"ERROR during create/commit/fetch for {self.model.__name__}: {e}") # Log error
-            self.db.rollback() # Rollback on any error during the process
-            raise e # Re-raise the exception
+            print(f"ERROR during create/commit for {self.model.__name__}: {e}") # Log error
+            self.db.rollback()
+            raise e
+
+        _mark_collections_empty(db_obj)
+        return db_obj
 
     def update(self, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
         db_obj = self.get_by_id(id)
@@ -85,4 +214,94 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType, Respons
             
         self.db.delete(db_obj)
         self.db.commit()
-        return True 
\ No newline at end of file
+        return True 
+
+    def bulk_create(
+        self,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        commit: bool = True
+    ) -> List[ModelType]:
+        """
+        Insert many rows in one transaction, a multi-row INSERT ... RETURNING
+        per chunk, and return the new objects in input order. With
+        commit=False the caller commits, e.g. after inserting related rows.
+
+        SQLAlchemy can only keep RETURNING in parameter order on SQLite by
+        inserting one row per statement, so there the rows are matched back
+        to their inputs instead.
+        """
+        rows = [obj.dict() if isinstance(obj, BaseModel) else dict(obj) for obj in objs_in]
+        in_parameter_order = self.db.get_bind().dialect.name != "sqlite"
+        created: List[ModelType] = []
+        try:
+            for chunk in _chunks(rows):
+                returned = self.db.scalars(
+                    insert(self.model).returning(self.model, sort_by_parameter_order=in_parameter_order), chunk
+                ).all()
+                created.extend(returned if in_parameter_order else _in_input_order(chunk, returned))
+            if commit:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for db_obj in created:
+            _mark_collections_empty(db_obj)
+        return created
+
+    def bulk_update(self, objs_in: Sequence[Dict[str, Any]]) -> int:
+        """
+        Update many rows by primary key in one transaction. Each dict holds
+        the row's "id" and the columns to change; dicts with the same keys
+        are sent as a single executemany. Ids with no row are skipped, as in
+        bulk_delete, and the number of rows updated is returned.
+        """
+        if any("id" not in obj for obj in objs_in):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Every {self.model.__name__} update needs an id"
+            )
+
+        try:
+            # The ORM's bulk UPDATE by primary key fails outright on a missing row
+            existing = set()
+            for chunk in _chunks([obj["id"] for obj in objs_in]):
+                existing.update(self.db.scalars(select(self.model.id).where(self.model.id.in_(chunk))))
+            objs_in = [obj for obj in objs_in if obj["id"] in existing]
+
+            # executemany needs the same columns in every parameter set
+            batches: Dict[tuple, List[Dict[str, Any]]] = {}
+            for obj in objs_in:
+                batches.setdefault(tuple(sorted(obj)), []).append(obj)
+            for batch in batches.values():
+                for chunk in _chunks(batch):
+                    self.db.execute(update(self.model), chunk)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # Bulk statements bypass the identity map; drop stale copies of the rows
+        for obj in objs_in:
+            db_obj = self.db.identity_map.get(identity_key(self.model, obj["id"]))
+            if db_obj is not None:
+                self.db.expire(db_obj)
+        return len({obj["id"] for obj in objs_in})
+
+    def bulk_delete(self, ids: Sequence[int]) -> int:
+        """
+        Delete many rows by id in one transaction, one DELETE ... WHERE id IN
+        per chunk, and return how many were deleted. ORM cascades do not run,
+        so children must be removed by the database or beforehand.
+        """
+        ids = list(ids)
+        deleted = 0
+        try:
+            for chunk in _chunks(ids):
+                result = self.db.execute(delete(self.model).where(self.model.id.in_(chunk)))
+                deleted += result.rowcount
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return deleted
@@ -0,0 +1,123 @@
+"""
+Expiry of challenges whose end date has passed.
+
+`expire_challenges` deactivates the ended challenges and moves their active
+completions to EXPIRED, one statement each, so read paths can filter on
+is_active instead of comparing end dates. `ChallengeExpirySweeper` runs it
+in-process: it sleeps until the next end date in the reference data
+snapshot, capped at REFERENCE_DATA_POLL_SECONDS so challenges created or
+moved by other workers are picked up, and starts each week's weekly
+challenge (see services.weekly_challenges) when the previous one ends.
+Every worker runs a sweeper; the statements are idempotent, so whichever
+wakes first does the work.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from config import settings
+from models.challenges import Challenge, ChallengeCompletion, ChallengeStatus
+from .reference_data import get_reference_data, bump_reference_data
+
+logger = logging.getLogger(__name__)
+
+
+def expire_challenges(db: Session, now: Optional[datetime] = None) -> List[int]:
+    """
+    Deactivate every active challenge that has ended and expire its active
+    completions. Weekly templates are never expired, since the rollover
+    clones them. Commits if anything changed.
+
+    Returns:
+        IDs of the challenges expired
+    """
+    now = now or datetime.utcnow()
+    challenge_ids = [
+        challenge_id for (challenge_id,) in db.query(Challenge.id).filter(
+            Challenge.is_active == True,
+            Challenge.is_template.isnot(True),
+            Challenge.end_date <= now
+        )
+    ]
+    if not challenge_ids:
+        return []
+
+    completions = db.execute(
+        update(ChallengeCompletion)
+        .where(
+            ChallengeCompletion.challenge_id.in_(challenge_ids),
+            ChallengeCompletion.status == ChallengeStatus.ACTIVE
+        )
+        .values(status=ChallengeStatus.EXPIRED, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Challenge)
+        .where(Challenge.id.in_(challenge_ids))
+        .values(is_active=False, updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    # Commits both updates and refreshes the cached challenges
+    bump_reference_data(db)
+    logger.info(f"Expired challenges {challenge_ids} and {completions.rowcount} active completions")
+    return challenge_ids
+
+
+def seconds_until_next_expiry(db: Session, now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds until the next active challenge ends, from the reference data snapshot."""
+    now = now or datetime.utcnow()
+    end_dates = [
+        challenge.end_date for challenge in get_reference_data(db).challenges.values()
+        if challenge.is_active and not challenge.is_template and challenge.end_date is not None
+    ]
+    if not end_dates:
+        return None
+    return max((min(end_dates) - now).total_seconds(), 0.0)
+
+
+class ChallengeExpirySweeper:
+    """Background task expiring challenges as their end dates pass."""
+
+    def __init__(self, session_factory: sessionmaker):
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def sweep(self) -> float:
+        """
+        Expire what has ended, start this week's weekly challenge if due and
+        return how long to sleep before the next sweep.
+        """
+        from .weekly_challenges import roll_over_weekly_challenge
+
+        with self.session_factory() as db:
+            roll_over_weekly_challenge(db)
+            expire_challenges(db)
+            delay = seconds_until_next_expiry(db)
+        cap = settings.REFERENCE_DATA_POLL_SECONDS
+        return cap if delay is None else min(delay, cap)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delay = await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Challenge expiry sweep failed: {e}")
+                delay = settings.REFERENCE_DATA_POLL_SECONDS
+            await asyncio.sleep(delay)
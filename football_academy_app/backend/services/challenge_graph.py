@@ -0,0 +1,98 @@
+"""
+Challenge unlock graph.
+
+Challenges form a DAG: an explicit edge runs from a challenge's
+prerequisite to the challenge, and every challenge without an explicit
+prerequisite depends on the challenges one level below it in the same
+category. Weekly challenges take no part in the level progression.
+
+Completing any one parent unlocks a challenge, so the set unlocked by a
+completion is simply the completed challenge's dependents. Graphs are
+built from the reference data snapshot (see services.reference_data), so
+each worker rebuilds its graph once per challenge change.
+"""
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class ChallengeNode(NamedTuple):
+    id: int
+    category: str
+    level: int
+    prerequisite_id: Optional[int]
+    is_weekly: bool
+
+
+class ChallengeCycleError(ValueError):
+    """Raised when prerequisites would make a challenge depend on itself."""
+
+
+class ChallengeGraph:
+    """Immutable snapshot of the challenge unlock DAG."""
+
+    def __init__(self, nodes: Iterable[ChallengeNode]):
+        self.nodes: Dict[int, ChallengeNode] = {node.id: node for node in nodes}
+        self.parents: Dict[int, Tuple[int, ...]] = {}
+        self.dependents: Dict[int, Tuple[int, ...]] = {}
+        self._build_edges()
+        self.topological_order: List[int] = self._sort()
+        self.topological_index: Dict[int, int] = {
+            challenge_id: position for position, challenge_id in enumerate(self.topological_order)
+        }
+
+    def _build_edges(self) -> None:
+        by_level: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for node in self.nodes.values():
+            if not node.is_weekly:
+                by_level[(node.category, node.level)].append(node.id)
+
+        parents: Dict[int, List[int]] = defaultdict(list)
+        dependents: Dict[int, List[int]] = defaultdict(list)
+        for node in self.nodes.values():
+            if node.prerequisite_id is not None:
+                # Prerequisites pointing at deleted challenges are ignored
+                sources = [node.prerequisite_id] if node.prerequisite_id in self.nodes else []
+            elif node.is_weekly:
+                sources = []
+            else:
+                sources = by_level.get((node.category, node.level - 1), [])
+            for source in sources:
+                parents[node.id].append(source)
+                dependents[source].append(node.id)
+
+        self.parents = {challenge_id: tuple(ids) for challenge_id, ids in parents.items()}
+        self.dependents = {challenge_id: tuple(sorted(ids)) for challenge_id, ids in dependents.items()}
+
+    def _sort(self) -> List[int]:
+        """Kahn's algorithm, ordered by (level, id) among ready challenges."""
+        in_degree = {challenge_id: len(self.parents.get(challenge_id, ())) for challenge_id in self.nodes}
+        ready = deque(sorted(
+            (challenge_id for challenge_id, degree in in_degree.items() if degree == 0),
+            key=self._sort_key
+        ))
+        order = []
+        while ready:
+            challenge_id = ready.popleft()
+            order.append(challenge_id)
+            for dependent in self.dependents.get(challenge_id, ()):
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.nodes):
+            cyclic = sorted(challenge_id for challenge_id, degree in in_degree.items() if degree > 0)
+            raise ChallengeCycleError(f"Challenge prerequisites form a cycle through challenges {cyclic}")
+        return order
+
+    def _sort_key(self, challenge_id: int) -> Tuple[int, int]:
+        return (self.nodes[challenge_id].level, challenge_id)
+
+    def unlocked_by(self, challenge_id: int) -> Tuple[int, ...]:
+        """Challenges that become available once the given challenge is completed."""
+        return self.dependents.get(challenge_id, ())
+
+    def with_node(self, node: ChallengeNode) -> "ChallengeGraph":
+        """A new graph with the node added or replaced; raises ChallengeCycleError on a cycle."""
+        nodes = dict(self.nodes)
+        nodes[node.id] = node
+        return ChallengeGraph(nodes.values())
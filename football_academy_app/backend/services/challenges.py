@@ -1,16 +1,58 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, exists, case, func, tuple_, and_, or_, literal, true, false
 from fastapi import HTTPException, status
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
-from models.challenges import Challenge, ChallengeCompletion, Badge, Achievement, ChallengeStatus
+from models.challenges import (
+    Challenge, ChallengeCompletion, ChallengeResult, Badge, Achievement, ChallengeStatus, UserChallengeStatus
+)
+from models.users import User
 from schemas.challenges import (
     ChallengeCreate, ChallengeUpdate,
     ChallengeCompletionCreate, ChallengeCompletionUpdate,
     BadgeCreate, BadgeUpdate,
-    AchievementCreate, AchievementUpdate
+    AchievementCreate, AchievementUpdate,
+    BadgeResponse, BadgeWithChallenge, ChallengeResponse
 )
 from .base import BaseService
+from .challenge_graph import ChallengeNode, ChallengeCycleError
+from .dialects import insert_ignoring_conflicts
+from .reference_data import get_reference_data, bump_reference_data
+
+def status_initialization_insert(*criteria):
+    """
+    Build an INSERT ... SELECT creating a status for every (user, challenge)
+    pair matching the criteria that has none yet.
+
+    Level 1 and weekly challenges without a prerequisite start AVAILABLE,
+    everything else starts LOCKED. With no criteria it covers every user
+    and challenge, which is how bulk loads backfill the table.
+    """
+    starts_available = and_(
+        or_(Challenge.level == 1, Challenge.level.is_(None), Challenge.is_weekly == True),
+        Challenge.prerequisite_id.is_(None)
+    )
+    now = datetime.utcnow()
+    already_initialized = exists().where(
+        UserChallengeStatus.user_id == User.user_id,
+        UserChallengeStatus.challenge_id == Challenge.id
+    )
+    pairs = select(
+        User.user_id,
+        Challenge.id,
+        case((starts_available, literal("AVAILABLE")), else_=literal("LOCKED")),
+        case((starts_available, literal(now)), else_=None)
+    ).select_from(User).join(Challenge, true()).where(
+        ~already_initialized,
+        # Weekly templates are never played themselves, only their clones
+        Challenge.is_template.isnot(True),
+        *criteria
+    )
+
+    return insert(UserChallengeStatus).from_select(
+        ["user_id", "challenge_id", "status", "unlocked_at"], pairs
+    )
 
 class ChallengesService:
     def __init__(self, db: Session):
@@ -21,9 +63,27 @@ class ChallengesService:
         self.achievement_service = BaseService[Achievement, AchievementCreate, AchievementUpdate, Achievement](Achievement, db)
     
     # Challenge methods
-    def get_challenges(self) -> List[Challenge]:
-        """Get all challenges."""
-        return self.db.query(Challenge).all()
+    def get_challenges(self) -> List[ChallengeResponse]:
+        """Get all challenges, served from the reference data cache."""
+        return list(get_reference_data(self.db).challenges.values())
+
+    def get_active_challenges(
+        self,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None
+    ) -> List[ChallengeResponse]:
+        """
+        Active challenges other than weekly templates, served from the
+        reference data cache. Ended challenges are deactivated by the expiry
+        sweeper (see services.challenge_expiry), so no end date is compared.
+        """
+        return [
+            challenge for challenge in get_reference_data(self.db).challenges.values()
+            if challenge.is_active
+            and not challenge.is_template
+            and (not category or challenge.category == category)
+            and (not difficulty or challenge.difficulty == difficulty)
+        ]
     
     def get_all_challenges(
         self, 
@@ -44,8 +104,8 @@ class ChallengesService:
             
         return query.offset(skip).limit(limit).all()
     
-    def get_challenge_by_id(self, challenge_id: int) -> Optional[Challenge]:
-        return self.challenge_service.get_by_id(challenge_id)
+    def get_challenge_by_id(self, challenge_id: int) -> Optional[ChallengeResponse]:
+        return get_reference_data(self.db).challenges.get(challenge_id)
     
     def create_challenge(self, challenge: ChallengeCreate, created_by: int) -> Challenge:
         """Create a new challenge.
@@ -57,6 +117,10 @@ class ChallengesService:
         Returns:
             The created challenge
         """
+        self._validate_prerequisites(ChallengeNode(
+            -1, challenge.category, challenge.level, challenge.prerequisite_id, challenge.is_weekly
+        ))
+
         # Create a new ChallengeCreate object with the created_by field set
         challenge_data = ChallengeCreate(
             title=challenge.title,
@@ -68,11 +132,19 @@ class ChallengesService:
             start_date=challenge.start_date,
             end_date=challenge.end_date,
             is_active=challenge.is_active,
+            level=challenge.level,
+            is_weekly=challenge.is_weekly,
+            prerequisite_id=challenge.prerequisite_id,
+            is_template=challenge.is_template,
             created_by=created_by,
             badge_id=challenge.badge_id
         )
         
-        return self.challenge_service.create(challenge_data)
+        # The challenge, its status rows and the reference data bump commit together
+        created = self.challenge_service.create(challenge_data, commit=False)
+        self.initialize_statuses_for_challenge(created.id, commit=False)
+        bump_reference_data(self.db)
+        return created
     
     def update_challenge(self, challenge_id: int, challenge: ChallengeUpdate) -> Challenge:
         """Update a challenge.
@@ -89,12 +161,132 @@ class ChallengesService:
             challenge_dict = challenge.dict()
             challenge_dict['badge_id'] = None
             challenge = ChallengeUpdate(**challenge_dict)
-        
-        return self.challenge_service.update(challenge_id, challenge)
+
+        changes = challenge.dict(exclude_unset=True)
+        if changes.keys() & {"category", "level", "prerequisite_id", "is_weekly"}:
+            current = get_reference_data(self.db).graph.nodes.get(challenge_id)
+            if current:
+                self._validate_prerequisites(current._replace(
+                    **{field: changes[field] for field in ChallengeNode._fields if field in changes}
+                ))
+
+        updated = self.challenge_service.update(challenge_id, challenge)
+        bump_reference_data(self.db)
+        return updated
     
     def delete_challenge(self, challenge_id: int) -> bool:
-        return self.challenge_service.delete(challenge_id)
+        deleted = self.challenge_service.delete(challenge_id)
+        bump_reference_data(self.db)
+        return deleted
+
+    def _validate_prerequisites(self, node: ChallengeNode) -> None:
+        """Reject a prerequisite that does not exist or would create a cycle."""
+        graph = get_reference_data(self.db).graph
+        if node.prerequisite_id is not None and node.prerequisite_id not in graph.nodes:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Prerequisite challenge not found"
+            )
+        try:
+            graph.with_node(node)
+        except ChallengeCycleError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Prerequisite would make the challenge depend on itself"
+            )
     
+    # Challenge Status methods
+    def get_challenges_with_status(self, user_id: int) -> List[Dict[str, Any]]:
+        """All playable challenges with the user's unlock status, LOCKED when none is recorded."""
+        rows = self.db.query(
+            Challenge,
+            UserChallengeStatus.status,
+            UserChallengeStatus.unlocked_at,
+            UserChallengeStatus.completed_at
+        ).outerjoin(
+            UserChallengeStatus,
+            and_(
+                UserChallengeStatus.challenge_id == Challenge.id,
+                UserChallengeStatus.user_id == user_id
+            )
+        ).filter(
+            Challenge.is_template.isnot(True)
+        ).all()
+        # Order by the unlock progression
+        position = get_reference_data(self.db).graph.topological_index
+        rows.sort(key=lambda row: position.get(row[0].id, len(position)))
+
+        return [
+            {
+                "id": challenge.id,
+                "title": challenge.title,
+                "description": challenge.description,
+                "points": challenge.points,
+                "category": challenge.category,
+                "is_weekly": bool(challenge.is_weekly),
+                "level": challenge.level or 1,
+                "prerequisite_id": challenge.prerequisite_id,
+                "status": status or "LOCKED",
+                "unlocked_at": unlocked_at,
+                "completed_at": completed_at
+            }
+            for challenge, status, unlocked_at, completed_at in rows
+        ]
+
+    def initialize_statuses_for_user(self, user_id: int) -> int:
+        """Create the missing status rows for one user, e.g. right after registration."""
+        return self._initialize_statuses(User.user_id == user_id)
+
+    def initialize_statuses_for_challenge(self, challenge_id: int, commit: bool = True) -> int:
+        """Create the missing status rows for every user when a challenge is published."""
+        return self._initialize_statuses(Challenge.id == challenge_id, commit=commit)
+
+    def unlock_dependents(self, user_id: int, challenge_id: int) -> List[int]:
+        """
+        Mark the challenge COMPLETED for the user and make its locked dependents
+        AVAILABLE. The caller commits.
+
+        Returns the ids of the dependents of the completed challenge.
+        """
+        self.record_completions([(user_id, challenge_id)])
+        return list(get_reference_data(self.db).graph.unlocked_by(challenge_id))
+
+    def record_completions(self, completed: List[Tuple[int, int]]) -> None:
+        """
+        Apply the status transitions for a batch of (user_id, challenge_id)
+        completions in one UPDATE: each pair becomes COMPLETED and the locked
+        dependents of each pair become AVAILABLE. The caller commits.
+        """
+        if not completed:
+            return
+        graph = get_reference_data(self.db).graph
+        unlocked = [
+            (user_id, dependent)
+            for user_id, challenge_id in completed
+            for dependent in graph.unlocked_by(challenge_id)
+        ]
+        now = datetime.utcnow()
+        pair = tuple_(UserChallengeStatus.user_id, UserChallengeStatus.challenge_id)
+        # Each use needs its own expanding parameter, so the IN is built per clause
+        is_completed = lambda: pair.in_(completed)
+        is_unlocked = and_(pair.in_(unlocked), UserChallengeStatus.status == "LOCKED") if unlocked else false()
+        self.db.execute(
+            update(UserChallengeStatus)
+            .where(or_(is_completed(), is_unlocked))
+            .values(
+                status=case((is_completed(), "COMPLETED"), else_="AVAILABLE"),
+                unlocked_at=func.coalesce(UserChallengeStatus.unlocked_at, now),
+                completed_at=case((is_completed(), now), else_=UserChallengeStatus.completed_at)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _initialize_statuses(self, *criteria, commit: bool = True) -> int:
+        result = self.db.execute(status_initialization_insert(*criteria))
+        if commit:
+            self.db.commit()
+        return result.rowcount
+
     # Challenge Completion methods
     def get_user_challenges(self, user_id: int) -> List[ChallengeCompletion]:
         return self.db.query(ChallengeCompletion).filter(ChallengeCompletion.user_id == user_id).all()
@@ -201,6 +393,8 @@ class ChallengesService:
         if notes:
             update_data["notes"] = notes
         
+        self.unlock_dependents(completion.user_id, completion.challenge_id)
+
         # Update completion record
         result = self.completion_service.update(completion_id, update_data)
         
@@ -208,6 +402,170 @@ class ChallengesService:
         # This would be implemented in the LeagueTableService
         
         return result
+
+    def verify_completions_bulk(
+        self,
+        completion_ids: List[int],
+        coach_id: int,
+        notes: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Verify many completions at once, e.g. after a group session.
+
+        Completions, their challenges and the achievements that already exist
+        are prefetched in three queries; the completions, new achievements and
+        unlock statuses are then written with one statement each and
+        committed once.
+
+        Returns one outcome per requested id: "verified", "already_verified"
+        or "not_found", with whether a badge was awarded.
+        """
+        completion_ids = list(dict.fromkeys(completion_ids))
+        completions = {
+            completion.id: completion
+            for completion in self.db.query(ChallengeCompletion).filter(ChallengeCompletion.id.in_(completion_ids))
+        }
+        badge_by_challenge = dict(
+            self.db.query(Challenge.id, Challenge.badge_id).filter(
+                Challenge.id.in_({completion.challenge_id for completion in completions.values()})
+            ).all()
+        )
+        awarded = set(
+            self.db.query(Achievement.user_id, Achievement.badge_id).filter(
+                Achievement.user_id.in_({completion.user_id for completion in completions.values()}),
+                Achievement.badge_id.in_({badge_id for badge_id in badge_by_challenge.values() if badge_id})
+            ).all()
+        )
+
+        now = datetime.utcnow()
+        verification_note = f"[{now.strftime('%Y-%m-%d %H:%M')}] Verified by coach {coach_id}"
+        if notes:
+            verification_note += f": {notes}"
+
+        outcomes = []
+        new_achievements = []
+        verified_ids = []
+        completed = []
+        for completion_id in completion_ids:
+            completion = completions.get(completion_id)
+            if completion is None:
+                outcomes.append({"completion_id": completion_id, "outcome": "not_found", "badge_awarded": False})
+                continue
+            if completion.verified_by is not None:
+                outcomes.append({"completion_id": completion_id, "outcome": "already_verified", "badge_awarded": False})
+                continue
+
+            verified_ids.append(completion_id)
+            completed.append((completion.user_id, completion.challenge_id))
+
+            badge_id = badge_by_challenge.get(completion.challenge_id)
+            badge_awarded = bool(badge_id) and (completion.user_id, badge_id) not in awarded
+            if badge_awarded:
+                awarded.add((completion.user_id, badge_id))
+                new_achievements.append({
+                    "user_id": completion.user_id,
+                    "badge_id": badge_id,
+                    "awarded_by": coach_id,
+                    "earned_at": now
+                })
+            outcomes.append({"completion_id": completion_id, "outcome": "verified", "badge_awarded": badge_awarded})
+
+        try:
+            if verified_ids:
+                self.db.execute(
+                    update(ChallengeCompletion)
+                    .where(ChallengeCompletion.id.in_(verified_ids))
+                    .values(
+                        status=ChallengeStatus.COMPLETED,
+                        completed_at=now,
+                        verified_by=coach_id,
+                        notes=case(
+                            (ChallengeCompletion.notes.is_(None), verification_note),
+                            else_=ChallengeCompletion.notes + "\n" + verification_note
+                        )
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            if new_achievements:
+                self.db.execute(insert(Achievement), new_achievements)
+            self.record_completions(completed)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return outcomes
+
+    def submit_results_bulk(self, submissions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write a batch of result submissions in one transaction, as queued by
+        the batching ingest path (see services.result_ingest).
+
+        Each submission has user_id, challenge_id, result_value, notes and
+        submitted_at. Missing completions are opted in, the results inserted
+        and each completion's progress set to its latest result, with one
+        statement each; the caller commits.
+
+        Returns the created results, in submission order.
+        """
+        if not submissions:
+            return []
+        now = datetime.utcnow()
+        pairs = list(dict.fromkeys((s["user_id"], s["challenge_id"]) for s in submissions))
+        completion_ids = {
+            (user_id, challenge_id): completion_id
+            for user_id, challenge_id, completion_id in self.db.query(
+                ChallengeCompletion.user_id, ChallengeCompletion.challenge_id, ChallengeCompletion.id
+            ).filter(tuple_(ChallengeCompletion.user_id, ChallengeCompletion.challenge_id).in_(pairs))
+        }
+
+        missing = [pair for pair in pairs if pair not in completion_ids]
+        if missing:
+            self.db.execute(
+                insert_ignoring_conflicts(self.db, ChallengeCompletion, ["user_id", "challenge_id"]),
+                [
+                    {
+                        "user_id": user_id,
+                        "challenge_id": challenge_id,
+                        "status": ChallengeStatus.ACTIVE,
+                        "progress": 0.0,
+                        "notes": "Opted in automatically when submitting result",
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for user_id, challenge_id in missing
+                ]
+            )
+            # Read the ids back rather than RETURNING them: pairs a concurrent
+            # batch opted in first were skipped, but still need their id
+            completion_ids.update(
+                ((user_id, challenge_id), completion_id)
+                for user_id, challenge_id, completion_id in self.db.query(
+                    ChallengeCompletion.user_id, ChallengeCompletion.challenge_id, ChallengeCompletion.id
+                ).filter(tuple_(ChallengeCompletion.user_id, ChallengeCompletion.challenge_id).in_(missing))
+            )
+
+        rows = [
+            {
+                "completion_id": completion_ids[(s["user_id"], s["challenge_id"])],
+                "result_value": s["result_value"],
+                "notes": s["notes"],
+                "submitted_at": s["submitted_at"]
+            }
+            for s in submissions
+        ]
+        result_ids = self.db.execute(
+            insert(ChallengeResult).returning(ChallengeResult.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+
+        # Progress keeps the latest result, as the single submission path does
+        progress = {row["completion_id"]: row["result_value"] for row in rows}
+        self.db.execute(
+            update(ChallengeCompletion)
+            .where(ChallengeCompletion.id.in_(progress))
+            .values(progress=case(progress, value=ChallengeCompletion.id), updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return [{"id": result_id, **row} for result_id, row in zip(result_ids, rows)]
     
     # Badge methods
     def get_all_badges(self, skip: int = 0, limit: int = 100) -> List[Badge]:
@@ -217,13 +575,47 @@ class ChallengesService:
         return self.badge_service.get_by_id(badge_id)
     
     def create_badge(self, badge: BadgeCreate) -> Badge:
-        return self.badge_service.create(badge)
+        created = self.badge_service.create(badge)
+        bump_reference_data(self.db)
+        return created
     
     def update_badge(self, badge_id: int, badge: BadgeUpdate) -> Badge:
-        return self.badge_service.update(badge_id, badge)
+        updated = self.badge_service.update(badge_id, badge)
+        bump_reference_data(self.db)
+        return updated
     
     def delete_badge(self, badge_id: int) -> bool:
-        return self.badge_service.delete(badge_id)
+        deleted = self.badge_service.delete(badge_id)
+        bump_reference_data(self.db)
+        return deleted
+
+    def get_user_badges(self, user_id: int) -> List[BadgeWithChallenge]:
+        """Badges the user has earned, each with the challenge that awards it."""
+        badges = self.db.query(Badge).join(Achievement, Achievement.badge_id == Badge.id).filter(
+            Achievement.user_id == user_id
+        ).order_by(Badge.id).all()
+        badge_challenges = get_reference_data(self.db).badge_challenges
+        return [
+            BadgeWithChallenge(**BadgeResponse.from_orm(badge).dict(), challenge=badge_challenges.get(badge.id))
+            for badge in badges
+        ]
+
+    def get_badge_stats(self, user_id: int) -> Dict[str, int]:
+        """
+        Count the user's badges per category of the challenges awarding them.
+        A badge counts once per such challenge; weekly clones share their
+        template's badge and are not counted, and badges no challenge awards
+        are counted as "Other".
+        """
+        category = func.coalesce(Challenge.category, "Other")
+        rows = self.db.query(category, func.count()).select_from(Achievement).join(
+            Badge, Badge.id == Achievement.badge_id
+        ).outerjoin(
+            Challenge, and_(Challenge.badge_id == Achievement.badge_id, Challenge.template_id.is_(None))
+        ).filter(
+            Achievement.user_id == user_id
+        ).group_by(category).all()
+        return {name: count for name, count in rows}
     
     # Achievement methods
     def get_user_achievements(self, user_id: int) -> List[Achievement]:
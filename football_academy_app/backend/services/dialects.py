@@ -0,0 +1,29 @@
+"""
+Statements whose SQL differs between the supported backends.
+
+PostgreSQL and SQLite (3.24+) share ON CONFLICT ... DO NOTHING, but
+SQLAlchemy only builds it through each dialect's own insert(); other
+backends get a plain INSERT and surface conflicts as IntegrityError.
+"""
+from typing import List, Union
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert
+
+
+def dialect_name(bind: Union[Session, Connection]) -> str:
+    return bind.get_bind().dialect.name if isinstance(bind, Session) else bind.dialect.name
+
+
+def insert_ignoring_conflicts(bind: Union[Session, Connection], model, index_elements: List[str]) -> Insert:
+    """INSERT that skips rows conflicting with the unique index over index_elements."""
+    name = dialect_name(bind)
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(model)
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
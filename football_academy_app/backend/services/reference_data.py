@@ -0,0 +1,139 @@
+"""
+Process-local cache of the reference tables: challenges and badges.
+
+These rows are small, rarely change and are read on almost every request.
+Each worker keeps an immutable snapshot of them together with the generation
+number it was loaded at. Writers bump the generation in
+reference_data_versions through `bump_reference_data`; every worker checks
+the generation at most once per REFERENCE_DATA_POLL_SECONDS and reloads its
+snapshot only when it has changed, so a change costs each worker one reload.
+"""
+import logging
+import threading
+import time
+from functools import cached_property
+from typing import Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.challenges import Challenge, Badge
+from models.reference_data import ReferenceDataVersion
+from schemas.challenges import ChallengeResponse, BadgeResponse
+from .challenge_graph import ChallengeGraph, ChallengeNode, ChallengeCycleError
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = "reference"
+
+
+class ReferenceData:
+    """Immutable snapshot of the reference tables at one generation."""
+
+    def __init__(
+        self,
+        generation: int,
+        challenges: List[ChallengeResponse],
+        badges: List[BadgeResponse]
+    ):
+        self.generation = generation
+        self.challenges: Dict[int, ChallengeResponse] = {challenge.id: challenge for challenge in challenges}
+        self.badges: Dict[int, BadgeResponse] = {badge.id: badge for badge in badges}
+
+    @cached_property
+    def graph(self) -> ChallengeGraph:
+        """The challenge unlock graph for this snapshot."""
+        nodes = [
+            ChallengeNode(c.id, c.category, c.level or 1, c.prerequisite_id, bool(c.is_weekly))
+            for c in self.challenges.values()
+        ]
+        try:
+            return ChallengeGraph(nodes)
+        except ChallengeCycleError as e:
+            # Data written before cycle validation existed; unlock nothing rather than fail
+            logger.error(f"Could not build challenge graph: {e}")
+            return ChallengeGraph([])
+
+    @cached_property
+    def current_weekly(self) -> Optional[ChallengeResponse]:
+        """The most recently started active weekly challenge cloned from a template."""
+        weekly = [
+            challenge for challenge in self.challenges.values()
+            if challenge.template_id is not None and challenge.is_active
+        ]
+        return max(weekly, key=lambda challenge: (challenge.start_date, challenge.id), default=None)
+
+    @cached_property
+    def badge_challenges(self) -> Dict[int, ChallengeResponse]:
+        """Badge id -> the first challenge awarding it."""
+        mapping: Dict[int, ChallengeResponse] = {}
+        for challenge in self.challenges.values():
+            if challenge.badge_id is not None:
+                mapping.setdefault(challenge.badge_id, challenge)
+        return mapping
+
+
+_snapshot: Optional[ReferenceData] = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def _current_generation(db: Session) -> int:
+    generation = db.query(ReferenceDataVersion.generation).filter(
+        ReferenceDataVersion.name == VERSION_NAME
+    ).scalar()
+    return generation or 0
+
+
+def _load(db: Session, generation: int) -> ReferenceData:
+    challenges = db.query(Challenge).order_by(Challenge.id).all()
+    badges = db.query(Badge).order_by(Badge.id).all()
+    return ReferenceData(
+        generation,
+        [ChallengeResponse.from_orm(challenge) for challenge in challenges],
+        [BadgeResponse.from_orm(badge) for badge in badges]
+    )
+
+
+def get_reference_data(db: Session) -> ReferenceData:
+    """
+    Return this worker's snapshot, reloading it when another worker has
+    bumped the generation since the last check.
+    """
+    global _snapshot, _checked_at
+    snapshot = _snapshot
+    if snapshot is not None and time.monotonic() - _checked_at < settings.REFERENCE_DATA_POLL_SECONDS:
+        return snapshot
+
+    with _lock:
+        generation = _current_generation(db)
+        _checked_at = time.monotonic()
+        if _snapshot is None or _snapshot.generation != generation:
+            _snapshot = _load(db, generation)
+            logger.info(f"Loaded reference data at generation {generation}")
+        return _snapshot
+
+
+def bump_reference_data(db: Session) -> None:
+    """
+    Record a write to a reference table and drop the local snapshot so this
+    worker reloads on its next read. Other workers notice on their next poll.
+    """
+    result = db.execute(
+        update(ReferenceDataVersion)
+        .where(ReferenceDataVersion.name == VERSION_NAME)
+        .values(generation=ReferenceDataVersion.generation + 1)
+    )
+    if result.rowcount == 0:
+        db.add(ReferenceDataVersion(name=VERSION_NAME, generation=1))
+    db.commit()
+    reset_reference_data()
+
+
+def reset_reference_data() -> None:
+    """Drop the local snapshot without touching the database."""
+    global _snapshot, _checked_at
+    with _lock:
+        _snapshot = None
+        _checked_at = 0.0
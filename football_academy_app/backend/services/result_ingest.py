@@ -0,0 +1,138 @@
+"""
+Micro-batching ingest path for challenge result submissions.
+
+On challenge days many players submit results at the same moment, and the
+per-request path commits twice for each of them. With
+RESULT_INGEST_BATCHING enabled the submit-result route validates the request
+and hands it to this queue instead. The queue collects submissions and writes
+them in group commits of up to RESULT_INGEST_MAX_ROWS rows, or whatever has
+arrived RESULT_INGEST_MAX_DELAY_MS after the first one. Each caller awaits
+its own result, so the response is unchanged; only its latency grows by at
+most the batching delay.
+
+Batches are written on a worker thread, one at a time, so the next batch
+fills up while the previous one commits. When a batch fails, its
+submissions are retried one by one, so only the failing caller gets the
+error.
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from config import settings
+from .challenges import ChallengesService
+
+logger = logging.getLogger(__name__)
+
+
+class PendingResult(NamedTuple):
+    submission: Dict[str, Any]
+    future: asyncio.Future
+
+
+class ResultIngestQueue:
+    """Queues result submissions and writes them in group commits."""
+
+    def __init__(self, bind: Engine, max_rows: int, max_delay_ms: int):
+        self.bind = bind
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000.0
+        self.batches_written = 0
+        self.results_written = 0
+        self._pending: List[PendingResult] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    async def submit(self, submission: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one validated submission and wait for the result row written for it."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._pending_lock:
+            self._pending.append(PendingResult(submission, future))
+            full = len(self._pending) >= self.max_rows
+            if not full and self._timer is None:
+                self._timer = loop.call_later(self.max_delay, self._flush)
+        if full:
+            self._flush()
+        return await future
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().run_in_executor(None, self._write, batch)
+
+    def _write(self, batch: List[PendingResult]) -> None:
+        with self._write_lock:
+            try:
+                outcomes = [(pending, result, None) for pending, result in zip(
+                    batch, self._write_batch([pending.submission for pending in batch])
+                )]
+                self.batches_written += 1
+            except Exception as e:
+                if len(batch) == 1:
+                    outcomes = [(batch[0], None, e)]
+                else:
+                    # One bad submission must not fail the whole batch: write them
+                    # one by one so only its own caller sees the error
+                    logger.warning(f"Failed to write batch of {len(batch)} results, writing them one by one: {e}")
+                    outcomes = [self._write_one(pending) for pending in batch]
+            self.results_written += sum(1 for _, _, error in outcomes if error is None)
+
+        for pending, result, error in outcomes:
+            if error is not None:
+                logger.error(f"Failed to write result: {error}")
+            _resolve(pending.future, result=result, exception=error)
+
+    def _write_one(self, pending: PendingResult):
+        try:
+            result = self._write_batch([pending.submission])[0]
+        except Exception as e:
+            return pending, None, e
+        self.batches_written += 1
+        return pending, result, None
+
+    def _write_batch(self, submissions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with Session(bind=self.bind) as db:
+            try:
+                results = ChallengesService(db).submit_results_bulk(submissions)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        return results
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+    """Complete a caller's future from the writer thread, on the caller's event loop."""
+    def complete():
+        if future.done():
+            return
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    future.get_loop().call_soon_threadsafe(complete)
+
+
+_queues: Dict[Engine, ResultIngestQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_result_ingest_queue(bind: Engine) -> ResultIngestQueue:
+    """The process-wide queue writing to the given engine."""
+    with _queues_lock:
+        queue = _queues.get(bind)
+        if queue is None:
+            queue = _queues[bind] = ResultIngestQueue(
+                bind, settings.RESULT_INGEST_MAX_ROWS, settings.RESULT_INGEST_MAX_DELAY_MS
+            )
+        return queue
@@ -0,0 +1,275 @@
+"""
+Monthly partitioning of the append-only challenge_results table.
+
+On PostgreSQL (11 or newer) challenge_results is a declaratively partitioned
+table, ranged on submitted_at with one partition per calendar month plus a
+default partition that catches anything outside the created months. The
+primary key therefore becomes (id, submitted_at); ids still come from the
+same sequence, so the ORM keeps treating id alone as the identity.
+
+Queries that bound submitted_at with `submitted_between` let the planner skip
+every month outside the window. Other databases keep the plain table, and
+every function here is a no-op on them.
+
+Partitions for upcoming months are created by `ensure_partitions`, run
+periodically through manage_partitions.py. Old months are detached rather
+than dropped, so they can be archived without touching the live table.
+"""
+import logging
+import re
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import ColumnElement
+
+from models.challenges import ChallengeResult
+
+logger = logging.getLogger(__name__)
+
+TABLE = "challenge_results"
+DEFAULT_PARTITION = f"{TABLE}_default"
+MONTHS_AHEAD = 3
+_PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value: date) -> date:
+    """The first day of the month containing the given date."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """The first day of the month the given number of months later."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a partition covers, or None for the default partition."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def submitted_between(since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[ColumnElement]:
+    """Filters on ChallengeResult.submitted_at that PostgreSQL can use to prune partitions."""
+    criteria = []
+    if since is not None:
+        criteria.append(ChallengeResult.submitted_at >= since)
+    if until is not None:
+        criteria.append(ChallengeResult.submitted_at <= until)
+    return criteria
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {"table": TABLE}).scalar())
+
+
+def list_partitions(connection: Connection) -> List[Tuple[str, Optional[date]]]:
+    """(name, month) of every partition, oldest month first and the default partition last."""
+    if not is_partitioned(connection):
+        return []
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)"
+    ), {"table": TABLE}).scalars().all()
+    partitions = [(name, partition_month(name)) for name in names]
+    return sorted(partitions, key=lambda partition: (partition[1] is None, partition[1] or date.min))
+
+
+def create_partition(connection: Connection, month: date) -> bool:
+    """
+    Create the partition for one month if it does not exist yet.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition, since PostgreSQL refuses to create a
+    partition whose range overlaps rows in the default partition.
+
+    Returns:
+        True if the partition was created
+    """
+    name = partition_name(month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+        return False
+
+    bounds = {"start": month, "end": add_months(month, 1)}
+    has_default_rows = connection.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+        "WHERE submitted_at >= :start AND submitted_at < :end)"
+    ), bounds).scalar()
+
+    range_sql = f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    if has_default_rows:
+        connection.execute(text(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        connection.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE submitted_at >= :start AND submitted_at < :end RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        connection.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} {range_sql}"))
+        logger.info(f"Created partition {name} from rows in {DEFAULT_PARTITION}")
+    else:
+        connection.execute(text(f"CREATE TABLE {name} PARTITION OF {TABLE} {range_sql}"))
+        logger.info(f"Created partition {name}")
+    return True
+
+
+def ensure_partitions(connection: Connection, months_ahead: int = MONTHS_AHEAD, today: Optional[date] = None) -> List[str]:
+    """
+    Create any missing partitions from the current month through
+    `months_ahead` months ahead, plus one for every month whose rows ended
+    up in the default partition (bulk loads, or maintenance that lapsed).
+
+    Returns:
+        Names of the partitions created
+    """
+    if not is_partitioned(connection):
+        return []
+    current = month_start(today or date.today())
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    stray = connection.execute(text(
+        f"SELECT DISTINCT date_trunc('month', submitted_at) FROM {DEFAULT_PARTITION}"
+    )).scalars().all()
+    months.update(month_start(value) for value in stray)
+    return [partition_name(month) for month in sorted(months) if create_partition(connection, month)]
+
+
+def detach_partitions_before(connection: Connection, cutoff: date) -> List[str]:
+    """
+    Detach the monthly partitions that end on or before the cutoff month.
+
+    Detached partitions stay in the database as ordinary tables, ready to be
+    archived or dropped; results are never deleted from the live table.
+
+    Returns:
+        Names of the partitions detached
+    """
+    cutoff = month_start(cutoff)
+    detached = []
+    for name, month in list_partitions(connection):
+        if month is not None and month < cutoff:
+            connection.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+            detached.append(name)
+            logger.info(f"Detached partition {name}")
+    return detached
+
+
+def partition_results_table(
+    connection: Connection,
+    months_ahead: int = MONTHS_AHEAD,
+    since: Optional[date] = None,
+    today: Optional[date] = None
+) -> bool:
+    """
+    Convert a plain challenge_results table into the partitioned layout,
+    copying its rows into monthly partitions. Partitions start at the oldest
+    existing row's month, or at `since` when that is earlier, e.g. for the
+    history a bulk load is about to insert.
+
+    Returns:
+        True if the table was converted
+    """
+    if connection.dialect.name != "postgresql" or is_partitioned(connection):
+        return False
+
+    legacy = f"{TABLE}_unpartitioned"
+    # Keep the id sequence alive while the old table is replaced
+    connection.execute(text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq OWNED BY NONE"))
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {legacy}"))
+    connection.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {TABLE}_pkey TO {legacy}_pkey"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_challenge_results_id"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_challenge_results_completion_submitted"))
+
+    connection.execute(text(f"CREATE SEQUENCE IF NOT EXISTS {TABLE}_id_seq"))
+    connection.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq'),
+            completion_id INTEGER REFERENCES challenge_completions (id),
+            result_value DOUBLE PRECISION NOT NULL,
+            notes VARCHAR,
+            submitted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, submitted_at)
+        ) PARTITION BY RANGE (submitted_at)
+    """))
+    connection.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT"))
+    connection.execute(text(f"CREATE INDEX ix_challenge_results_id ON {TABLE} (id)"))
+    connection.execute(text(
+        f"CREATE INDEX ix_challenge_results_completion_submitted ON {TABLE} (completion_id, submitted_at)"
+    ))
+
+    # One partition per month of existing history, through the months ahead
+    oldest = connection.execute(text(f"SELECT MIN(submitted_at) FROM {legacy}")).scalar()
+    current = month_start(today or date.today())
+    month = min(month_start(start) for start in (current, oldest and oldest.date(), since) if start is not None)
+    last = add_months(current, months_ahead)
+    while month <= last:
+        create_partition(connection, month)
+        month = add_months(month, 1)
+
+    connection.execute(text(
+        f"INSERT INTO {TABLE} (id, completion_id, result_value, notes, submitted_at) "
+        f"SELECT id, completion_id, result_value, notes, COALESCE(submitted_at, CURRENT_TIMESTAMP) FROM {legacy}"
+    ))
+    connection.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    connection.execute(text(
+        f"SELECT setval('{TABLE}_id_seq', COALESCE((SELECT MAX(id) FROM {TABLE}), 0) + 1, false)"
+    ))
+    connection.execute(text(f"DROP TABLE {legacy}"))
+    logger.info(f"Partitioned {TABLE} by month of submitted_at")
+    return True
+
+
+def unpartition_results_table(connection: Connection) -> bool:
+    """
+    Convert the partitioned challenge_results table back into a plain
+    table. Rows in partitions that were already detached are not copied.
+
+    Returns:
+        True if the table was converted
+    """
+    if not is_partitioned(connection):
+        return False
+
+    partitioned = f"{TABLE}_partitioned"
+    connection.execute(text(f"ALTER SEQUENCE IF EXISTS {TABLE}_id_seq OWNED BY NONE"))
+    connection.execute(text(f"ALTER TABLE {TABLE} RENAME TO {partitioned}"))
+    connection.execute(text(f"ALTER TABLE {partitioned} RENAME CONSTRAINT {TABLE}_pkey TO {partitioned}_pkey"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_challenge_results_id"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_challenge_results_completion_submitted"))
+
+    connection.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            id INTEGER NOT NULL DEFAULT nextval('{TABLE}_id_seq') PRIMARY KEY,
+            completion_id INTEGER REFERENCES challenge_completions (id),
+            result_value DOUBLE PRECISION NOT NULL,
+            notes VARCHAR,
+            submitted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """))
+    connection.execute(text(f"CREATE INDEX ix_challenge_results_id ON {TABLE} (id)"))
+    connection.execute(text(
+        f"CREATE INDEX ix_challenge_results_completion_submitted ON {TABLE} (completion_id, submitted_at)"
+    ))
+    connection.execute(text(
+        f"INSERT INTO {TABLE} (id, completion_id, result_value, notes, submitted_at) "
+        f"SELECT id, completion_id, result_value, notes, submitted_at FROM {partitioned}"
+    ))
+    connection.execute(text(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id"))
+    # Dropping the parent drops its attached partitions
+    connection.execute(text(f"DROP TABLE {partitioned}"))
+    logger.info(f"Converted {TABLE} back to a plain table")
+    return True
@@ -11,7 +11,7 @@ from schemas.skill_tests import (
     PlayerStatsCreate, PlayerStatsUpdate, PlayerStatsResponse,
     PlayerTestCreate, PlayerTestUpdate, PlayerTestResponse
 )
-from services.base import BaseService
+from services.base import BaseService, FieldSet
 from constants.test_scores import (
     MAX_PACE_SCORE, MAX_SHOOTING_SCORE, MAX_PASSING_SCORE,
     MAX_DRIBBLING_SCORE, MAX_JUGGLES_SCORE, MAX_FIRST_TOUCH_SCORE,
@@ -185,12 +185,15 @@ class SkillTestsService:
         await self.db.commit()
     
     # Player Test methods
-    async def get_player_tests(self, player_id: int) -> List[PlayerTest]:
-        result = await self.db.execute(
+    async def get_player_tests(self, player_id: int, fieldset: Optional[FieldSet] = None) -> List[PlayerTest]:
+        query = (
             select(PlayerTest)
             .where(PlayerTest.player_id == player_id)
             .order_by(PlayerTest.test_date.desc())
         )
+        if fieldset is not None:
+            query = query.options(*fieldset.load_options(PlayerTest))
+        result = await self.db.execute(query)
         tests = result.scalars().all()
         return list(tests)
     
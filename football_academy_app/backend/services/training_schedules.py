@@ -1,17 +1,42 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Query, Session, contains_eager, selectinload
 from fastapi import HTTPException, status
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
 
+from models.focus_areas import FocusArea
 from models.training_schedules import TrainingSchedule, TrainingSession
 from schemas.training_schedules import (
     TrainingScheduleCreate, 
     TrainingScheduleUpdate,
     TrainingSessionCreate,
     TrainingSessionUpdate,
-    TrainingSessionReflection
+    TrainingSessionReflection,
+    TrainingRecurrence
 )
-from .base import BaseService
+from config import settings
+from .base import BaseService, FieldSet
+
+def iso_weeks(start: date, end: date) -> Set[Tuple[int, int]]:
+    """The (ISO year, ISO week) of every week overlapping start..end."""
+    weeks = set()
+    day = start - timedelta(days=start.weekday())
+    while day <= end:
+        weeks.add(tuple(day.isocalendar()[:2]))
+        day += timedelta(days=7)
+    return weeks
+
+def expand_recurrence(recurrence: TrainingRecurrence) -> Dict[Tuple[int, int], List[date]]:
+    """The dates a recurrence rule falls on, grouped by (ISO year, ISO week) in date order."""
+    days = set(recurrence.days_of_week)
+    exceptions = set(recurrence.exceptions)
+    weeks: Dict[Tuple[int, int], List[date]] = {}
+    day = recurrence.start_date
+    while day <= recurrence.until:
+        if day.isoweekday() in days and day not in exceptions:
+            weeks.setdefault(tuple(day.isocalendar()[:2]), []).append(day)
+        day += timedelta(days=1)
+    return weeks
 
 class TrainingScheduleService:
     def __init__(self, db: Session):
@@ -24,14 +49,24 @@ class TrainingScheduleService:
         )
 
     # Training Schedule methods
-    def get_all_schedules(self, skip: int = 0, limit: int = 100) -> List[TrainingSchedule]:
-        return self.schedule_service.get_all(skip=skip, limit=limit)
+    def _schedule_options(self, fieldset: Optional[FieldSet]) -> list:
+        if fieldset is not None:
+            return fieldset.load_options(TrainingSchedule)
+        # Sessions are serialized with every schedule, load them in one extra query
+        return [selectinload(TrainingSchedule.training_sessions)]
+
+    def get_all_schedules(self, skip: int = 0, limit: int = 100, fieldset: Optional[FieldSet] = None) -> List[TrainingSchedule]:
+        return self.db.query(TrainingSchedule).options(
+            *self._schedule_options(fieldset)
+        ).offset(skip).limit(limit).all()
 
     def get_schedule_by_id(self, schedule_id: int) -> Optional[TrainingSchedule]:
         return self.schedule_service.get_by_id(schedule_id)
 
-    def get_user_schedules(self, user_id: int) -> List[TrainingSchedule]:
-        return self.db.query(TrainingSchedule).filter(TrainingSchedule.user_id == user_id).all()
+    def get_user_schedules(self, user_id: int, fieldset: Optional[FieldSet] = None) -> List[TrainingSchedule]:
+        return self.db.query(TrainingSchedule).options(
+            *self._schedule_options(fieldset)
+        ).filter(TrainingSchedule.user_id == user_id).all()
 
     def get_schedules_by_week(self, user_id: int, week_number: int, year: int) -> Optional[TrainingSchedule]:
         return self.db.query(TrainingSchedule).filter(
@@ -40,6 +75,122 @@ class TrainingScheduleService:
             TrainingSchedule.year == year
         ).first()
 
+    def calendar_query(self, user_id: int, start: date, end: date) -> Query:
+        """
+        The user's schedules for the weeks overlapping start..end, each with
+        its sessions in that range and their focus areas, as one joined query.
+        Schedules outside those weeks still appear when they hold a session in
+        the range.
+        """
+        in_range = and_(
+            TrainingSession.schedule_id == TrainingSchedule.id,
+            TrainingSession.session_date.between(start, end)
+        )
+        return self.db.query(TrainingSchedule).outerjoin(
+            TrainingSession, in_range
+        ).outerjoin(
+            FocusArea, FocusArea.id == TrainingSession.focus_area_id
+        ).options(
+            contains_eager(TrainingSchedule.training_sessions)
+            .contains_eager(TrainingSession.focus_area)
+            .load_only(FocusArea.title)
+        ).filter(
+            TrainingSchedule.user_id == user_id,
+            or_(
+                tuple_(TrainingSchedule.year, TrainingSchedule.week_number).in_(iso_weeks(start, end)),
+                TrainingSession.id.isnot(None)
+            )
+        ).order_by(
+            TrainingSchedule.year, TrainingSchedule.week_number,
+            TrainingSession.session_date, TrainingSession.start_time
+        ).populate_existing()  # The sessions collections hold only the range
+
+    def get_calendar(self, user_id: int, start: date, end: date) -> List[TrainingSchedule]:
+        return self.calendar_query(user_id, start, end).all()
+
+    def generate_sessions(self, recurrence: TrainingRecurrence, preview: bool = False) -> Dict[str, Any]:
+        """
+        Expand a recurrence rule and create its sessions, adding a schedule
+        for every week the user does not have one for yet. Sessions the
+        user already has on the same day and start time are skipped, so
+        re-posting a rule or an overlapping one adds nothing twice.
+        Schedules and sessions are each written as one bulk insert in a
+        single transaction. With preview the expansion is returned without
+        writing anything.
+        """
+        if not recurrence.days_of_week or not set(recurrence.days_of_week) <= set(range(1, 8)):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="days_of_week must list days from 1 (Monday) to 7 (Sunday)"
+            )
+        if recurrence.until < recurrence.start_date:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="until must not be before start_date")
+        if (recurrence.until - recurrence.start_date).days >= settings.TRAINING_RECURRENCE_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A recurrence covers at most {settings.TRAINING_RECURRENCE_MAX_DAYS} days"
+            )
+
+        weeks = expand_recurrence(recurrence)
+        schedule_ids: Dict[Tuple[int, int], int] = {}
+        existing_sessions: Set[Tuple[int, date]] = set()
+        if weeks:
+            # The user's schedules for these weeks, each with the sessions the
+            # rule would add again: same day and start time
+            for schedule_id, year, week_number, session_date in self.db.query(
+                TrainingSchedule.id, TrainingSchedule.year, TrainingSchedule.week_number, TrainingSession.session_date
+            ).outerjoin(
+                TrainingSession, and_(
+                    TrainingSession.schedule_id == TrainingSchedule.id,
+                    TrainingSession.start_time == recurrence.start_time,
+                    TrainingSession.session_date.between(recurrence.start_date, recurrence.until)
+                )
+            ).filter(
+                TrainingSchedule.user_id == recurrence.user_id,
+                tuple_(TrainingSchedule.year, TrainingSchedule.week_number).in_(weeks)
+            ):
+                schedule_ids[(year, week_number)] = schedule_id
+                if session_date is not None:
+                    existing_sessions.add((schedule_id, session_date))
+        missing = [week for week in weeks if week not in schedule_ids]
+        new_sessions = [
+            (week, day) for week, dates in weeks.items() for day in dates
+            if (schedule_ids.get(week), day) not in existing_sessions
+        ]
+
+        if not preview and weeks:
+            try:
+                schedules = self.schedule_service.bulk_create([
+                    {"user_id": recurrence.user_id, "year": year, "week_number": week_number,
+                     "title": f"Week {week_number}", "development_plan_id": recurrence.development_plan_id}
+                    for year, week_number in missing
+                ], commit=False)
+                schedule_ids.update(((schedule.year, schedule.week_number), schedule.id) for schedule in schedules)
+
+                session_fields = recurrence.dict(include={
+                    "title", "description", "start_time", "end_time", "location", "focus_area_id"
+                })
+                self.session_service.bulk_create([
+                    {**session_fields, "schedule_id": schedule_ids[week],
+                     "session_date": day, "day_of_week": day.isoweekday()}
+                    for week, day in new_sessions
+                ], commit=False)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+
+        return {
+            "preview": preview,
+            "schedules_created": len(missing),
+            "sessions_created": len(new_sessions),
+            "weeks": [
+                {"year": year, "week_number": week_number, "schedule_id": schedule_ids.get((year, week_number)),
+                 "session_dates": dates}
+                for (year, week_number), dates in weeks.items()
+            ],
+        }
+
     def create_schedule(self, schedule: TrainingScheduleCreate) -> TrainingSchedule:
         # Check if a schedule already exists for this week/year
         existing = self.get_schedules_by_week(
@@ -63,8 +214,11 @@ class TrainingScheduleService:
         return self.schedule_service.delete(schedule_id)
 
     # Training Session methods
-    def get_sessions_by_schedule(self, schedule_id: int) -> List[TrainingSession]:
-        return self.db.query(TrainingSession).filter(TrainingSession.schedule_id == schedule_id).all()
+    def get_sessions_by_schedule(self, schedule_id: int, fieldset: Optional[FieldSet] = None) -> List[TrainingSession]:
+        query = self.db.query(TrainingSession).filter(TrainingSession.schedule_id == schedule_id)
+        if fieldset is not None:
+            query = query.options(*fieldset.load_options(TrainingSession))
+        return query.all()
 
     def get_session_by_id(self, session_id: int) -> Optional[TrainingSession]:
         return self.session_service.get_by_id(session_id)
@@ -0,0 +1,103 @@
+"""
+Weekly challenge rollover.
+
+Coaches configure weekly templates: weekly challenges flagged is_template.
+Every Monday (UTC) the active templates take turns by ISO week number. The
+template for the week is cloned into a new challenge running until the next
+Monday; every active player is opted in with one INSERT ... SELECT, and last
+week's challenge is archived by the expiry logic since its end date has
+passed. The expiry sweeper wakes at that end date and runs the rollover, so
+no separate scheduler is needed.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.challenges import Challenge, ChallengeCompletion, ChallengeStatus
+from models.users import User
+from .challenge_expiry import expire_challenges
+from .challenges import status_initialization_insert
+from .reference_data import get_reference_data, bump_reference_data
+
+logger = logging.getLogger(__name__)
+
+WEEKLY_OPT_IN_NOTE = "Opted in automatically to the weekly challenge"
+
+
+def week_start(now: datetime) -> datetime:
+    """Midnight on the Monday of the week containing now."""
+    return datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+
+
+def roll_over_weekly_challenge(db: Session, now: Optional[datetime] = None) -> Optional[int]:
+    """
+    Start this week's weekly challenge if it does not exist yet.
+
+    Returns:
+        ID of the challenge created, or None if there was nothing to do
+    """
+    now = now or datetime.utcnow()
+    start = week_start(now)
+    reference = get_reference_data(db)
+    if any(c.template_id is not None and c.start_date == start for c in reference.challenges.values()):
+        return None
+    templates = sorted(
+        (c for c in reference.challenges.values() if c.is_template and c.is_active),
+        key=lambda c: c.id
+    )
+    if not templates:
+        return None
+    template = templates[start.isocalendar()[1] % len(templates)]
+
+    try:
+        challenge_id = db.execute(
+            insert(Challenge).returning(Challenge.id).values(
+                title=template.title,
+                description=template.description,
+                category=template.category,
+                difficulty=template.difficulty,
+                points=template.points,
+                criteria=template.criteria,
+                badge_id=template.badge_id,
+                level=template.level,
+                created_by=template.created_by,
+                start_date=start,
+                end_date=start + timedelta(days=7),
+                is_active=True,
+                is_weekly=True,
+                is_template=False,
+                template_id=template.id,
+                created_at=now,
+                updated_at=now
+            )
+        ).scalar_one()
+    except IntegrityError:
+        # Another worker rolled over first
+        db.rollback()
+        return None
+
+    players = select(
+        User.user_id,
+        literal(challenge_id),
+        literal(ChallengeStatus.ACTIVE, ChallengeCompletion.status.type),
+        literal(0.0),
+        literal(WEEKLY_OPT_IN_NOTE),
+        literal(now),
+        literal(now)
+    ).where(User.is_active == True, User.is_coach == False)
+    opted_in = db.execute(
+        insert(ChallengeCompletion).from_select(
+            ["user_id", "challenge_id", "status", "progress", "notes", "created_at", "updated_at"], players
+        )
+    ).rowcount
+    db.execute(status_initialization_insert(Challenge.id == challenge_id))
+
+    # Archiving last week's challenge commits everything through its reference data bump
+    if not expire_challenges(db, now=start):
+        bump_reference_data(db)
+    logger.info(f"Started weekly challenge {challenge_id} from template {template.id} with {opted_in} players")
+    return challenge_id
@@ -0,0 +1,75 @@
+"""
+Read-replica routing.
+
+`RoutingSession` sends plain SELECTs to the replica engine while the session
+is in replica mode and everything else to the primary: flushes, INSERT /
+UPDATE / DELETE statements, SELECT ... FOR UPDATE, and any statement after
+the session has written once, so a request always reads what it wrote.
+
+`get_db` puts GET requests in replica mode unless the caller, identified by
+their Authorization header, sent a write within READ_YOUR_WRITES_SECONDS.
+Recent writers are tracked in memory per worker, so the window only covers
+reads served by the worker that took the write; set it longer than the
+replica lag seen in practice.
+"""
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from starlette.requests import Request
+
+READ_METHODS = {"GET", "HEAD"}
+
+
+class RoutingSession(Session):
+    """Session that reads from replica_bind while info["use_replica"] is set."""
+
+    def __init__(self, *args, replica_bind: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kw)
+        if self.replica_bind is None or not self.info.get("use_replica"):
+            return primary
+        if self._flushing or (
+            clause is not None and (not isinstance(clause, Select) or clause._for_update_arg is not None)
+        ):
+            self._wrote = True
+        # Binds asked for without a statement, e.g. for the dialect, are the primary's
+        return primary if self._wrote or clause is None else self.replica_bind
+
+
+class RecentWriters:
+    """When each caller last sent a write, kept for the read-your-writes window."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._writes: Dict[str, float] = {}
+
+    def record(self, caller: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._writes[caller] = now
+            # Forget callers whose window has passed so the map stays small
+            if len(self._writes) > 10000:
+                self._writes = {c: t for c, t in self._writes.items() if now - t < self.window_seconds}
+
+    def wrote_recently(self, caller: str) -> bool:
+        with self._lock:
+            written = self._writes.get(caller)
+        return written is not None and time.monotonic() - written < self.window_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes.clear()
+
+
+def caller_key(request: Request) -> str:
+    return hashlib.sha256(request.headers.get("authorization", "").encode()).hexdigest()
@@ -5,22 +5,37 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
 # Add the parent directory to the path so we can import from the main package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# The background expiry sweeper would use the application database
+os.environ.setdefault("CHALLENGE_EXPIRY_SWEEPER", "false")
+
 from main import app
-from database import Base, get_db
+from database import Base, get_db, get_async_db
+from middleware import idempotency_store
+from services.reference_data import reset_reference_data
+from tests.query_budget import QueryCounter
 
-# Create an in-memory SQLite database for testing
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# Create an in-memory SQLite database for testing. The shared cache lets the
+# async engine used by the skill-tests routes see the same database.
+TEST_DATABASE_URL = "sqlite:///file:football_academy_test?mode=memory&cache=shared&uri=true"
+TEST_ASYNC_DATABASE_URL = "sqlite+aiosqlite:///file:football_academy_test?mode=memory&cache=shared&uri=true"
 
 engine = create_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(
+    TEST_ASYNC_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+TestingAsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 @pytest.fixture(scope="function")
@@ -30,6 +45,9 @@ def db():
     """
     # Create the tables
     Base.metadata.create_all(bind=engine)
+    # Process-wide caches must not outlive the database they were built from
+    reset_reference_data()
+    idempotency_store.clear()
     
     # Create a new session for testing
     db = TestingSessionLocal()
@@ -53,12 +71,29 @@ def client(db):
         finally:
             pass
     
-    # Override the database dependency
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
+    # Override the database dependencies
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Create a test client
     with TestClient(app) as client:
         yield client
     
     # Clean up the overrides after the test
-    app.dependency_overrides = {} 
\ No newline at end of file
+    app.dependency_overrides = {}
+
+
+@pytest.fixture(scope="function")
+def query_counter(db):
+    """
+    Record the SQL statements issued by both test engines.
+    
+    Usage:
+        with query_counter.count() as statements:
+            client.get(...)
+    """
+    return QueryCounter(engine, async_engine.sync_engine)
@@ -0,0 +1,66 @@
+"""
+Query-count recording and per-router query budgets.
+
+Budgets live in tests/query_budgets/<router>.json and map "METHOD /path" (the
+route path without the /api/v2 prefix) to either {"max_queries": n} or
+{"skip": "reason"} for endpoints that cannot be exercised yet. Budgets are
+measured with the reference data cache warm, i.e. in steady state.
+"""
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+from sqlalchemy import event
+
+BUDGETS_DIR = Path(__file__).resolve().parent / "query_budgets"
+
+
+class QueryCounter:
+    """Records every SQL statement executed on the given engines."""
+
+    def __init__(self, *engines):
+        self.engines = engines
+
+    @contextmanager
+    def count(self):
+        statements: List[str] = []
+        with self._listen(lambda statement, parameters: statements.append(statement)):
+            yield statements
+
+    @contextmanager
+    def record(self):
+        """Like count, but keeps each statement's parameters for replaying it, e.g. under EXPLAIN."""
+        executed: List[Tuple[str, Any]] = []
+        with self._listen(lambda statement, parameters: executed.append((statement, parameters))):
+            yield executed
+
+    @contextmanager
+    def _listen(self, callback):
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            callback(statement, parameters)
+
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield
+        finally:
+            for engine in self.engines:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def load_budgets(router_name: str) -> Dict[str, Dict[str, Any]]:
+    """Load the query budget file for a router module (e.g. "challenges")."""
+    with open(BUDGETS_DIR / f"{router_name}.json") as f:
+        return json.load(f)
+
+
+def assert_within_budget(key: str, budget: Dict[str, Any], statements: List[str]) -> None:
+    """Fail with the recorded statements when a request exceeds its query budget."""
+    max_queries = budget["max_queries"]
+    if len(statements) > max_queries:
+        listing = "\n".join(f"  {n}. {statement}" for n, statement in enumerate(statements, 1))
+        raise AssertionError(
+            f"{key} issued {len(statements)} queries, budget is {max_queries}. "
+            f"Look for N+1 patterns:\n{listing}"
+        )
@@ -0,0 +1,53 @@
+"""
+Tests for the badge listing and badge statistics endpoints.
+"""
+from models import Achievement, Badge
+from tests.utils import get_auth_header
+
+
+def _seed(client, db):
+    headers = get_auth_header(client)
+    badges = [Badge(name=name, description="", image_url="", criteria="") for name in ("Juggler", "Sprinter", "Loyal")]
+    db.add_all(badges)
+    db.commit()
+    base = {"description": "", "difficulty": "beginner", "criteria": {}, "created_by": 1}
+    challenges = [
+        client.post("/api/v2/challenges/", json={**base, "title": title, "category": category, "badge_id": badge_id},
+                    headers=headers).json()
+        for title, category, badge_id in (
+            ("Juggling", "technical", badges[0].id),
+            ("Sprint", "physical", badges[1].id),
+            ("Shuttle run", "physical", badges[1].id),
+        )
+    ]
+    db.add_all([Achievement(user_id=1, badge_id=badge.id) for badge in badges])
+    db.commit()
+    return headers, badges, challenges
+
+
+def test_badge_stats_group_by_challenge_category(client, db):
+    headers, _, _ = _seed(client, db)
+
+    response = client.get("/api/v2/challenges/badge-stats", headers=headers)
+    assert response.status_code == 200
+    # A badge counts once per challenge awarding it; badges without a challenge are "Other"
+    assert response.json() == {"technical": 1, "physical": 2, "Other": 1}
+
+
+def test_user_badges_include_awarding_challenge(client, db):
+    headers, badges, challenges = _seed(client, db)
+    db.add(Badge(name="Unearned", description="", image_url="", criteria=""))
+    db.commit()
+
+    response = client.get("/api/v2/challenges/badges", headers=headers)
+    assert response.status_code == 200
+    assert [(b["name"], b["challenge"] and b["challenge"]["title"]) for b in response.json()] == [
+        ("Juggler", "Juggling"),
+        ("Sprinter", "Sprint"),
+        ("Loyal", None),
+    ]
+
+    # Challenge writes invalidate the cached badge mapping
+    client.put(f"/api/v2/challenges/{challenges[0]['id']}", json={"title": "Keepy-uppy"}, headers=headers)
+    response = client.get("/api/v2/challenges/badges", headers=headers)
+    assert response.json()[0]["challenge"]["title"] == "Keepy-uppy"
@@ -0,0 +1,80 @@
+"""
+Tests for the generic BaseService CRUD paths.
+"""
+from types import SimpleNamespace
+
+from models import TrainingSchedule as TrainingScheduleModel, User
+from schemas.training_schedules import TrainingSchedule, TrainingScheduleCreate
+from services.base import BaseService, _in_input_order
+
+
+def test_create_returns_the_row_without_reading_it_back(db, query_counter):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    db.commit()
+    service = BaseService(TrainingScheduleModel, db)
+
+    with query_counter.count() as statements:
+        schedule = service.create(TrainingScheduleCreate(week_number=34, year=2023, title="Week 34", user_id=1))
+        response = TrainingSchedule.from_orm(schedule)
+
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO training_schedules")
+    assert response.id == 1
+    assert response.created_at is not None and response.updated_at is not None
+
+
+def _schedules(count):
+    return [TrainingScheduleCreate(week_number=week, year=2023, title=f"Week {week}", user_id=1)
+            for week in range(1, count + 1)]
+
+
+def test_bulk_create_chunks_inserts_into_one_transaction(db, query_counter, monkeypatch):
+    monkeypatch.setattr("services.base.BULK_CHUNK_SIZE", 2)
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    db.commit()
+    service = BaseService(TrainingScheduleModel, db)
+
+    with query_counter.count() as statements:
+        schedules = service.bulk_create(_schedules(5))
+        responses = [TrainingSchedule.from_orm(schedule) for schedule in schedules]
+
+    assert len(statements) == 3
+    assert all(statement.startswith("INSERT INTO training_schedules") for statement in statements)
+    assert [response.week_number for response in responses] == [1, 2, 3, 4, 5]
+    assert [response.id for response in responses] == [1, 2, 3, 4, 5]
+    assert all(response.created_at is not None for response in responses)
+
+
+def test_returned_rows_are_matched_to_their_inputs():
+    rows = [{"title": "Week 1", "criteria": {"reps": 10}}, {"title": "Week 2", "criteria": None},
+            {"title": "Week 1", "criteria": {"reps": 10}}]
+    returned = [SimpleNamespace(id=n, **row) for n, row in ((3, rows[2]), (2, rows[1]), (1, rows[0]))]
+
+    matched = _in_input_order(rows, returned)
+
+    assert [(obj.title, obj.criteria) for obj in matched] == [(row["title"], row["criteria"]) for row in rows]
+    assert sorted(obj.id for obj in matched) == [1, 2, 3]
+
+
+def test_bulk_update_and_delete(db):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    db.commit()
+    service = BaseService(TrainingScheduleModel, db)
+    schedules = service.bulk_create(_schedules(4))
+
+    assert service.bulk_update([
+        {"id": 1, "title": "Pre-season"},
+        {"id": 2, "title": "Pre-season"},
+        {"id": 3, "notes": "Cup week"},
+    ]) == 3
+    assert [(s.title, s.notes) for s in schedules[:3]] == [
+        ("Pre-season", None), ("Pre-season", None), ("Week 3", "Cup week"),
+    ]
+
+    # Unknown ids are skipped and left out of the count, as in bulk_delete
+    assert service.bulk_update([{"id": 4, "title": "Off-season"}, {"id": 99, "title": "Off-season"}]) == 1
+    assert schedules[3].title == "Off-season"
+    assert db.query(TrainingScheduleModel).count() == 4
+
+    assert service.bulk_delete([2, 4, 99]) == 2
+    assert [s.id for s in db.query(TrainingScheduleModel).order_by(TrainingScheduleModel.id)] == [1, 3]
@@ -0,0 +1,79 @@
+"""
+Tests for bulk verification of challenge completions.
+"""
+from models import Achievement, Badge, ChallengeCompletion, ChallengeStatus, UserChallengeStatus
+from tests.utils import get_auth_header
+
+
+def test_bulk_verification_reports_each_item(client, db):
+    headers = get_auth_header(client)
+    badge = Badge(name="Juggler", description="", image_url="", criteria="")
+    db.add(badge)
+    db.commit()
+    base = {"description": "", "category": "technical", "difficulty": "beginner", "criteria": {}, "created_by": 1}
+    first = client.post("/api/v2/challenges/", json={**base, "title": "Level 1", "badge_id": badge.id},
+                        headers=headers).json()
+    second = client.post("/api/v2/challenges/", json={**base, "title": "Level 2", "level": 2}, headers=headers).json()
+
+    pending = ChallengeCompletion(user_id=1, challenge_id=first["id"], status=ChallengeStatus.ACTIVE)
+    verified = ChallengeCompletion(user_id=1, challenge_id=second["id"], status=ChallengeStatus.COMPLETED,
+                                   verified_by=1)
+    db.add_all([pending, verified])
+    db.commit()
+
+    response = client.post(
+        "/api/v2/challenges/verify/bulk",
+        json={"completion_ids": [pending.id, verified.id, 999, pending.id], "notes": "Group session"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "verified": 1,
+        "results": [
+            {"completion_id": pending.id, "outcome": "verified", "badge_awarded": True},
+            {"completion_id": verified.id, "outcome": "already_verified", "badge_awarded": False},
+            {"completion_id": 999, "outcome": "not_found", "badge_awarded": False},
+        ],
+    }
+
+    db.expire_all()
+    assert db.query(Achievement).filter_by(user_id=1, badge_id=badge.id).count() == 1
+    assert db.get(ChallengeCompletion, pending.id).notes.endswith("Group session")
+    statuses = {row.challenge_id: row.status for row in db.query(UserChallengeStatus).filter_by(user_id=1)}
+    assert statuses == {first["id"]: "COMPLETED", second["id"]: "AVAILABLE"}
+
+
+def test_bulk_verification_query_count_does_not_grow(client, db, query_counter):
+    headers = get_auth_header(client)
+    base = {"description": "", "category": "technical", "difficulty": "beginner", "criteria": {}, "created_by": 1}
+    challenge_ids = [
+        client.post("/api/v2/challenges/", json={**base, "title": f"Challenge {n}"}, headers=headers).json()["id"]
+        for n in range(8)
+    ]
+    completions = [
+        ChallengeCompletion(user_id=1, challenge_id=challenge_id, status=ChallengeStatus.ACTIVE)
+        for challenge_id in challenge_ids
+    ]
+    db.add_all(completions)
+    db.commit()
+    completion_ids = [completion.id for completion in completions]
+
+    counts = []
+    # The first batch also loads the challenge graph, so compare the later two
+    for batch in (completion_ids[:1], completion_ids[1:3], completion_ids[3:]):
+        with query_counter.count() as statements:
+            response = client.post("/api/v2/challenges/verify/bulk", json={"completion_ids": batch}, headers=headers)
+        assert response.json()["verified"] == len(batch)
+        counts.append(len(statements))
+
+    assert counts[1] == counts[2]
+
+
+def test_bulk_verification_requires_coach(client, db):
+    client.post("/api/v2/auth/register", json={
+        "email": "player@example.com", "password": "password123", "full_name": "Player"
+    })
+    headers = get_auth_header(client, email="player@example.com")
+
+    response = client.post("/api/v2/challenges/verify/bulk", json={"completion_ids": [1]}, headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,74 @@
+"""
+Tests for expiring challenges once their end date has passed.
+"""
+from datetime import datetime, timedelta
+
+from models import Challenge, ChallengeCompletion, ChallengeStatus
+from services.challenge_expiry import ChallengeExpirySweeper, expire_challenges, seconds_until_next_expiry
+from tests.conftest import TestingSessionLocal
+from tests.utils import get_auth_header
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _seed(db):
+    db.add_all([
+        Challenge(title="Ended", description="", category="technical", difficulty="beginner", criteria={}, created_by=1,
+                  end_date=NOW - timedelta(minutes=1)),
+        Challenge(title="Running", description="", category="technical", difficulty="beginner", criteria={}, created_by=1,
+                  end_date=NOW + timedelta(minutes=10)),
+        Challenge(title="Open-ended", description="", category="technical", difficulty="beginner", criteria={}, created_by=1),
+    ])
+    db.add_all([
+        ChallengeCompletion(user_id=1, challenge_id=1, status=ChallengeStatus.ACTIVE),
+        ChallengeCompletion(user_id=2, challenge_id=1, status=ChallengeStatus.COMPLETED),
+        ChallengeCompletion(user_id=1, challenge_id=2, status=ChallengeStatus.ACTIVE),
+    ])
+    db.commit()
+
+
+def test_expire_challenges(db, query_counter):
+    _seed(db)
+
+    with query_counter.count() as statements:
+        assert expire_challenges(db, now=NOW) == [1]
+    # Lookup, one update per table and the reference data bump
+    assert len([s for s in statements if s.lstrip().startswith("UPDATE")]) == 3
+
+    db.expire_all()
+    assert [c.is_active for c in db.query(Challenge).order_by(Challenge.id)] == [False, True, True]
+    assert [c.status for c in db.query(ChallengeCompletion).order_by(ChallengeCompletion.id)] == [
+        ChallengeStatus.EXPIRED, ChallengeStatus.COMPLETED, ChallengeStatus.ACTIVE
+    ]
+    assert expire_challenges(db, now=NOW) == []
+
+
+def test_weekly_templates_are_not_expired(db):
+    db.add(Challenge(title="Weekly", description="", category="technical", difficulty="beginner", criteria={},
+                     created_by=1, is_weekly=True, is_template=True, end_date=NOW - timedelta(days=30)))
+    db.commit()
+
+    assert expire_challenges(db, now=NOW) == []
+    assert seconds_until_next_expiry(db, now=NOW) is None
+    db.expire_all()
+    assert db.query(Challenge).one().is_active is True
+
+
+def test_sweeper_sleeps_until_next_end_date(db, monkeypatch):
+    _seed(db)
+    expire_challenges(db, now=NOW)
+
+    assert seconds_until_next_expiry(db, now=NOW) == 600.0
+    assert seconds_until_next_expiry(db, now=NOW + timedelta(hours=1)) == 0.0
+    # Sleeps are capped so changes made by other workers are noticed
+    monkeypatch.setattr("services.challenge_expiry.settings.REFERENCE_DATA_POLL_SECONDS", 5.0)
+    assert ChallengeExpirySweeper(TestingSessionLocal).sweep() == 5.0
+
+
+def test_active_challenges_exclude_expired(client, db):
+    headers = get_auth_header(client)
+    _seed(db)
+    expire_challenges(db, now=NOW)
+
+    response = client.get("/api/v2/challenges/active", headers=headers)
+    assert [c["title"] for c in response.json()] == ["Running", "Open-ended"]
@@ -0,0 +1,65 @@
+"""
+Tests for the challenge unlock graph.
+"""
+import pytest
+
+from models import ChallengeCompletion, ChallengeStatus, UserChallengeStatus
+from services.challenge_graph import ChallengeGraph, ChallengeNode, ChallengeCycleError
+from tests.utils import get_auth_header
+
+
+def test_levels_and_prerequisites_form_edges():
+    graph = ChallengeGraph([
+        ChallengeNode(1, "technical", 1, None, False),
+        ChallengeNode(2, "technical", 2, None, False),
+        ChallengeNode(3, "technical", 2, None, False),
+        ChallengeNode(4, "technical", 3, 1, False),
+        ChallengeNode(5, "physical", 2, None, False),
+        ChallengeNode(6, "technical", 1, None, True),
+    ])
+
+    assert graph.unlocked_by(1) == (2, 3, 4)
+    assert graph.unlocked_by(2) == ()
+    assert graph.unlocked_by(6) == ()
+    assert graph.topological_order.index(1) < graph.topological_order.index(4)
+
+
+def test_cycle_is_rejected():
+    graph = ChallengeGraph([
+        ChallengeNode(1, "technical", 1, None, False),
+        ChallengeNode(2, "technical", 2, None, False),
+    ])
+
+    with pytest.raises(ChallengeCycleError):
+        graph.with_node(ChallengeNode(1, "technical", 1, 2, False))
+
+
+def test_verify_unlocks_next_level(client, db):
+    headers = get_auth_header(client)
+    base = {"description": "", "category": "technical", "difficulty": "beginner", "criteria": {}, "created_by": 1}
+    first = client.post("/api/v2/challenges/", json={**base, "title": "Level 1"}, headers=headers).json()
+    second = client.post("/api/v2/challenges/", json={**base, "title": "Level 2", "level": 2}, headers=headers).json()
+    other = client.post("/api/v2/challenges/", json={**base, "title": "Other", "level": 2, "category": "physical"},
+                        headers=headers).json()
+
+    completion = ChallengeCompletion(user_id=1, challenge_id=first["id"], status=ChallengeStatus.ACTIVE)
+    db.add(completion)
+    db.commit()
+
+    response = client.patch(f"/api/v2/challenges/verify/{completion.id}", headers=headers)
+    assert response.status_code == 200
+
+    db.expire_all()
+    statuses = {row.challenge_id: row.status for row in db.query(UserChallengeStatus).filter_by(user_id=1)}
+    assert statuses == {first["id"]: "COMPLETED", second["id"]: "AVAILABLE", other["id"]: "LOCKED"}
+
+
+def test_cyclic_prerequisite_is_rejected(client, db):
+    headers = get_auth_header(client)
+    base = {"description": "", "category": "technical", "difficulty": "beginner", "criteria": {}, "created_by": 1}
+    first = client.post("/api/v2/challenges/", json={**base, "title": "Level 1"}, headers=headers).json()
+    client.post("/api/v2/challenges/", json={**base, "title": "Level 2", "level": 2}, headers=headers)
+
+    response = client.put(f"/api/v2/challenges/{first['id']}", json={"prerequisite_id": first["id"] + 1},
+                          headers=headers)
+    assert response.status_code == 400
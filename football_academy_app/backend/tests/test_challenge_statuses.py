@@ -0,0 +1,91 @@
+"""
+Tests for the per-user challenge unlock statuses.
+"""
+from sqlalchemy import event
+
+from models import User, Challenge, UserChallengeStatus
+from services.challenges import ChallengesService
+from tests.utils import get_auth_header
+
+
+def _challenge(**overrides):
+    data = {
+        "title": "Juggling", "description": "Keep it up", "category": "technical",
+        "difficulty": "beginner", "criteria": {}, "created_by": 1
+    }
+    data.update(overrides)
+    return data
+
+
+def _statuses(db, **filters):
+    query = db.query(UserChallengeStatus).filter_by(**filters)
+    return {(row.user_id, row.challenge_id): row.status for row in query}
+
+
+def test_registration_initializes_statuses(client, db):
+    db.add_all([
+        Challenge(title="Level 1", description="", category="technical", difficulty="beginner", criteria={}, level=1),
+        Challenge(title="Level 2", description="", category="technical", difficulty="beginner", criteria={}, level=2),
+        Challenge(title="Weekly", description="", category="physical", difficulty="beginner", criteria={},
+                  level=3, is_weekly=True),
+    ])
+    db.commit()
+
+    get_auth_header(client)
+    user = db.query(User).filter(User.email == "test@example.com").first()
+
+    assert _statuses(db, user_id=user.user_id) == {
+        (user.user_id, 1): "AVAILABLE",
+        (user.user_id, 2): "LOCKED",
+        (user.user_id, 3): "AVAILABLE",
+    }
+
+
+def test_new_challenge_initializes_statuses_for_every_user(client, db, query_counter):
+    headers = get_auth_header(client)
+    db.add_all([User(email=f"player{n}@example.com", hashed_password="x", full_name=f"Player {n}") for n in range(20)])
+    db.commit()
+
+    commits = []
+    record_commit = commits.append
+    engine = db.get_bind()
+    event.listen(engine, "commit", record_commit)
+    try:
+        with query_counter.count() as statements:
+            response = client.post("/api/v2/challenges/", json=_challenge(level=2), headers=headers)
+    finally:
+        event.remove(engine, "commit", record_commit)
+    assert response.status_code == 200
+    challenge_id = response.json()["id"]
+    # The challenge, its statuses and the reference data bump are one transaction
+    assert len(commits) == 1
+
+    statuses = _statuses(db, challenge_id=challenge_id)
+    assert len(statuses) == 21
+    assert set(statuses.values()) == {"LOCKED"}
+    # All users are initialized by one set-based statement
+    assert len([s for s in statements if "user_challenge_statuses" in s and s.lstrip().startswith("INSERT")]) == 1
+
+
+def test_initialization_is_idempotent(client, db):
+    headers = get_auth_header(client)
+    client.post("/api/v2/challenges/", json=_challenge(), headers=headers)
+    service = ChallengesService(db)
+
+    assert service.initialize_statuses_for_user(1) == 0
+    response = client.post("/api/v2/challenges/initialize-status", headers=headers)
+    assert response.status_code == 201
+    assert response.json()["detail"] == "Initialized 0 challenge statuses"
+
+
+def test_prerequisite_keeps_level_one_challenge_locked(client, db):
+    headers = get_auth_header(client)
+    first = client.post("/api/v2/challenges/", json=_challenge(), headers=headers).json()
+    client.post("/api/v2/challenges/", json=_challenge(title="Follow-up", prerequisite_id=first["id"]), headers=headers)
+
+    response = client.get("/api/v2/challenges/with-status", headers=headers)
+    assert response.status_code == 200
+    assert [(c["title"], c["status"]) for c in response.json()] == [
+        ("Juggling", "AVAILABLE"),
+        ("Follow-up", "LOCKED"),
+    ]
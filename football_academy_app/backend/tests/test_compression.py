@@ -0,0 +1,89 @@
+"""
+Tests for response compression and the precompressed static files.
+"""
+import os
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from middleware.compression import PrecompressedStaticFiles, choose_encoding
+from tests.utils import get_auth_header
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("gzip;q=0, *") is None
+
+
+def test_wildcard_does_not_override_refusals(monkeypatch):
+    # Pretend brotli is installed
+    monkeypatch.setattr("middleware.compression.brotli", object())
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("br;q=0, *") == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0, *") is None
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+
+
+def test_large_json_responses_are_compressed(client):
+    headers = get_auth_header(client)
+    for n in range(15):
+        client.post("/api/v2/challenges/", headers=headers, json={
+            "title": f"Challenge {n}", "description": "Keep the ball up as long as you can",
+            "category": "technical", "difficulty": "beginner", "criteria": {}, "created_by": 1
+        })
+
+    response = client.get("/api/v2/challenges/", headers={**headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert len(response.json()) == 15
+
+    # Under the size threshold, or not asked for
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    response = client.get("/api/v2/challenges/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert len(response.json()) == 15
+
+
+def test_static_files_served_precompressed(client):
+    plain = client.get("/static/index.html", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["cache-control"] == "no-cache"
+
+    response = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert int(response.headers["content-length"]) < len(plain.content)
+    assert response.content == plain.content
+
+    revalidated = client.get("/static/index.html", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]
+    })
+    assert revalidated.status_code == 304
+
+
+def test_static_files_are_compressed_on_first_request(tmp_path):
+    page = tmp_path / "app.js"
+    page.write_text("console.log('first');\n" * 100)
+    static = PrecompressedStaticFiles(directory=str(tmp_path))
+    assert static.precompressed == {}
+
+    client = TestClient(Starlette())
+    client.app.mount("/static", static)
+    first = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert list(static.precompressed) == [os.path.realpath(page)]
+
+    # Editing the file builds a fresh variant instead of serving the stale one
+    page.write_text("console.log('second');\n" * 100)
+    os.utime(page, (0, 1))
+    second = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+    assert second.text == page.read_text()
+    assert second.headers["etag"] != first.headers["etag"]
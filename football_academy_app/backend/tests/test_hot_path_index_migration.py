@@ -0,0 +1,93 @@
+"""
+Tests for the hot path index migration on a database that already holds the
+duplicate rows its unique indexes forbid.
+"""
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+
+from database import Base
+
+MIGRATION = (Path(__file__).resolve().parent.parent
+             / "alembic" / "versions" / "5b8f2c9d7e41_add_hot_path_indexes.py")
+
+UNIQUE_INDEXES = {
+    "uq_challenge_completions_user_challenge": "challenge_completions",
+    "uq_achievements_user_badge": "achievements",
+    "uq_training_schedules_user_year_week": "training_schedules",
+}
+
+
+def _load_migration():
+    spec = importlib.util.spec_from_file_location("hot_path_index_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def _rows(connection, sql):
+    return [tuple(row) for row in connection.execute(text(sql))]
+
+
+def test_upgrade_removes_duplicates_before_unique_indexes():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        Base.metadata.create_all(connection)
+        # A database created before the migration, without the unique indexes
+        for name in UNIQUE_INDEXES:
+            connection.execute(text(f"DROP INDEX {name}"))
+        connection.execute(text(
+            "INSERT INTO challenge_completions (id, user_id, challenge_id, status, progress, verified_by) VALUES "
+            "(1, 1, 1, 'ACTIVE', 5, NULL), (2, 1, 1, 'COMPLETED', 20, NULL), (3, 2, 1, 'ACTIVE', 0, NULL), "
+            "(4, 1, 1, 'ACTIVE', 30, NULL), (5, NULL, 1, 'ACTIVE', 0, NULL), (6, NULL, 1, 'ACTIVE', 0, NULL), "
+            "(7, 2, 2, 'ACTIVE', 5, NULL), (8, 2, 2, 'ACTIVE', 9, NULL), "
+            "(9, 3, 1, 'ACTIVE', 50, NULL), (10, 3, 1, 'ACTIVE', 10, 2)"
+        ))
+        connection.execute(text(
+            "INSERT INTO challenge_results (id, completion_id, result_value, submitted_at) VALUES "
+            "(1, 1, 10.0, '2026-01-01'), (2, 2, 20.0, '2026-01-02'), "
+            "(3, 3, 30.0, '2026-01-03'), (4, 4, 40.0, '2026-01-04')"
+        ))
+        connection.execute(text(
+            "INSERT INTO achievements (id, user_id, badge_id) VALUES (1, 1, 1), (2, 1, 1), (3, 1, 2)"
+        ))
+        connection.execute(text(
+            "INSERT INTO training_schedules (id, user_id, year, week_number, title) VALUES "
+            "(1, 1, 2026, 42, 'Week 42'), (2, 1, 2026, 42, 'Week 42 again'), (3, 1, 2026, 43, 'Week 43')"
+        ))
+        connection.execute(text(
+            "INSERT INTO training_sessions (id, schedule_id, session_date, title, start_time, end_time) VALUES "
+            "(1, 1, '2026-10-12', 'Passing', '17:00', '18:00'), "
+            "(2, 2, '2026-10-14', 'Shooting', '17:00', '18:00'), "
+            "(3, 3, '2026-10-19', 'Dribbling', '17:00', '18:00')"
+        ))
+
+        migration = _load_migration()
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+        indexes = {
+            index["name"]: index["unique"]
+            for table in set(UNIQUE_INDEXES.values())
+            for index in inspect(connection).get_indexes(table)
+        }
+        assert all(indexes[name] for name in UNIQUE_INDEXES)
+
+        # The completed or verified completion is kept over active ones, then the
+        # one with the most progress, and its duplicates' results move to it;
+        # completions without a user are not duplicates of each other
+        assert _rows(connection, "SELECT id FROM challenge_completions ORDER BY id") == [
+            (2,), (3,), (5,), (6,), (8,), (10,)
+        ]
+        assert _rows(connection, "SELECT id, completion_id FROM challenge_results ORDER BY id") == [
+            (1, 2), (2, 2), (3, 3), (4, 2)
+        ]
+        # The oldest achievement and schedule are kept
+        assert _rows(connection, "SELECT id FROM achievements ORDER BY id") == [(1,), (3,)]
+        assert _rows(connection, "SELECT id FROM training_schedules ORDER BY id") == [(1,), (3,)]
+        assert _rows(connection, "SELECT id, schedule_id FROM training_sessions ORDER BY id") == [
+            (1, 1), (2, 1), (3, 3)
+        ]
@@ -0,0 +1,134 @@
+"""
+Tests for Idempotency-Key replay of retried writes.
+"""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+from middleware import IdempotencyMiddleware, IdempotencyStore
+from models import ChallengeResult
+from tests.utils import get_auth_header
+
+
+def _setup(client):
+    headers = get_auth_header(client)
+    challenge = client.post("/api/v2/challenges/", headers=headers, json={
+        "title": "Juggling", "description": "", "category": "technical", "difficulty": "beginner",
+        "criteria": {}, "created_by": 1
+    }).json()
+    return headers, f"/api/v2/challenges/submit-result/{challenge['id']}"
+
+
+def test_retried_submission_is_replayed(client, db):
+    headers, url = _setup(client)
+    retry_headers = {**headers, "Idempotency-Key": "a1b2c3"}
+
+    first = client.patch(url, params={"result_value": 12}, headers=retry_headers)
+    retry = client.patch(url, params={"result_value": 12}, headers=retry_headers)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert db.query(ChallengeResult).count() == 1
+
+    # A new key is a new submission
+    client.patch(url, params={"result_value": 12}, headers={**headers, "Idempotency-Key": "d4e5f6"})
+    assert db.query(ChallengeResult).count() == 2
+
+
+def test_key_reused_for_different_request_is_rejected(client, db):
+    headers, url = _setup(client)
+    retry_headers = {**headers, "Idempotency-Key": "a1b2c3"}
+
+    client.patch(url, params={"result_value": 12}, headers=retry_headers)
+    response = client.patch(url, params={"result_value": 13}, headers=retry_headers)
+
+    assert response.status_code == 422
+    assert db.query(ChallengeResult).count() == 1
+
+
+def test_client_errors_are_replayed(client, db):
+    headers, _ = _setup(client)
+    retry_headers = {**headers, "Idempotency-Key": "a1b2c3"}
+
+    missing = client.patch("/api/v2/challenges/submit-result/999", params={"result_value": 1}, headers=retry_headers)
+    assert missing.status_code == 404
+    # Client errors are final, so the 404 is replayed rather than re-run
+    replay = client.patch("/api/v2/challenges/submit-result/999", params={"result_value": 1}, headers=retry_headers)
+    assert replay.headers["idempotent-replayed"] == "true"
+
+
+def test_server_errors_are_not_stored():
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=IdempotencyStore(ttl_seconds=60, max_entries=10))
+    calls = []
+
+    @app.post("/flaky")
+    async def flaky():
+        calls.append(1)
+        return JSONResponse(status_code=503 if len(calls) == 1 else 201, content={"attempt": len(calls)})
+
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer token", "Idempotency-Key": "a1b2c3"}
+    assert client.post("/flaky", headers=headers).status_code == 503
+    assert client.post("/flaky", headers=headers).json() == {"attempt": 2}
+    assert client.post("/flaky", headers=headers).json() == {"attempt": 2}
+    assert len(calls) == 2
+
+
+def test_anonymous_requests_are_not_replayed():
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=IdempotencyStore(ttl_seconds=60, max_entries=10))
+    calls = []
+
+    @app.post("/echo")
+    async def echo():
+        calls.append(1)
+        return {"attempt": len(calls)}
+
+    client = TestClient(app)
+    # Without an Authorization header two callers would share one key space
+    first = client.post("/echo", headers={"Idempotency-Key": "a1b2c3"})
+    second = client.post("/echo", headers={"Idempotency-Key": "a1b2c3"})
+    assert (first.json(), second.json()) == ({"attempt": 1}, {"attempt": 2})
+    assert "idempotent-replayed" not in second.headers
+
+
+def test_one_waiter_retries_a_failed_attempt():
+    release = asyncio.Event()
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(1)
+        if len(calls) == 1:
+            await release.wait()
+        status = 503 if len(calls) == 1 else 201
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": str(len(calls)).encode()})
+
+    middleware = IdempotencyMiddleware(app, store=IdempotencyStore(ttl_seconds=60, max_entries=10))
+    scope = {"type": "http", "method": "POST", "path": "/flaky", "query_string": b"",
+             "headers": [(b"authorization", b"Bearer token"), (b"idempotency-key", b"a1b2c3")]}
+
+    async def request():
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+        await middleware(scope, receive, send)
+        return messages[0]["status"], messages[1]["body"]
+
+    async def run():
+        requests = [asyncio.ensure_future(request()) for _ in range(4)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*requests)
+
+    responses = asyncio.run(run())
+    # The first attempt fails; one waiter runs it again and the rest replay that
+    assert responses == [(503, b"1")] + [(201, b"2")] * 3
+    assert len(calls) == 2
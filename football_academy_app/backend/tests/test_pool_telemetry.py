@@ -0,0 +1,67 @@
+"""
+Tests for the connection pool instrumentation.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+import database
+from database import create_async_database_engine, create_database_engine
+from pool_telemetry import PoolTelemetry, instrumented_pool_class
+from tests.utils import get_auth_header
+
+
+def test_checkouts_overflow_and_invalidations(tmp_path):
+    telemetry = PoolTelemetry("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, telemetry),
+        pool_size=1, max_overflow=1, pool_timeout=0.05
+    )
+    telemetry.listen(engine)
+
+    first, second = engine.connect(), engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    snapshot = telemetry.snapshot(engine.pool)
+    assert (snapshot["checkouts"], snapshot["overflow_checkouts"], snapshot["checkout_timeouts"]) == (2, 1, 1)
+    assert (snapshot["size"], snapshot["checked_out"], snapshot["overflow"], snapshot["peak_overflow"]) == (1, 2, 1, 1)
+
+    first.invalidate()
+    first.close()
+    second.close()
+    # Recreating the pool keeps the instrumentation
+    engine.dispose()
+    engine.connect().close()
+    snapshot = telemetry.snapshot(engine.pool)
+    assert (snapshot["checkouts"], snapshot["invalidations"], snapshot["connects"]) == (3, 1, 3)
+    assert snapshot["checkout_max_ms"] >= snapshot["checkout_p95_ms"] > 0
+
+
+def test_debug_pool(client, tmp_path, monkeypatch):
+    assert client.get("/debug/pool").status_code == 401
+    headers = get_auth_header(client)
+
+    # No engine has been used yet, and the view does not create one
+    monkeypatch.setattr(database, "_engines", {})
+    response = client.get("/debug/pool", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {}
+    assert database._engines == {}
+
+    telemetry = {"sync": PoolTelemetry("sync"), "async": PoolTelemetry("async")}
+    monkeypatch.setattr(database, "pool_telemetry", telemetry)
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_database_engine(url, telemetry["sync"])
+    monkeypatch.setattr(database, "_engines", {
+        "engine": engine, "async_engine": create_async_database_engine(url, telemetry["async"])
+    })
+    engine.connect().close()
+
+    response = client.get("/debug/pool", headers=headers)
+    assert response.status_code == 200
+    assert set(response.json()) == {"sync", "async"}
+    assert {"checkouts", "checkout_p95_ms", "overflow_checkouts", "invalidations"} <= set(response.json()["sync"])
+    assert response.json()["sync"]["checkouts"] == 1
+    assert response.json()["async"]["checkouts"] == 0
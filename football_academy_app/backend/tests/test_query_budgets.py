@@ -0,0 +1,287 @@
+"""
+Query-count regression tests.
+
+Every endpoint of the budgeted routers has an entry in tests/query_budgets/.
+Each test seeds a small academy, issues one request and fails when the number
+of SQL statements exceeds the endpoint's budget, which catches reintroduced
+N+1 patterns (a budget that grows with the number of rows).
+"""
+import pytest
+from datetime import datetime, date, time, timedelta
+
+from models import (
+    User, Badge, Challenge, ChallengeCompletion, ChallengeResult, Achievement,
+    PlayerTest, TrainingSchedule, TrainingSession, DevelopmentPlan, FocusArea
+)
+from models.challenges import ChallengeStatus
+from services.reference_data import get_reference_data
+from services.weekly_challenges import week_start
+from routers import auth, challenges, league_table, training_schedules, development_plans, skill_tests
+from tests.query_budget import load_budgets, assert_within_budget
+from tests.utils import get_auth_header
+
+API = "/api/v2"
+ROUTERS = {
+    "auth": auth,
+    "challenges": challenges,
+    "league_table": league_table,
+    "training_schedules": training_schedules,
+    "development_plans": development_plans,
+    "skill_tests": skill_tests,
+}
+# Several rows per parent so a per-row query shows up as a budget overrun
+ROWS = 5
+
+
+@pytest.fixture(scope="function")
+def academy(client, db):
+    """Register a coach through the API and seed rows for every budgeted endpoint."""
+    headers = get_auth_header(client)
+    user = db.query(User).filter(User.email == "test@example.com").first()
+    player = User(email="player@example.com", hashed_password="x", full_name="Player", position="striker")
+    db.add(player)
+
+    badges = [Badge(name=f"Badge {n}", description="", image_url="", criteria="") for n in range(ROWS)]
+    db.add_all(badges)
+    db.flush()
+
+    challenge_rows = [
+        Challenge(
+            title=f"Challenge {n}", description="", category="technical", difficulty="beginner",
+            criteria={}, created_by=user.user_id, badge_id=badges[n].id,
+            end_date=datetime.utcnow() + timedelta(days=7)
+        )
+        for n in range(ROWS)
+    ]
+    db.add_all(challenge_rows)
+    db.flush()
+
+    # A weekly template and last week's challenge cloned from it
+    template = Challenge(title="Weekly", description="", category="technical", difficulty="beginner", criteria={},
+                         created_by=user.user_id, is_weekly=True, is_template=True)
+    db.add(template)
+    db.flush()
+    last_week = week_start(datetime.utcnow()) - timedelta(days=7)
+    db.add(Challenge(title="Weekly", description="", category="technical", difficulty="beginner", criteria={},
+                     created_by=user.user_id, is_weekly=True, template_id=template.id,
+                     start_date=last_week, end_date=last_week + timedelta(days=7)))
+
+    # A challenge nobody has opted into yet, for the opt-in endpoints
+    unstarted = Challenge(title="Unstarted", description="", category="technical", difficulty="beginner",
+                          criteria={}, created_by=user.user_id, end_date=datetime.utcnow() + timedelta(days=7))
+    db.add(unstarted)
+    db.flush()
+
+    completions = []
+    for challenge in challenge_rows:
+        for owner in (user, player):
+            completion = ChallengeCompletion(
+                user_id=owner.user_id, challenge_id=challenge.id, status=ChallengeStatus.ACTIVE, progress=0.0
+            )
+            completion.results = [ChallengeResult(result_value=float(n)) for n in range(ROWS)]
+            completions.append(completion)
+    db.add_all(completions)
+    db.add_all([Achievement(user_id=user.user_id, badge_id=badge.id) for badge in badges])
+
+    plan = DevelopmentPlan(title="Plan", long_term_goals="Goals", user_id=user.user_id)
+    plan.focus_areas = [FocusArea(title=f"Focus {n}", description="") for n in range(ROWS)]
+    db.add(plan)
+    db.flush()
+
+    schedules = []
+    for week in range(1, ROWS + 1):
+        schedule = TrainingSchedule(user_id=user.user_id, week_number=week, year=2025, title=f"Week {week}",
+                                    development_plan_id=plan.id)
+        schedule.training_sessions = [
+            TrainingSession(day_of_week=day, session_date=date(2025, 1, day), title="Session",
+                            start_time=time(16, 0), end_time=time(17, 30),
+                            focus_area_id=plan.focus_areas[day % ROWS].id)
+            for day in range(1, ROWS + 1)
+        ]
+        schedules.append(schedule)
+    db.add_all(schedules)
+
+    tests = [PlayerTest(player_id=user.user_id, recorded_by=user.user_id, pace=5.0, pace_rating=80)
+             for _ in range(ROWS)]
+    db.add_all(tests)
+    db.commit()
+
+    return {
+        "headers": headers,
+        "user_id": user.user_id,
+        "player_id": player.user_id,
+        "challenge_id": challenge_rows[0].id,
+        "unstarted_challenge_id": unstarted.id,
+        "completion_id": completions[0].id,
+        "plan_id": plan.id,
+        "focus_area_id": plan.focus_areas[0].id,
+        "schedule_id": schedules[0].id,
+        "session_id": schedules[0].training_sessions[0].id,
+        "test_id": tests[0].id,
+    }
+
+
+def _challenge_body(ids):
+    return {
+        "title": "New challenge", "description": "", "category": "technical", "difficulty": "beginner",
+        "criteria": {}, "created_by": ids["user_id"]
+    }
+
+
+def _session_body(ids):
+    return {
+        "schedule_id": ids["schedule_id"], "day_of_week": 1, "session_date": "2025-01-06", "title": "Session",
+        "start_time": "16:00:00", "end_time": "17:30:00"
+    }
+
+
+# How to call each budgeted endpoint: key -> ids -> (method, path, request kwargs)
+REQUESTS = {
+    # auth
+    "POST /auth/register": lambda ids: ("POST", "/auth/register", {"json": {
+        "email": "new@example.com", "password": "password123", "full_name": "New Player"}}),
+    "POST /auth/token": lambda ids: ("POST", "/auth/token", {"data": {
+        "username": "test@example.com", "password": "password123"}}),
+    "POST /auth/login": lambda ids: ("POST", "/auth/login", {"data": {
+        "username": "test@example.com", "password": "password123"}}),
+    "GET /auth/me": lambda ids: ("GET", "/auth/me", {}),
+    "PUT /auth/me": lambda ids: ("PUT", "/auth/me", {"json": {"current_club": "Academy FC"}}),
+    "DELETE /auth/me": lambda ids: ("DELETE", "/auth/me", {}),
+    # challenges
+    "POST /challenges/": lambda ids: ("POST", "/challenges/", {"json": _challenge_body(ids)}),
+    "GET /challenges/": lambda ids: ("GET", "/challenges/", {}),
+    "GET /challenges/active": lambda ids: ("GET", "/challenges/active", {}),
+    "GET /challenges/weekly/current": lambda ids: ("GET", "/challenges/weekly/current", {}),
+    "POST /challenges/weekly/rollover": lambda ids: ("POST", "/challenges/weekly/rollover", {}),
+    "GET /challenges/{challenge_id}": lambda ids: ("GET", f"/challenges/{ids['challenge_id']}", {}),
+    "PUT /challenges/{challenge_id}": lambda ids: ("PUT", f"/challenges/{ids['challenge_id']}", {"json": {"points": 150}}),
+    "DELETE /challenges/{challenge_id}": lambda ids: ("DELETE", f"/challenges/{ids['challenge_id'] + ROWS - 1}", {}),
+    "GET /challenges/with-status": lambda ids: ("GET", "/challenges/with-status", {}),
+    "POST /challenges/initialize-status": lambda ids: ("POST", "/challenges/initialize-status", {}),
+    "POST /challenges/completion": lambda ids: ("POST", "/challenges/completion", {"json": {
+        "user_id": ids["user_id"], "challenge_id": ids["unstarted_challenge_id"]}}),
+    "POST /challenges/opt-in/{challenge_id}": lambda ids: ("POST", f"/challenges/opt-in/{ids['challenge_id']}", {}),
+    "GET /challenges/user/{challenge_id}": lambda ids: ("GET", f"/challenges/user/{ids['challenge_id']}", {}),
+    "GET /challenges/user": lambda ids: ("GET", "/challenges/user", {}),
+    "PATCH /challenges/submit-result/{challenge_id}": lambda ids: (
+        "PATCH", f"/challenges/submit-result/{ids['challenge_id']}", {"params": {"result_value": 42}}),
+    "PATCH /challenges/verify/{completion_id}": lambda ids: ("PATCH", f"/challenges/verify/{ids['completion_id']}", {}),
+    "POST /challenges/verify/bulk": lambda ids: ("POST", "/challenges/verify/bulk", {"json": {
+        "completion_ids": list(range(ids["completion_id"], ids["completion_id"] + 2 * ROWS))}}),
+    "GET /challenges/badges": lambda ids: ("GET", "/challenges/badges", {}),
+    "GET /challenges/badge-stats": lambda ids: ("GET", "/challenges/badge-stats", {}),
+    "GET /challenges/achievements": lambda ids: ("GET", "/challenges/achievements", {}),
+    "GET /challenges/results/{completion_id}": lambda ids: ("GET", f"/challenges/results/{ids['completion_id']}", {}),
+    # league table
+    "GET /league-table/": lambda ids: ("GET", "/league-table/", {}),
+    "GET /league-table/challenge/{challenge_id}": lambda ids: ("GET", f"/league-table/challenge/{ids['challenge_id']}", {}),
+    # training schedules
+    "GET /training-schedules/": lambda ids: ("GET", "/training-schedules/", {}),
+    "GET /training-schedules/user/{user_id}": lambda ids: ("GET", f"/training-schedules/user/{ids['user_id']}", {}),
+    "GET /training-schedules/week": lambda ids: ("GET", "/training-schedules/week", {"params": {
+        "user_id": ids["user_id"], "week": 1, "year": 2025}}),
+    "GET /training-schedules/calendar": lambda ids: ("GET", "/training-schedules/calendar", {"params": {
+        "user_id": ids["user_id"], "from": "2024-12-30", "to": "2025-02-02"}}),
+    "GET /training-schedules/{schedule_id}": lambda ids: ("GET", f"/training-schedules/{ids['schedule_id']}", {}),
+    "POST /training-schedules/": lambda ids: ("POST", "/training-schedules/", {"json": {
+        "user_id": ids["user_id"], "week_number": 40, "year": 2025, "title": "Week 40"}}),
+    "PUT /training-schedules/{schedule_id}": lambda ids: ("PUT", f"/training-schedules/{ids['schedule_id']}", {"json": {
+        "week_number": 1, "year": 2025, "title": "Renamed"}}),
+    "DELETE /training-schedules/{schedule_id}": lambda ids: ("DELETE", f"/training-schedules/{ids['schedule_id']}", {}),
+    "GET /training-schedules/{schedule_id}/sessions": lambda ids: (
+        "GET", f"/training-schedules/{ids['schedule_id']}/sessions", {}),
+    "GET /training-schedules/sessions/{session_id}": lambda ids: (
+        "GET", f"/training-schedules/sessions/{ids['session_id']}", {}),
+    "POST /training-schedules/sessions": lambda ids: ("POST", "/training-schedules/sessions", {"json": _session_body(ids)}),
+    "POST /training-schedules/sessions/recurring": lambda ids: ("POST", "/training-schedules/sessions/recurring", {"json": {
+        "user_id": ids["user_id"], "days_of_week": [2, 4], "start_date": "2025-01-01", "until": "2025-03-31",
+        "title": "Session", "start_time": "16:00:00", "end_time": "17:30:00"}}),
+    "PUT /training-schedules/sessions/{session_id}": lambda ids: (
+        "PUT", f"/training-schedules/sessions/{ids['session_id']}", {"json": _session_body(ids)}),
+    "DELETE /training-schedules/sessions/{session_id}": lambda ids: (
+        "DELETE", f"/training-schedules/sessions/{ids['session_id']}", {}),
+    "POST /training-schedules/sessions/{session_id}/reflection": lambda ids: (
+        "POST", f"/training-schedules/sessions/{ids['session_id']}/reflection", {"json": {"reflection_text": "Good"}}),
+    # development plans and their focus areas
+    "GET /development-plans/": lambda ids: ("GET", "/development-plans/", {}),
+    "GET /development-plans/{plan_id}": lambda ids: ("GET", f"/development-plans/{ids['plan_id']}", {}),
+    "GET /development-plans/user/{user_id}": lambda ids: ("GET", f"/development-plans/user/{ids['user_id']}", {}),
+    "POST /development-plans/": lambda ids: ("POST", "/development-plans/", {"json": {
+        "title": "Plan", "long_term_goals": "Goals", "user_id": ids["user_id"]}}),
+    "PUT /development-plans/{plan_id}": lambda ids: ("PUT", f"/development-plans/{ids['plan_id']}", {"json": {
+        "title": "Renamed", "long_term_goals": "Goals", "user_id": ids["user_id"]}}),
+    "DELETE /development-plans/{plan_id}": lambda ids: ("DELETE", f"/development-plans/{ids['plan_id']}", {}),
+    "GET /development-plans/{development_plan_id}/focus-areas/": lambda ids: (
+        "GET", f"/development-plans/{ids['plan_id']}/focus-areas/", {}),
+    "GET /development-plans/{development_plan_id}/focus-areas/{focus_area_id}": lambda ids: (
+        "GET", f"/development-plans/{ids['plan_id']}/focus-areas/{ids['focus_area_id']}", {}),
+    "POST /development-plans/{development_plan_id}/focus-areas/": lambda ids: (
+        "POST", f"/development-plans/{ids['plan_id']}/focus-areas/", {"json": {
+            "title": "Focus", "description": "", "development_plan_id": ids["plan_id"]}}),
+    "PUT /development-plans/{development_plan_id}/focus-areas/{focus_area_id}": lambda ids: (
+        "PUT", f"/development-plans/{ids['plan_id']}/focus-areas/{ids['focus_area_id']}", {"json": {
+            "title": "Renamed", "description": ""}}),
+    "PATCH /development-plans/{development_plan_id}/focus-areas/{focus_area_id}/status": lambda ids: (
+        "PATCH", f"/development-plans/{ids['plan_id']}/focus-areas/{ids['focus_area_id']}/status",
+        {"params": {"status": "completed"}}),
+    "DELETE /development-plans/{development_plan_id}/focus-areas/{focus_area_id}": lambda ids: (
+        "DELETE", f"/development-plans/{ids['plan_id']}/focus-areas/{ids['focus_area_id']}", {}),
+    # skill tests
+    "POST /skill-tests/player-tests": lambda ids: ("POST", "/skill-tests/player-tests", {"json": {
+        "player_id": ids["user_id"], "pace": 5.0, "shooting": 7, "passing": 8, "dribbling": 12.0,
+        "juggles": 50, "first_touch": 7}}),
+    "GET /skill-tests/player-tests/player/{player_id}": lambda ids: (
+        "GET", f"/skill-tests/player-tests/player/{ids['user_id']}", {}),
+    "DELETE /skill-tests/player-tests/{test_id}": lambda ids: ("DELETE", f"/skill-tests/player-tests/{ids['test_id']}", {}),
+}
+
+# Success status of the endpoints that do not answer 200 OK
+EXPECTED_STATUS = {
+    "POST /auth/register": 201,
+    "DELETE /auth/me": 204,
+    "POST /challenges/initialize-status": 201,
+    "POST /training-schedules/": 201,
+    "DELETE /training-schedules/{schedule_id}": 204,
+    "POST /training-schedules/sessions": 201,
+    "POST /training-schedules/sessions/recurring": 201,
+    "DELETE /training-schedules/sessions/{session_id}": 204,
+    "POST /development-plans/": 201,
+    "DELETE /development-plans/{plan_id}": 204,
+    "POST /development-plans/{development_plan_id}/focus-areas/": 201,
+    "DELETE /development-plans/{development_plan_id}/focus-areas/{focus_area_id}": 204,
+}
+
+
+def _route_keys(module):
+    for route in module.router.routes:
+        for method in sorted(route.methods):
+            yield f"{method} {route.path_format}"
+
+
+def _budget_cases():
+    for name in ROUTERS:
+        for key, budget in load_budgets(name).items():
+            yield pytest.param(key, budget, id=key)
+
+
+@pytest.mark.parametrize("name", list(ROUTERS))
+def test_every_endpoint_has_a_budget(name):
+    budgets = load_budgets(name)
+    missing = [key for key in _route_keys(ROUTERS[name]) if key not in budgets]
+    assert not missing, f"Add query budgets for {missing} to tests/query_budgets/{name}.json"
+
+
+@pytest.mark.parametrize("key,budget", list(_budget_cases()))
+def test_endpoint_query_budget(client, db, academy, query_counter, key, budget):
+    if "skip" in budget:
+        pytest.skip(budget["skip"])
+
+    method, path, kwargs = REQUESTS[key](academy)
+    get_reference_data(db)
+    with query_counter.count() as statements:
+        response = client.request(method, f"{API}{path}", headers=academy["headers"], **kwargs)
+
+    # A budget measured on an error response would not cover the endpoint's real work
+    expected = EXPECTED_STATUS.get(key, 200)
+    assert response.status_code == expected, f"{key} answered {response.status_code}: {response.text}"
+    assert_within_budget(key, budget, statements)
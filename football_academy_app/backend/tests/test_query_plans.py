@@ -0,0 +1,184 @@
+"""
+EXPLAIN-based checks that the hot queries in the routers are served by indexes.
+
+Each test seeds a small academy, records the SELECTs a router endpoint or the
+service method it calls issues, replays them through EXPLAIN and fails if a
+plan reads a whole table instead of seeking an index.
+"""
+import pytest
+from datetime import datetime, timedelta, date, time
+from sqlalchemy import insert, text
+
+from models import (
+    User, Challenge, ChallengeCompletion, ChallengeResult, Badge, Achievement,
+    PlayerTest, TrainingSchedule, TrainingSession, ChallengeEntry
+)
+from models.challenges import ChallengeStatus
+from services.auth import get_pwd_context
+from services.league_table import LeagueTableService
+from services.training_schedules import TrainingScheduleService
+from tests.utils import explain_sql, find_full_scans, get_auth_header
+
+HOT_TABLES = {
+    "challenge_completions", "challenge_results", "achievements", "player_tests",
+    "training_schedules", "training_sessions", "challenge_entries",
+}
+
+PLAYERS = 50
+CHALLENGES = 10
+WEEKS = 8
+# The player the endpoint tests sign in as; a coach, so verification is allowed
+PLAYER = 7
+
+
+@pytest.fixture(scope="function")
+def seeded_db(db):
+    """Seed enough rows for the planner to prefer indexes over scans."""
+    now = datetime.utcnow()
+    db.execute(insert(User), [
+        {"user_id": i, "email": f"player{i}@example.com", "hashed_password": "x", "full_name": f"Player {i}"}
+        for i in range(1, PLAYERS + 1) if i != PLAYER
+    ])
+    db.add(User(user_id=PLAYER, email="test@example.com", hashed_password=get_pwd_context().hash("password123"),
+                full_name=f"Player {PLAYER}", is_coach=True, role="coach"))
+    db.execute(insert(Badge), [
+        {"id": i, "name": f"Badge {i}", "description": "", "image_url": "", "criteria": ""}
+        for i in range(1, CHALLENGES + 1)
+    ])
+    db.execute(insert(Challenge), [
+        {"id": i, "title": f"Challenge {i}", "description": "", "category": "technical",
+         "difficulty": "beginner", "criteria": {}, "badge_id": i, "created_by": PLAYER}
+        for i in range(1, CHALLENGES + 1)
+    ])
+    completions = [
+        {"id": (user - 1) * CHALLENGES + challenge, "user_id": user, "challenge_id": challenge,
+         "status": ChallengeStatus.ACTIVE, "progress": 0.0}
+        for user in range(1, PLAYERS + 1) for challenge in range(1, CHALLENGES + 1)
+    ]
+    db.execute(insert(ChallengeCompletion), completions)
+    db.execute(insert(ChallengeResult), [
+        {"completion_id": completion["id"], "result_value": float(n), "submitted_at": now - timedelta(days=n)}
+        for completion in completions for n in range(3)
+    ])
+    db.execute(insert(Achievement), [
+        {"user_id": user, "badge_id": badge}
+        for user in range(1, PLAYERS + 1) for badge in range(1, 4)
+    ])
+    db.execute(insert(PlayerTest), [
+        {"player_id": user, "test_date": now - timedelta(days=30 * n), "pace": 5.0}
+        for user in range(1, PLAYERS + 1) for n in range(6)
+    ])
+    db.execute(insert(TrainingSchedule), [
+        {"id": (user - 1) * WEEKS + week, "user_id": user, "week_number": week, "year": 2025,
+         "title": f"Week {week}"}
+        for user in range(1, PLAYERS + 1) for week in range(1, WEEKS + 1)
+    ])
+    db.execute(insert(TrainingSession), [
+        {"schedule_id": schedule, "day_of_week": day, "session_date": date(2025, 1, day),
+         "title": "Session", "start_time": time(16, 0), "end_time": time(17, 30)}
+        for schedule in range(1, PLAYERS * WEEKS + 1) for day in (2, 4)
+    ])
+    db.execute(insert(ChallengeEntry), [
+        {"player_id": user, "challenge_id": challenge, "points_earned": 10}
+        for user in range(1, PLAYERS + 1) for challenge in range(1, 4)
+    ])
+    db.commit()
+    # Give the planner real statistics, as a maintained production database would have
+    db.execute(text("ANALYZE"))
+    return db
+
+
+def assert_uses_indexes(db, query_counter, call):
+    """Run the call, EXPLAIN every SELECT it issued and return its result."""
+    with query_counter.record() as executed:
+        result = call()
+    selects = [(sql, params) for sql, params in executed if sql.lstrip().upper().startswith("SELECT")]
+    assert selects, "The call issued no SELECT to check"
+    for sql, params in selects:
+        plan = explain_sql(db, sql, params)
+        scans = find_full_scans(plan, HOT_TABLES)
+        assert not scans, f"Query falls back to a full scan: {scans}\nQuery: {sql}\nPlan: {plan}"
+    return result
+
+
+def completion_id(challenge_id):
+    return (PLAYER - 1) * CHALLENGES + challenge_id
+
+
+def test_completion_lookup_and_results_newest_first(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.get(
+        "/api/v2/challenges/user/3", headers=headers
+    ))
+    assert response.status_code == 200
+
+
+def test_completions_for_user(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.get(
+        "/api/v2/challenges/user", headers=headers
+    ))
+    assert response.status_code == 200
+
+
+def test_results_for_completion(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.get(
+        f"/api/v2/challenges/results/{completion_id(3)}", headers=headers
+    ))
+    assert response.status_code == 200
+
+
+def test_result_submission(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.patch(
+        "/api/v2/challenges/submit-result/3", params={"result_value": 12}, headers=headers
+    ))
+    assert response.status_code == 200
+
+
+def test_verification_and_existing_achievement_check(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.patch(
+        f"/api/v2/challenges/verify/{completion_id(2)}", headers=headers
+    ))
+    assert response.status_code == 200
+
+
+def test_player_test_history(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.get(
+        f"/api/v2/skill-tests/player-tests/player/{PLAYER}", headers=headers
+    ))
+    assert response.status_code == 200
+    assert len(response.json()) == 6
+
+
+def test_schedule_by_week(seeded_db, query_counter):
+    service = TrainingScheduleService(seeded_db)
+    assert_uses_indexes(seeded_db, query_counter, lambda: service.get_schedules_by_week(PLAYER, 3, 2025))
+
+
+def test_sessions_for_schedule(seeded_db, query_counter):
+    service = TrainingScheduleService(seeded_db)
+    assert_uses_indexes(seeded_db, query_counter, lambda: service.get_sessions_by_schedule(12))
+
+
+def test_training_calendar(seeded_db, query_counter):
+    service = TrainingScheduleService(seeded_db)
+    assert_uses_indexes(seeded_db, query_counter, lambda: service.get_calendar(
+        PLAYER, date(2025, 1, 1), date(2025, 1, 31)
+    ))
+
+
+def test_challenge_entries_for_player(seeded_db, query_counter):
+    service = LeagueTableService(seeded_db)
+    assert_uses_indexes(seeded_db, query_counter, lambda: service.get_challenge_entries_by_player(PLAYER))
+
+
+def test_challenge_league_table_best_results(seeded_db, client, query_counter):
+    headers = get_auth_header(client)
+    response = assert_uses_indexes(seeded_db, query_counter, lambda: client.get(
+        "/api/v2/league-table/challenge/3", headers=headers
+    ))
+    assert response.status_code == 200
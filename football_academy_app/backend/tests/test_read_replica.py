@@ -0,0 +1,75 @@
+"""
+Tests for routing reads to the replica. A second SQLite database stands in
+for the replica; since nothing replicates to it, a read served by it does
+not see rows written to the primary.
+"""
+import asyncio
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from database import Base, recent_writers, use_replica
+from models import LeagueTableEntry, User
+from routers.league_table import get_league_table
+from session_routing import RoutingSession
+
+
+def _request(method, token="player"):
+    return Request({"type": "http", "method": method, "path": "/", "query_string": b"",
+                    "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+def test_routing_session_reads_from_replica_until_it_writes(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind in (primary, replica):
+        Base.metadata.create_all(bind=bind, tables=[User.__table__])
+    Session = sessionmaker(bind=primary, class_=RoutingSession, replica_bind=replica)
+
+    with Session() as db:
+        db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+        db.commit()
+
+    with Session(info={"use_replica": True}) as db:
+        assert db.query(User).count() == 0
+        assert db.get_bind().url == primary.url
+        # Locking reads need the primary
+        assert len(db.execute(select(User).with_for_update()).all()) == 1
+
+    with Session(info={"use_replica": True}) as db:
+        db.execute(insert(User).values(email="coach@example.com", hashed_password="x", full_name="Coach"))
+        # Reads after a write in the same session see it
+        assert db.query(User).count() == 2
+        db.commit()
+
+    with Session(info={"use_replica": True}) as db:
+        db.add(User(email="new@example.com", hashed_password="x", full_name="New"))
+        db.flush()
+        assert db.query(User).count() == 3
+
+
+def test_read_your_writes_window(monkeypatch):
+    recent_writers.clear()
+    assert use_replica(_request("GET"))
+    assert not use_replica(_request("PATCH"))
+    # The writer's own reads stay on the primary, other callers' do not
+    assert not use_replica(_request("GET"))
+    assert use_replica(_request("GET", token="coach"))
+
+    monkeypatch.setattr(recent_writers, "window_seconds", 0)
+    assert use_replica(_request("GET"))
+    recent_writers.clear()
+
+
+def test_league_table_ranks_read_from_primary(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind in (primary, replica):
+        Base.metadata.create_all(bind=bind, tables=[User.__table__, LeagueTableEntry.__table__])
+    Session = sessionmaker(bind=primary, class_=RoutingSession, replica_bind=replica)
+
+    # The GET saves the ranks it computes, so it must not read lagging points
+    with Session(info={"use_replica": True}) as db:
+        assert asyncio.run(get_league_table(db=db, current_user=None)) == []
+        assert db.get_bind(clause=select(LeagueTableEntry)).url == primary.url
@@ -0,0 +1,47 @@
+"""
+Tests for the process-local reference data cache.
+"""
+from config import settings
+from models import Challenge, ReferenceDataVersion
+from services.reference_data import get_reference_data, bump_reference_data
+
+
+def _challenge(title):
+    return Challenge(title=title, description="", category="technical", difficulty="beginner", criteria={}, created_by=1)
+
+
+def test_snapshot_is_reused_within_poll_interval(db, query_counter, monkeypatch):
+    monkeypatch.setattr(settings, "REFERENCE_DATA_POLL_SECONDS", 60)
+    get_reference_data(db)
+
+    with query_counter.count() as statements:
+        get_reference_data(db)
+    assert statements == []
+
+
+def test_reload_only_when_generation_changes(db, query_counter, monkeypatch):
+    monkeypatch.setattr(settings, "REFERENCE_DATA_POLL_SECONDS", 0)
+    db.add(_challenge("Juggling"))
+    db.commit()
+    assert [c.title for c in get_reference_data(db).challenges.values()] == ["Juggling"]
+
+    # Unchanged generation: one cheap version check, no reload
+    with query_counter.count() as statements:
+        get_reference_data(db)
+    assert len(statements) == 1
+
+    # Another worker writes a challenge and bumps the generation
+    db.add(_challenge("Sprint"))
+    db.add(ReferenceDataVersion(name="reference", generation=1))
+    db.commit()
+    assert [c.title for c in get_reference_data(db).challenges.values()] == ["Juggling", "Sprint"]
+
+
+def test_bump_drops_local_snapshot(db):
+    snapshot = get_reference_data(db)
+    bump_reference_data(db)
+    bump_reference_data(db)
+
+    reloaded = get_reference_data(db)
+    assert reloaded is not snapshot
+    assert reloaded.generation == 2
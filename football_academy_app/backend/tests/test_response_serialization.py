@@ -0,0 +1,46 @@
+"""
+Tests that endpoints returning prebuilt payloads produce exactly what the
+response_model validation path would have.
+"""
+from datetime import datetime
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import parse_obj_as
+
+from models import ChallengeCompletion, ChallengeResult
+from schemas import ChallengeCompletionWithDetails, ChallengeLeagueTableResponse, ChallengeResultResponse
+from tests.utils import get_auth_header
+
+
+def _validated(model, body):
+    return jsonable_encoder(parse_obj_as(model, body))
+
+
+def test_prebuilt_responses_match_response_models(client, db):
+    headers = get_auth_header(client)
+    challenge_id = client.post("/api/v2/challenges/", headers=headers, json={
+        "title": "Juggling", "description": "", "category": "technical", "difficulty": "beginner",
+        "criteria": {"target": 50}, "created_by": 1
+    }).json()["id"]
+    completion = ChallengeCompletion(user_id=1, challenge_id=challenge_id, notes="Started")
+    completion.results = [
+        ChallengeResult(result_value=value, submitted_at=datetime(2026, 10, day, 17, 30, 12, 345678))
+        for day, value in ((1, 12.0), (8, 31.5))
+    ]
+    db.add(completion)
+    db.commit()
+
+    checks = [
+        ("/api/v2/challenges/user", List[ChallengeCompletionWithDetails]),
+        (f"/api/v2/challenges/user/{challenge_id}", ChallengeCompletionWithDetails),
+        (f"/api/v2/challenges/results/{completion.id}", List[ChallengeResultResponse]),
+        (f"/api/v2/league-table/challenge/{challenge_id}", ChallengeLeagueTableResponse),
+    ]
+    for path, model in checks:
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, path
+        assert response.json() == _validated(model, response.json()), path
+
+    entry = client.get(f"/api/v2/league-table/challenge/{challenge_id}", headers=headers).json()["entries"][0]
+    assert (entry["best_result"], entry["submitted_at"]) == (31.5, "2026-10-08T17:30:12.345678")
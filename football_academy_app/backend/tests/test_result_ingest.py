@@ -0,0 +1,97 @@
+"""
+Tests for the micro-batching result ingest path.
+"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event
+
+from config import settings
+from models import Challenge, ChallengeCompletion, ChallengeResult, User
+from services.result_ingest import ResultIngestQueue
+from tests.utils import get_auth_header
+
+
+def _submission(user_id, challenge_id, value):
+    return {"user_id": user_id, "challenge_id": challenge_id, "result_value": value,
+            "notes": None, "submitted_at": datetime(2026, 10, 19, 12, 0)}
+
+
+def test_queue_writes_group_commits(db):
+    db.add_all([User(email=f"player{n}@example.com", hashed_password="x", full_name=f"Player {n}") for n in range(5)])
+    db.add_all([Challenge(title=f"Challenge {n}", description="", category="technical", difficulty="beginner",
+                          criteria={}) for n in range(2)])
+    db.add(ChallengeCompletion(user_id=1, challenge_id=1))
+    db.commit()
+
+    bind = db.get_bind()
+    commits = []
+    record_commit = commits.append
+    event.listen(bind, "commit", record_commit)
+    queue = ResultIngestQueue(bind, max_rows=20, max_delay_ms=50)
+    submissions = [_submission(user_id, challenge_id, float(n))
+                   for n, (user_id, challenge_id) in enumerate((u, c) for c in (1, 2) for u in range(1, 6) for _ in range(5))]
+
+    async def submit_all():
+        return await asyncio.gather(*(queue.submit(submission) for submission in submissions))
+
+    try:
+        results = asyncio.run(submit_all())
+    finally:
+        event.remove(bind, "commit", record_commit)
+
+    # 50 submissions in batches of at most 20
+    assert queue.batches_written == 3
+    assert len(commits) == 3
+    assert [result["result_value"] for result in results] == [s["result_value"] for s in submissions]
+    assert len({result["id"] for result in results}) == 50
+    assert db.query(ChallengeResult).count() == 50
+
+    # One completion per pair, the existing one reused, progress set to the latest result
+    completions = {(c.user_id, c.challenge_id): c for c in db.query(ChallengeCompletion)}
+    assert len(completions) == 10
+    assert completions[(1, 1)].id == 1
+    assert completions[(5, 2)].progress == 49.0
+    assert {result["completion_id"] for result in results if result["result_value"] < 5} == {1}
+
+
+def test_submit_result_through_batching_queue(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_INGEST_BATCHING", True)
+    headers = get_auth_header(client)
+    challenge = client.post("/api/v2/challenges/", headers=headers, json={
+        "title": "Juggling", "description": "", "category": "technical", "difficulty": "beginner",
+        "criteria": {}, "created_by": 1
+    }).json()
+
+    response = client.patch(f"/api/v2/challenges/submit-result/{challenge['id']}",
+                            params={"result_value": 42, "notes": "Personal best"}, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["result_value"], body["notes"]) == (42.0, "Personal best")
+
+    db.expire_all()
+    result = db.query(ChallengeResult).get(body["id"])
+    assert result.completion_id == body["completion_id"]
+    assert db.query(ChallengeCompletion).get(body["completion_id"]).progress == 42.0
+
+    response = client.patch("/api/v2/challenges/submit-result/999", params={"result_value": 1}, headers=headers)
+    assert response.status_code == 404
+
+
+def test_bad_submission_fails_only_its_caller(db):
+    db.add_all([User(email=f"player{n}@example.com", hashed_password="x", full_name=f"Player {n}") for n in range(3)])
+    db.add(Challenge(title="Challenge", description="", category="technical", difficulty="beginner", criteria={}))
+    db.commit()
+
+    queue = ResultIngestQueue(db.get_bind(), max_rows=3, max_delay_ms=50)
+    submissions = [_submission(1, 1, 10.0), _submission(2, 1, None), _submission(3, 1, 30.0)]
+
+    async def submit_all():
+        return await asyncio.gather(*(queue.submit(submission) for submission in submissions), return_exceptions=True)
+
+    first, bad, third = asyncio.run(submit_all())
+
+    assert isinstance(bad, Exception)
+    assert (first["result_value"], third["result_value"]) == (10.0, 30.0)
+    assert sorted(result.result_value for result in db.query(ChallengeResult)) == [10.0, 30.0]
+    assert queue.results_written == 2
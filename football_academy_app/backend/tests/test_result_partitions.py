@@ -0,0 +1,148 @@
+"""
+Tests for the month arithmetic behind challenge result partitions, the
+PostgreSQL partitioning SQL and the submitted_at windows that let queries
+prune them.
+"""
+import importlib.util
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from models import ChallengeCompletion, ChallengeResult
+from services.result_partitions import (
+    add_months, month_start, partition_month, partition_name, partition_results_table
+)
+from tests.utils import get_auth_header
+
+MIGRATION = (Path(__file__).resolve().parent.parent
+             / "alembic" / "versions" / "9e4a6b2c7d15_partition_challenge_results.py")
+
+
+def test_partition_months():
+    assert month_start(date(2026, 10, 19)) == date(2026, 10, 1)
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name(date(2027, 1, 1)) == "challenge_results_p202701"
+    assert partition_month("challenge_results_p202701") == date(2027, 1, 1)
+    assert partition_month("challenge_results_default") is None
+
+
+def _seed(client, db, **challenge):
+    headers = get_auth_header(client)
+    base = {"title": "Juggling", "description": "", "category": "technical", "difficulty": "beginner",
+            "criteria": {}, "created_by": 1}
+    challenge_id = client.post("/api/v2/challenges/", json={**base, **challenge}, headers=headers).json()["id"]
+    completion = ChallengeCompletion(user_id=1, challenge_id=challenge_id)
+    completion.results = [
+        ChallengeResult(result_value=value, submitted_at=submitted_at)
+        for value, submitted_at in (
+            (10.0, datetime(2026, 1, 15)),
+            (30.0, datetime(2026, 2, 15)),
+            (20.0, datetime(2026, 3, 15)),
+        )
+    ]
+    db.add(completion)
+    db.commit()
+    return headers, challenge_id, completion.id
+
+
+def test_results_filtered_by_submission_window(client, db):
+    headers, _, completion_id = _seed(client, db)
+
+    response = client.get(f"/api/v2/challenges/results/{completion_id}", headers=headers,
+                          params={"since": "2026-02-01T00:00:00", "until": "2026-03-31T00:00:00"})
+    assert response.status_code == 200
+    assert [r["result_value"] for r in response.json()] == [20.0, 30.0]
+
+    response = client.get(f"/api/v2/challenges/results/{completion_id}", headers=headers,
+                          params={"since": "2026-03-01T00:00:00", "until": "2026-02-01T00:00:00"})
+    assert response.status_code == 400
+
+
+def test_league_table_bounded_by_window_and_challenge_end(client, db):
+    headers, challenge_id, _ = _seed(client, db, end_date="2026-03-01T00:00:00")
+
+    # The March result was submitted after the challenge ended
+    response = client.get(f"/api/v2/league-table/challenge/{challenge_id}", headers=headers)
+    assert response.status_code == 200
+    assert [entry["best_result"] for entry in response.json()["entries"]] == [30.0]
+
+    response = client.get(f"/api/v2/league-table/challenge/{challenge_id}", headers=headers,
+                          params={"until": "2026-02-01T00:00:00"})
+    assert [entry["best_result"] for entry in response.json()["entries"]] == [10.0]
+
+
+class RecordingConnection:
+    """
+    Stands in for a PostgreSQL connection: records the SQL it is given and
+    answers the catalog lookups as for an unpartitioned table.
+    """
+
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self, oldest=None):
+        self.oldest = oldest
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append(sql)
+        # Not partitioned yet, no partition exists and the default partition is empty
+        value = self.oldest if sql.startswith("SELECT MIN(submitted_at)") else None
+        return SimpleNamespace(scalar=lambda: value)
+
+    def created_partitions(self):
+        return [sql for sql in self.statements if " PARTITION OF challenge_results FOR VALUES" in sql]
+
+
+def test_partitioning_sql():
+    connection = RecordingConnection(oldest=datetime(2026, 8, 20, 17, 30))
+
+    assert partition_results_table(connection, today=date(2026, 10, 19))
+
+    statements = connection.statements
+    create = next(sql for sql in statements if sql.startswith("CREATE TABLE challenge_results ("))
+    assert "PRIMARY KEY (id, submitted_at) ) PARTITION BY RANGE (submitted_at)" in create
+    assert "CREATE TABLE challenge_results_default PARTITION OF challenge_results DEFAULT" in statements
+    # From the oldest row's month through three months ahead
+    assert connection.created_partitions() == [
+        f"CREATE TABLE challenge_results_p{month} PARTITION OF challenge_results "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        for month, start, end in (
+            ("202608", "2026-08-01", "2026-09-01"), ("202609", "2026-09-01", "2026-10-01"),
+            ("202610", "2026-10-01", "2026-11-01"), ("202611", "2026-11-01", "2026-12-01"),
+            ("202612", "2026-12-01", "2027-01-01"), ("202701", "2027-01-01", "2027-02-01"),
+        )
+    ]
+    # Rows are copied once every partition exists, so none land in the default partition
+    copy = next(n for n, sql in enumerate(statements) if sql.startswith("INSERT INTO challenge_results "))
+    assert copy > statements.index(connection.created_partitions()[-1])
+    assert statements[-1] == "DROP TABLE challenge_results_unpartitioned"
+
+
+def test_partitions_for_history_about_to_be_loaded():
+    # The benchmark seeder partitions the empty table before bulk-loading years of history
+    connection = RecordingConnection()
+
+    partition_results_table(connection, since=date(2023, 1, 2), today=date(2026, 10, 19))
+
+    partitions = connection.created_partitions()
+    assert len(partitions) == 49
+    assert partitions[0].startswith("CREATE TABLE challenge_results_p202301 ")
+
+
+def test_partition_migration_sql(monkeypatch):
+    spec = importlib.util.spec_from_file_location("partition_migration", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    connection = RecordingConnection()
+    monkeypatch.setattr(migration, "op", SimpleNamespace(execute=connection.execute, get_bind=lambda: connection))
+
+    migration.upgrade()
+
+    assert connection.statements[0] == (
+        "UPDATE challenge_results SET submitted_at = CURRENT_TIMESTAMP WHERE submitted_at IS NULL"
+    )
+    assert "ALTER TABLE challenge_results RENAME TO challenge_results_unpartitioned" in connection.statements
+    assert connection.created_partitions()
@@ -0,0 +1,72 @@
+"""
+Tests for ?fields= sparse fieldsets on list endpoints.
+"""
+from datetime import date, datetime, time
+
+from models import PlayerTest, TrainingSchedule, TrainingSession, User
+from tests.utils import get_auth_header
+
+
+def _schedule(db):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    schedule = TrainingSchedule(user_id=1, week_number=34, year=2023, title="Week 34", notes="Cup week")
+    schedule.training_sessions = [
+        TrainingSession(day_of_week=day, session_date=date(2023, 8, 20 + day), title=f"Session {day}",
+                        description="Long description", start_time=time(16), end_time=time(17, 30),
+                        reflection_text="Long reflection")
+        for day in (1, 3)
+    ]
+    db.add(schedule)
+    db.commit()
+
+
+def test_schedule_fields_are_projected_in_sql(client, db, query_counter):
+    _schedule(db)
+
+    with query_counter.count() as statements:
+        response = client.get("/api/v2/training-schedules/user/1",
+                              params={"fields": "title,training_sessions.title,training_sessions.session_date"})
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": 1,
+        "title": "Week 34",
+        "training_sessions": [
+            {"id": 1, "title": "Session 1", "session_date": "2023-08-21"},
+            {"id": 2, "title": "Session 3", "session_date": "2023-08-23"},
+        ],
+    }]
+    assert len(statements) == 2
+    assert not any("notes" in statement or "description" in statement or "reflection_text" in statement
+                   for statement in statements)
+
+    # Without a selection the full schedule is returned as before
+    full = client.get("/api/v2/training-schedules/user/1").json()[0]
+    assert full["notes"] == "Cup week"
+    assert full["training_sessions"][0]["description"] == "Long description"
+
+
+def test_unknown_fields_are_rejected(client, db):
+    _schedule(db)
+    for fields in ("title,coach", "title.length", "training_sessions.coach"):
+        response = client.get("/api/v2/training-schedules/user/1", params={"fields": fields})
+        assert response.status_code == 400, fields
+
+
+def test_player_test_and_challenge_fields(client, db):
+    headers = get_auth_header(client)
+    db.add(PlayerTest(player_id=1, test_date=datetime(2023, 8, 21), position="striker",
+                      pace=12.1, pace_rating=80, overall_rating=75))
+    db.commit()
+
+    tests = client.get("/api/v2/skill-tests/player-tests/player/1", headers=headers,
+                       params={"fields": "test_date,overall_rating"})
+    assert tests.status_code == 200
+    assert tests.json() == [{"id": 1, "test_date": "2023-08-21T00:00:00", "overall_rating": 75}]
+
+    client.post("/api/v2/challenges/", headers=headers, json={
+        "title": "Juggling", "description": "", "category": "technical", "difficulty": "beginner",
+        "criteria": {"target": 50}, "created_by": 1
+    })
+    challenges = client.get("/api/v2/challenges/", headers=headers, params={"fields": "title,category"})
+    assert challenges.json() == [{"id": 1, "title": "Juggling", "category": "technical"}]
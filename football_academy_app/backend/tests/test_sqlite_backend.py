@@ -0,0 +1,58 @@
+"""
+Tests for the SQLite backend: connection pragmas, the async engine and the
+dialect-aware statements.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import insert, text
+
+from database import Base, backend_name, create_async_database_engine, create_database_engine
+from models import Challenge, ChallengeCompletion, User
+from services.dialects import insert_ignoring_conflicts
+
+PRAGMAS = ("journal_mode", "synchronous", "busy_timeout", "foreign_keys")
+
+
+def test_backend_name():
+    assert backend_name("postgresql+psycopg2://user@db/academy") == "postgresql"
+    assert backend_name("sqlite:///./academy.db") == "sqlite"
+    with pytest.raises(RuntimeError):
+        backend_name("mysql://user@db/academy")
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    url = f"sqlite:///{tmp_path / 'academy.db'}"
+    engine = create_database_engine(url)
+    with engine.connect() as connection:
+        settings = [connection.execute(text(f"PRAGMA {pragma}")).scalar() for pragma in PRAGMAS]
+    assert settings == ["wal", 1, 5000, 1]
+
+    async def async_settings():
+        async_engine = create_async_database_engine(url)
+        async with async_engine.connect() as connection:
+            values = [(await connection.execute(text(f"PRAGMA {pragma}"))).scalar() for pragma in PRAGMAS]
+        await async_engine.dispose()
+        return values
+
+    assert asyncio.run(async_settings()) == ["wal", 1, 5000, 1]
+
+    # Readers are not blocked by an open write transaction
+    Base.metadata.create_all(bind=engine, tables=[User.__table__])
+    with engine.begin() as writer:
+        writer.execute(insert(User).values(email="player@example.com", hashed_password="x", full_name="Player"))
+        with engine.connect() as reader:
+            assert reader.execute(text("SELECT COUNT(*) FROM users")).scalar() == 0
+    engine.dispose()
+
+
+def test_insert_ignoring_conflicts(db):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    db.add(Challenge(title="Juggling", description="", category="technical", difficulty="beginner", criteria={}))
+    db.add(ChallengeCompletion(user_id=1, challenge_id=1, notes="Existing"))
+    db.commit()
+
+    statement = insert_ignoring_conflicts(db, ChallengeCompletion, ["user_id", "challenge_id"])
+    db.execute(statement, [{"user_id": 1, "challenge_id": 1, "notes": "Duplicate"}])
+    db.commit()
+    assert [c.notes for c in db.query(ChallengeCompletion)] == ["Existing"]
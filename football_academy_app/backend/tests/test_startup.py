@@ -0,0 +1,50 @@
+"""
+Startup budget: importing the app must stay fast and must not touch the
+database, so new workers come up quickly when autoscaling.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Seconds to import the app, best of a few runs: all of it, and the part
+# spent in our own modules once FastAPI, SQLAlchemy and pydantic are loaded
+STARTUP_BUDGET_SECONDS = 1.5
+APP_BUDGET_SECONDS = 0.6
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import fastapi, pydantic, sqlalchemy.orm
+frameworks_loaded = time.perf_counter()
+import main
+finished = time.perf_counter()
+import database
+print(json.dumps({
+    "elapsed": finished - started,
+    "app": finished - frameworks_loaded,
+    "engines": sorted(database._engines),
+    "modules": sorted(m for m in ("jose", "passlib", "bcrypt", "psycopg2", "asyncpg") if m in sys.modules),
+}))
+"""
+
+
+def _probe():
+    env = dict(os.environ, CHALLENGE_EXPIRY_SWEEPER="false",
+               # Nothing listens here; a connection attempt would fail the import
+               DATABASE_URL="postgresql://nobody@127.0.0.1:1/unreachable")
+    output = subprocess.check_output([sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_is_side_effect_free_and_within_budget():
+    runs = [_probe() for _ in range(3)]
+    assert runs[0]["engines"] == []
+    assert runs[0]["modules"] == []
+    best = min(run["elapsed"] for run in runs)
+    assert best < STARTUP_BUDGET_SECONDS, f"app import took {best:.2f}s"
+    best_app = min(run["app"] for run in runs)
+    assert best_app < APP_BUDGET_SECONDS, f"app modules took {best_app:.2f}s to import"
@@ -0,0 +1,51 @@
+"""
+Tests for the whole-range training calendar endpoint.
+"""
+from datetime import date, time
+
+from models import FocusArea, TrainingSchedule, TrainingSession, User
+
+
+def _session(day, **kwargs):
+    return TrainingSession(day_of_week=day.isoweekday(), session_date=day, title=f"Session {day.day}",
+                           start_time=time(16), end_time=time(17, 30), **kwargs)
+
+
+def test_calendar_returns_the_range_in_one_query(client, db, query_counter):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    focus = FocusArea(title="Weak foot", description="")
+    db.add(focus)
+    db.flush()
+    week_1 = TrainingSchedule(user_id=1, week_number=1, year=2025, title="Week 1")
+    week_1.training_sessions = [_session(date(2024, 12, 31), focus_area_id=focus.id), _session(date(2025, 1, 2))]
+    week_2 = TrainingSchedule(user_id=1, week_number=2, year=2025, title="Week 2")
+    week_3 = TrainingSchedule(user_id=1, week_number=3, year=2025, title="Week 3")
+    week_3.training_sessions = [_session(date(2025, 1, 14))]
+    db.add_all([week_1, week_2, week_3])
+    db.commit()
+    db.expunge_all()
+
+    with query_counter.count() as statements:
+        response = client.get("/api/v2/training-schedules/calendar",
+                              params={"user_id": 1, "from": "2025-01-01", "to": "2025-01-12"})
+
+    assert response.status_code == 200
+    assert len(statements) == 1
+    calendar = response.json()
+    assert (calendar["start_date"], calendar["end_date"]) == ("2025-01-01", "2025-01-12")
+    # Sessions outside the range are left out; weeks without sessions are kept
+    assert [(s["title"], [t["session_date"] for t in s["training_sessions"]]) for s in calendar["schedules"]] == [
+        ("Week 1", ["2025-01-02"]),
+        ("Week 2", []),
+    ]
+
+    response = client.get("/api/v2/training-schedules/calendar",
+                          params={"user_id": 1, "from": "2024-12-30", "to": "2024-12-31"})
+    session = response.json()["schedules"][0]["training_sessions"][0]
+    assert (session["session_date"], session["focus_area_title"]) == ("2024-12-31", "Weak foot")
+
+
+def test_calendar_rejects_bad_ranges(client, db):
+    for start, end in (("2025-01-12", "2025-01-01"), ("2025-01-01", "2025-12-31")):
+        response = client.get("/api/v2/training-schedules/calendar", params={"user_id": 1, "from": start, "to": end})
+        assert response.status_code == 400
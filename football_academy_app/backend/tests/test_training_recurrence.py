@@ -0,0 +1,85 @@
+"""
+Tests for generating training sessions from a recurrence rule.
+"""
+from models import TrainingSchedule, TrainingSession, User
+
+RULE = {
+    "user_id": 1,
+    "days_of_week": [2, 4],  # Tuesdays and Thursdays
+    "start_date": "2025-01-01",
+    "until": "2025-01-19",
+    "exceptions": ["2025-01-09"],
+    "title": "Team training",
+    "start_time": "16:00:00",
+    "end_time": "17:30:00",
+    "location": "Pitch 2",
+}
+URL = "/api/v2/training-schedules/sessions/recurring"
+
+
+def _player_with_week_2(db):
+    db.add(User(email="player@example.com", hashed_password="x", full_name="Player"))
+    db.add(TrainingSchedule(user_id=1, week_number=2, year=2025, title="Existing week"))
+    db.commit()
+
+
+def test_preview_expands_without_writing(client, db):
+    _player_with_week_2(db)
+
+    response = client.post(URL, params={"preview": True}, json=RULE)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "preview": True,
+        "schedules_created": 2,
+        "sessions_created": 4,
+        "weeks": [
+            {"year": 2025, "week_number": 1, "schedule_id": None, "session_dates": ["2025-01-02"]},
+            {"year": 2025, "week_number": 2, "schedule_id": 1, "session_dates": ["2025-01-07"]},
+            {"year": 2025, "week_number": 3, "schedule_id": None, "session_dates": ["2025-01-14", "2025-01-16"]},
+        ],
+    }
+    assert db.query(TrainingSchedule).count() == 1
+    assert db.query(TrainingSession).count() == 0
+
+
+def test_sessions_are_created_in_bulk(client, db, query_counter):
+    _player_with_week_2(db)
+
+    with query_counter.count() as statements:
+        response = client.post(URL, json=RULE)
+
+    assert response.status_code == 201
+    assert [week["schedule_id"] for week in response.json()["weeks"]] == [2, 1, 3]
+    # The existing weeks lookup, then one INSERT each for schedules and sessions
+    assert [statement.split()[0] for statement in statements] == ["SELECT", "INSERT", "INSERT"]
+
+    sessions = db.query(TrainingSession).order_by(TrainingSession.session_date).all()
+    assert [(s.schedule_id, str(s.session_date), s.day_of_week) for s in sessions] == [
+        (2, "2025-01-02", 4), (1, "2025-01-07", 2), (3, "2025-01-14", 2), (3, "2025-01-16", 4),
+    ]
+    assert {(s.title, s.location) for s in sessions} == {("Team training", "Pitch 2")}
+
+
+def test_invalid_rules_are_rejected(client, db):
+    for changes in ({"days_of_week": [0, 8]}, {"days_of_week": []}, {"until": "2024-12-31"},
+                    {"until": "2026-06-30"}):
+        response = client.post(URL, params={"preview": True}, json={**RULE, **changes})
+        assert response.status_code == 400, changes
+
+
+def test_reposting_a_rule_adds_no_sessions_twice(client, db):
+    _player_with_week_2(db)
+    assert client.post(URL, json=RULE).json()["sessions_created"] == 4
+
+    # The same rule again, then one overlapping it that adds Fridays
+    response = client.post(URL, json=RULE)
+    assert response.status_code == 201
+    assert (response.json()["schedules_created"], response.json()["sessions_created"]) == (0, 0)
+    response = client.post(URL, json={**RULE, "days_of_week": [2, 4, 5]})
+    assert (response.json()["schedules_created"], response.json()["sessions_created"]) == (0, 3)
+
+    sessions = db.query(TrainingSession).order_by(TrainingSession.session_date).all()
+    assert [str(s.session_date) for s in sessions] == [
+        "2025-01-02", "2025-01-03", "2025-01-07", "2025-01-10", "2025-01-14", "2025-01-16", "2025-01-17",
+    ]
@@ -0,0 +1,104 @@
+"""
+Tests for the weekly challenge rollover.
+"""
+from datetime import datetime, timedelta
+
+from models import (
+    Achievement, Badge, Challenge, ChallengeCompletion, ChallengeStatus, User, UserChallengeStatus
+)
+from services.weekly_challenges import roll_over_weekly_challenge, week_start
+from tests.utils import get_auth_header
+
+# A Wednesday; the week started on Monday 2026-10-19
+NOW = datetime(2026, 10, 21, 9, 30)
+MONDAY = datetime(2026, 10, 19)
+
+
+def _template(title, **overrides):
+    return Challenge(title=title, description="", category="technical", difficulty="beginner", criteria={},
+                     created_by=1, is_weekly=True, is_template=True, **overrides)
+
+
+def test_week_start():
+    assert week_start(NOW) == MONDAY
+    assert week_start(MONDAY) == MONDAY
+    assert week_start(datetime(2026, 10, 25, 23, 59)) == MONDAY
+
+
+def test_rollover_clones_template_and_archives_last_week(client, db):
+    headers = get_auth_header(client)
+    db.add_all([
+        User(email="player1@example.com", hashed_password="x", full_name="Player 1"),
+        User(email="player2@example.com", hashed_password="x", full_name="Player 2"),
+        User(email="retired@example.com", hashed_password="x", full_name="Retired", is_active=False),
+    ])
+    template = _template("Weekly juggling", points=250)
+    db.add(template)
+    db.flush()
+    last_week = Challenge(title="Weekly juggling", description="", category="technical", difficulty="beginner",
+                          criteria={}, created_by=1, is_weekly=True, template_id=template.id,
+                          start_date=MONDAY - timedelta(days=7), end_date=MONDAY)
+    db.add(last_week)
+    db.flush()
+    db.add(ChallengeCompletion(user_id=2, challenge_id=last_week.id, status=ChallengeStatus.ACTIVE))
+    db.commit()
+
+    challenge_id = roll_over_weekly_challenge(db, now=NOW)
+
+    db.expire_all()
+    weekly = db.query(Challenge).get(challenge_id)
+    assert (weekly.title, weekly.points, weekly.template_id) == ("Weekly juggling", 250, template.id)
+    assert (weekly.start_date, weekly.end_date) == (MONDAY, MONDAY + timedelta(days=7))
+    # Active players are opted in; the registered coach and the inactive player are not
+    opted_in = db.query(ChallengeCompletion).filter(ChallengeCompletion.challenge_id == challenge_id)
+    assert sorted(c.user_id for c in opted_in) == [2, 3]
+    assert db.query(UserChallengeStatus).filter(UserChallengeStatus.challenge_id == challenge_id).count() == 4
+    # Last week's challenge is archived
+    assert db.query(Challenge).get(last_week.id).is_active is False
+    assert db.query(ChallengeCompletion).filter(
+        ChallengeCompletion.challenge_id == last_week.id
+    ).one().status == ChallengeStatus.EXPIRED
+
+    assert roll_over_weekly_challenge(db, now=NOW) is None
+
+    response = client.get("/api/v2/challenges/weekly/current", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == challenge_id
+
+
+def test_templates_rotate_and_stay_hidden(client, db):
+    headers = get_auth_header(client)
+    db.add_all([_template("Template A"), _template("Template B")])
+    db.commit()
+    assert client.get("/api/v2/challenges/weekly/current", headers=headers).status_code == 404
+
+    roll_over_weekly_challenge(db, now=NOW)
+    roll_over_weekly_challenge(db, now=NOW + timedelta(days=7))
+
+    titles = [c.title for c in db.query(Challenge).filter(Challenge.template_id.isnot(None)).order_by(Challenge.id)]
+    # Templates take turns by ISO week number
+    assert titles == (["Template A", "Template B"] if MONDAY.isocalendar()[1] % 2 == 0 else ["Template B", "Template A"])
+    # Templates are neither listed as active nor given statuses
+    assert {c["title"] for c in client.get("/api/v2/challenges/active", headers=headers).json()} == {titles[1]}
+    assert [c["title"] for c in client.get("/api/v2/challenges/with-status", headers=headers).json()] == titles
+
+
+def test_rollovers_do_not_inflate_badge_stats(client, db):
+    headers = get_auth_header(client)
+    badge = Badge(name="Weekly engine", description="", image_url="", criteria="")
+    db.add(badge)
+    db.flush()
+    template = _template("Weekly sprints", badge_id=badge.id)
+    template.category = "physical"
+    db.add(template)
+    db.add(Achievement(user_id=1, badge_id=badge.id))
+    db.commit()
+
+    roll_over_weekly_challenge(db, now=NOW)
+    roll_over_weekly_challenge(db, now=NOW + timedelta(days=7))
+
+    # Every clone carries the template's badge, but only the template counts
+    assert db.query(Challenge).filter(Challenge.badge_id == badge.id).count() == 3
+    response = client.get("/api/v2/challenges/badge-stats", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"physical": 1}
@@ -8,6 +8,7 @@ from datetime import date
 # Import the Position enum from constants
 from constants.position_weights import Position
 
+
 def get_auth_header(client, email: str = "test@example.com", password: str = "password123") -> Dict[str, str]:
     """
     Get an authentication header by logging in a test user.
@@ -87,6 +88,7 @@ def get_auth_header(client, email: str = "test@example.com", password: str = "pa
     
     return {}
 
+
 def create_test_data(client, resource_type: str, data: Dict[str, Any], auth_header: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
     Create test data for a given resource type.
@@ -126,4 +128,46 @@ def create_test_data(client, resource_type: str, data: Dict[str, Any], auth_head
     if response.status_code in (200, 201):
         return response.json()
     
-    return {} 
\ No newline at end of file
+    return {}
+
+
+def explain_sql(db, sql: str, params) -> list:
+    """
+    Return the query plan lines the database reports for SQL as the driver
+    received it, e.g. a statement recorded with QueryCounter.record.
+    
+    Args:
+        db: The Session to run EXPLAIN on
+        sql: The SQL text, with the driver's parameter placeholders
+        params: The parameters sent with it
+        
+    Returns:
+        List of plan lines (SQLite detail strings or PostgreSQL node descriptions)
+    """
+    connection = db.connection()
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return [row[-1] for row in rows]
+    
+    rows = connection.exec_driver_sql(f"EXPLAIN {sql}", params).fetchall()
+    return [row[0] for row in rows]
+
+
+def find_full_scans(plan: list, tables) -> list:
+    """
+    Return the plan lines that read an entire table instead of seeking an index.
+    
+    Args:
+        plan: Plan lines from explain_sql
+        tables: Names of the tables that must never be scanned
+        
+    Returns:
+        The offending plan lines
+    """
+    scans = []
+    for line in plan:
+        # SQLite reports "SCAN <table> [USING ...]", PostgreSQL "-> Seq Scan on <table>"
+        words = line.replace("Seq Scan on ", "SCAN ").replace("->", "").split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in tables:
+            scans.append(line)
+    return scans